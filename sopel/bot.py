@@ -8,13 +8,14 @@
 from __future__ import annotations
 
 from ast import literal_eval
+import asyncio
+import concurrent.futures
 from datetime import timedelta
 import inspect
 import itertools
 import logging
 import math
 import re
-import threading
 import time
 from types import MappingProxyType
 from typing import (
@@ -30,15 +31,16 @@ from sopel.irc import modes
 from sopel.lifecycle import deprecated
 from sopel.plugins import (
     capabilities as plugin_capabilities,
+    executor as plugin_executor,
     jobs as plugin_jobs,
     rules as plugin_rules,
 )
-from sopel.tools import jobs as tools_jobs
+from sopel.tools import identifiers, jobs as tools_jobs, masks
 from sopel.trigger import Trigger
 
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping
+    from collections.abc import Coroutine, Iterable, Mapping
 
     from sopel.plugins.callables import PluginCallable
     from sopel.plugins.handlers import (
@@ -48,7 +50,7 @@ if TYPE_CHECKING:
     from sopel.trigger import PreTrigger
 
 
-__all__ = ['Sopel', 'SopelWrapper']
+__all__ = ['AsyncSopelWrapper', 'Sopel', 'SopelWrapper']
 
 LOGGER = logging.getLogger(__name__)
 
@@ -59,10 +61,33 @@ class Sopel(irc.AbstractBot):
     def __init__(self, config, daemon=False):
         super().__init__(config)
         self._daemon = daemon  # Used for iPython. TODO something saner here
-        self._running_triggers = []
-        self._running_triggers_lock = threading.Lock()
         self._plugins: dict[str, Any] = {}
         self._rules_manager = plugin_rules.Manager()
+        self._rules_executor = plugin_executor.RuleExecutor(
+            max_workers=self.settings.core.rule_threads,
+            max_queue_size=self.settings.core.rule_queue_size,
+            overflow=self.settings.core.rule_queue_overflow,
+        )
+        self._plugin_concurrency_limits: dict[
+            str, plugin_executor.ConcurrencyLimit] = {}
+        self._min_server_delay: float | None = None
+        self._load_shedder = plugin_executor.LoadShedder(
+            low_lag=self.settings.core.shed_low_priority_lag,
+            medium_lag=self.settings.core.shed_medium_priority_lag,
+            low_backlog=self.settings.core.shed_low_priority_backlog,
+            medium_backlog=self.settings.core.shed_medium_priority_backlog,
+        )
+        self._blocklist: masks.Blocklist | None = None
+        self._access_matcher: masks.AccessMatcher | None = None
+        self._channel_policies: dict[
+            identifiers.Identifier, plugin_rules.ChannelPolicy,
+        ] | None = None
+        self._async_output = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='sopel-async-output')
+        """Single thread sending messages for coroutine functions, in order.
+
+        See :class:`AsyncSopelWrapper`.
+        """
         self._cap_requests_manager = plugin_capabilities.Manager()
         self._scheduler = plugin_jobs.Scheduler(self)
 
@@ -123,6 +148,104 @@ class Sopel(irc.AbstractBot):
         """Rules manager."""
         return self._rules_manager
 
+    @property
+    def rules_executor(self) -> plugin_executor.RuleExecutor:
+        """Executor of threaded rules.
+
+        It exposes the number of rules waiting for a thread
+        (:attr:`~sopel.plugins.executor.RuleExecutor.queue_depth`) and the
+        number of threads currently executing a rule
+        (:attr:`~sopel.plugins.executor.RuleExecutor.active_workers`).
+
+        .. versionadded:: 8.1
+        """
+        return self._rules_executor
+
+    @property
+    def load_shedder(self) -> plugin_executor.LoadShedder:
+        """Load shedder deciding which rules to skip when the bot is behind.
+
+        It exposes the number of rules skipped so far, by priority
+        (:attr:`~sopel.plugins.executor.LoadShedder.shed_counts`).
+
+        .. versionadded:: 8.1
+        """
+        return self._load_shedder
+
+    @property
+    def access_matcher(self) -> masks.AccessMatcher:
+        """Precompiled owner and admins settings.
+
+        It is built from the ``owner``, ``owner_account``, ``admins``, and
+        ``admin_accounts`` settings the first time it is required, and then
+        kept until :meth:`reset_access_matcher` is called. It decides the
+        :attr:`~sopel.trigger.Trigger.owner` and
+        :attr:`~sopel.trigger.Trigger.admin` attributes of triggers.
+
+        .. versionadded:: 8.1
+        """
+        access_matcher = self._access_matcher
+        if access_matcher is None:
+            access_matcher = masks.AccessMatcher.from_settings(self.settings)
+            self._access_matcher = access_matcher
+        return access_matcher
+
+    def reset_settings_caches(self) -> None:
+        """Forget everything built from the settings, to build it again.
+
+        This resets the :attr:`access_matcher`, the :attr:`blocklist`, the
+        channels' policies (see :meth:`get_channel_policy`), and the
+        :attr:`url_extractor`. It must be called when the settings change
+        while the bot is running.
+
+        .. versionadded:: 8.1
+        """
+        self.reset_access_matcher()
+        self.reset_blocklist()
+        self.reset_channel_policies()
+        self.reset_url_extractor()
+
+    def reset_access_matcher(self) -> None:
+        """Forget the :attr:`access_matcher`, to build it again when needed.
+
+        This must be called when the ``owner``, ``owner_account``,
+        ``admins``, or ``admin_accounts`` settings change.
+
+        .. versionadded:: 8.1
+        """
+        self._access_matcher = None
+
+    @property
+    def blocklist(self) -> masks.Blocklist:
+        """Precompiled blocklist of nicknames, hostnames, and hostmasks.
+
+        It is built from the ``nick_blocks``, ``host_blocks``, and
+        ``hostmask_blocks`` settings the first time it is required, and then
+        kept until :meth:`reset_blocklist` is called.
+
+        .. versionadded:: 8.1
+        """
+        blocklist = self._blocklist
+        if blocklist is None:
+            blocklist = masks.Blocklist(
+                self.settings.core.nick_blocks,
+                self.settings.core.host_blocks,
+                self.settings.core.hostmask_blocks,
+                identifier_factory=self.make_identifier,
+            )
+            self._blocklist = blocklist
+        return blocklist
+
+    def reset_blocklist(self) -> None:
+        """Forget the :attr:`blocklist`, to build it again when needed.
+
+        This must be called when the ``nick_blocks``, ``host_blocks``, or
+        ``hostmask_blocks`` settings change.
+
+        .. versionadded:: 8.1
+        """
+        self._blocklist = None
+
     @property
     def scheduler(self) -> plugin_jobs.Scheduler:
         """Job Scheduler. See :func:`sopel.plugin.interval`."""
@@ -734,46 +857,102 @@ class Sopel(irc.AbstractBot):
 
     # message dispatch
 
-    def call_rule(
+    def get_concurrency_limits(
         self,
         rule: plugin_rules.AbstractRule,
-        sopel: 'SopelWrapper',
-        trigger: Trigger,
-    ) -> None:
-        nick = trigger.nick
-        context = trigger.sender
-        is_channel = context and not context.is_nick()
+    ) -> list[plugin_executor.ConcurrencyLimit]:
+        """Get the concurrency limits that apply to a threaded ``rule``.
 
-        limited, limit_msg = self.rate_limit_info(rule, trigger)
-        if limited:
-            if limit_msg:
-                sopel.notice(limit_msg, destination=nick)
-            return
+        :param rule: the rule to get the limits of
+        :return: the rule's own limit, if any, then its plugin's limit, if
+                 :attr:`~sopel.config.core_section.CoreSection.plugin_max_concurrency`
+                 is set
 
-        # channel config
-        if is_channel and context in self.settings:
-            channel_config = self.settings[context]
-            plugin_name = rule.get_plugin_name()
+        Rules from the ``coretasks`` plugin are never limited by their plugin.
 
-            # disable listed plugins completely on provided channel
-            if 'disable_plugins' in channel_config:
-                disabled_plugins = channel_config.disable_plugins.split(',')
+        .. versionadded:: 8.1
+        """
+        limits = []
+        rule_limit = rule.get_concurrency_limit()
+        if rule_limit is not None:
+            limits.append(rule_limit)
+
+        max_concurrency = self.settings.core.plugin_max_concurrency
+        plugin_name = rule.get_plugin_name()
+        if max_concurrency > 0 and plugin_name != 'coretasks':
+            if plugin_name not in self._plugin_concurrency_limits:
+                self._plugin_concurrency_limits[plugin_name] = (
+                    plugin_executor.ConcurrencyLimit(
+                        plugin_name,
+                        max_concurrency,
+                        self.settings.core.plugin_concurrency_policy,
+                    )
+                )
+            limits.append(self._plugin_concurrency_limits[plugin_name])
 
-                if plugin_name == 'coretasks':
-                    LOGGER.debug("disable_plugins refuses to skip a coretasks handler")
-                elif '*' in disabled_plugins:
-                    return
-                elif plugin_name in disabled_plugins:
-                    return
+        return limits
 
-            # disable chosen methods from plugins
-            if 'disable_commands' in channel_config:
-                disabled_commands = literal_eval(channel_config.disable_commands)
-                disabled_commands = disabled_commands.get(plugin_name, [])
-                if rule.get_rule_label() in disabled_commands:
-                    if plugin_name != 'coretasks':
-                        return
-                    LOGGER.debug("disable_commands refuses to skip a coretasks handler")
+    def get_channel_policy(
+        self,
+        channel: str,
+    ) -> plugin_rules.ChannelPolicy | None:
+        """Get the plugins and rules disabled in a ``channel``.
+
+        :param channel: the channel's name
+        :return: the channel's policy, or ``None`` if the channel disables
+                 nothing
+
+        Policies come from the ``disable_plugins`` and ``disable_commands``
+        options of the channels' sections of the configuration. They are all
+        parsed the first time a policy is required, and then kept until
+        :meth:`reset_channel_policies` is called.
+
+        .. versionadded:: 8.1
+        """
+        policies = self._channel_policies
+        if policies is None:
+            policies = self._load_channel_policies()
+            self._channel_policies = policies
+
+        if not isinstance(channel, identifiers.Identifier):
+            channel = self.make_identifier(channel)
+
+        return policies.get(channel)
+
+    def reset_channel_policies(self) -> None:
+        """Forget the channels' policies, to parse them again when needed.
+
+        This must be called when a channel's ``disable_plugins`` or
+        ``disable_commands`` option changes (see :meth:`get_channel_policy`).
+
+        .. versionadded:: 8.1
+        """
+        self._channel_policies = None
+
+    def _load_channel_policies(
+        self,
+    ) -> dict[identifiers.Identifier, plugin_rules.ChannelPolicy]:
+        policies = {}
+        for section_name in self.settings.parser.sections():
+            channel = self.make_identifier(section_name)
+            if channel.is_nick():
+                continue
+
+            policy = plugin_rules.ChannelPolicy.from_section(
+                self.settings[section_name])
+            if policy:
+                policies[channel] = policy
+
+        return policies
+
+    def call_rule(
+        self,
+        rule: plugin_rules.AbstractRule,
+        sopel: 'SopelWrapper',
+        trigger: Trigger,
+    ) -> None:
+        if not self._can_call_rule(rule, sopel, trigger):
+            return
 
         try:
             rule.execute(sopel, trigger)
@@ -782,6 +961,78 @@ class Sopel(irc.AbstractBot):
         except Exception as error:
             self.error(trigger, exception=error)
 
+    async def call_rule_async(
+        self,
+        rule: plugin_rules.AbstractRule,
+        sopel: 'AsyncSopelWrapper',
+        trigger: Trigger,
+    ) -> None:
+        """Call a ``rule`` with a coroutine function as handler.
+
+        :param rule: the rule to call
+        :param sopel: the wrapper to give to the rule's handler
+        :param trigger: the trigger to give to the rule's handler
+
+        This coroutine applies the same restrictions as :meth:`call_rule`,
+        then it awaits the rule's execution, and the messages sent through
+        the ``sopel`` wrapper. It must run on the backend's event loop (see
+        :meth:`run_coroutine`).
+
+        .. versionadded:: 8.1
+        """
+        try:
+            if not self._can_call_rule(rule, sopel, trigger):
+                return
+
+            try:
+                await rule.execute_async(sopel, trigger)
+            except Exception as error:
+                # error() may reply: send it like the rule's own messages,
+                # after them, and without blocking the event loop
+                await sopel.flush()
+                await asyncio.get_running_loop().run_in_executor(
+                    self._async_output, self.error, trigger, error)
+        finally:
+            await sopel.flush()
+
+    def run_coroutine(
+        self,
+        coro: Coroutine,
+    ) -> concurrent.futures.Future:
+        """Schedule ``coro`` to run on the backend's event loop.
+
+        :param coro: the coroutine to run
+        :return: a future for the coroutine's result
+        :raise RuntimeError: when the backend can't run coroutines, for
+                             instance when the bot is not connected
+
+        This method can be called from any thread.
+
+        .. versionadded:: 8.1
+        """
+        return self.backend.run_coroutine(coro)
+
+    def _can_call_rule(
+        self,
+        rule: plugin_rules.AbstractRule,
+        sopel: SopelWrapper,
+        trigger: Trigger,
+    ) -> bool:
+        limited, limit_msg = self.rate_limit_info(rule, trigger)
+        if limited:
+            if limit_msg:
+                sopel.notice(limit_msg, destination=trigger.nick)
+            return False
+
+        # channel config, for rules called without dispatch
+        channel = trigger.sender
+        if channel and not channel.is_nick():
+            policy = self.get_channel_policy(channel)
+            if policy is not None and policy.is_disabled(rule):
+                return False
+
+        return True
+
     def call(
         self,
         func: Any,
@@ -897,17 +1148,12 @@ class Sopel(irc.AbstractBot):
         self,
         pretrigger: PreTrigger,
     ) -> tuple[bool, bool, bool] | tuple[None, None, None]:
-        if not (
-            self.settings.core.nick_blocks
-            or self.settings.core.host_blocks
-            or self.settings.core.hostmask_blocks
-        ):
+        blocklist = self.blocklist
+        if not blocklist:
             return (None, None, None)
 
-        nick_blocked = self._nick_blocked(pretrigger.nick)
-        host_blocked = self._host_blocked(pretrigger.host)
-        hostmask_blocked = self._hostmask_blocked(pretrigger.hostmask)
-        return (nick_blocked, host_blocked, hostmask_blocked)
+        return blocklist.check(
+            pretrigger.nick, pretrigger.host, pretrigger.hostmask)
 
     def dispatch(self, pretrigger: PreTrigger) -> None:
         """Dispatch a parsed message to any registered callables.
@@ -917,10 +1163,16 @@ class Sopel(irc.AbstractBot):
 
         The ``pretrigger`` (a parsed message) is used to find matching rules;
         it will retrieve them by order of priority, and execute them. It runs
-        triggered rules in separate threads, unless they are marked otherwise.
+        triggered rules with the :attr:`rules_executor`'s threads, unless they
+        are marked otherwise, and rules with a coroutine function as handler
+        on the backend's event loop (see :meth:`call_rule_async`).
 
         However, it won't run triggered blockable rules at all when they can't
-        be executed for blocked nickname or hostname.
+        be executed for blocked nickname or hostname, and it won't even try
+        the rules disabled in the channel the message comes from (see
+        :meth:`get_channel_policy`). It won't run low and
+        medium priority rules either when the bot is too far behind, as
+        decided by the :attr:`load_shedder`.
 
         .. seealso::
 
@@ -928,8 +1180,6 @@ class Sopel(irc.AbstractBot):
             :class:`Rules Manager<sopel.plugins.rules.Manager>`.
 
         """
-        # list of commands running in separate threads for this dispatch
-        running_triggers = []
         # nickname/hostname blocking
         nick_blocked, host_blocked, hostmask_blocked = (
             self._is_pretrigger_blocked(pretrigger)
@@ -947,33 +1197,72 @@ class Sopel(irc.AbstractBot):
             if join_time is not None and pretrigger.time < join_time:
                 return
 
-        for rule, match in self._rules_manager.get_triggered_rules(self, pretrigger):
-            trigger = Trigger(self.settings, pretrigger, match, account)
+        # load shedding
+        shed_priorities = self._get_shed_priorities(pretrigger)
+
+        # rules disabled in the channel are not even matched
+        policy = (
+            self.get_channel_policy(pretrigger.sender)
+            if pretrigger.sender
+            else None
+        )
+        # computed once, shared by every rule
+        context = plugin_rules.DispatchContext.from_pretrigger(
+            self, pretrigger)
+        triggered_rules = self._rules_manager.get_triggered_rules(
+            self, pretrigger, policy=policy, context=context)
+
+        for rule, match in triggered_rules:
+            priority = rule.get_priority()
+            if priority in shed_priorities and not (
+                rule.is_unblockable()
+                or rule.get_plugin_name() == 'coretasks'
+            ):
+                self._load_shedder.shed(priority, rule)
+                continue
+
+            trigger = Trigger(
+                self.settings,
+                pretrigger,
+                match,
+                account,
+                access=self.access_matcher,
+            )
 
             is_unblockable = trigger.admin or rule.is_unblockable()
             if blocked and not is_unblockable:
                 list_of_blocked_rules.add(str(rule))
                 continue
 
+            if rule.is_async():
+                # run on the backend's event loop
+                async_wrapper = AsyncSopelWrapper(
+                    self, trigger, output_prefix=rule.get_output_prefix())
+                try:
+                    self.run_coroutine(
+                        self.call_rule_async(rule, async_wrapper, trigger))
+                except RuntimeError as error:
+                    LOGGER.error('Unable to run %s: %s', rule, error)
+                continue
+
             wrapper = SopelWrapper(
                 self, trigger, output_prefix=rule.get_output_prefix())
 
             if rule.is_threaded():
-                # run in a separate thread
-                targs = (rule, wrapper, trigger)
-                t = threading.Thread(target=self.call_rule, args=targs)
-                plugin_name = rule.get_plugin_name()
-                rule_label = rule.get_rule_label()
-                t.name = '%s-%s-%s' % (t.name, plugin_name, rule_label)
-                t.start()
-                running_triggers.append(t)
+                # run in the executor's threads
+                self._rules_executor.submit(
+                    self.call_rule,
+                    rule,
+                    wrapper,
+                    trigger,
+                    name='%s-%s' % (
+                        rule.get_plugin_name(), rule.get_rule_label()),
+                    limits=self.get_concurrency_limits(rule),
+                )
             else:
                 # direct call
                 self.call_rule(rule, wrapper, trigger)
 
-        # update currently running triggers
-        self._update_running_triggers(running_triggers)
-
         if list_of_blocked_rules:
             block_types = []
             if nick_blocked:
@@ -989,36 +1278,49 @@ class Sopel(irc.AbstractBot):
                 ', '.join(block_types),
             )
 
+    def _get_shed_priorities(self, pretrigger: PreTrigger) -> frozenset[str]:
+        if not self._load_shedder.is_enabled:
+            return frozenset()
+
+        return self._load_shedder.get_shed_priorities(
+            self._get_lag(pretrigger),
+            self._rules_executor.queue_depth,
+        )
+
+    def _get_lag(self, pretrigger: PreTrigger) -> float:
+        # time spent by the line in Sopel
+        lag = time.time() - pretrigger._received_at
+
+        if 'time' not in pretrigger.tags or 'batch' in pretrigger.tags:
+            # no server-time, or a batch (such as a playback) where the
+            # server-time is when the line was first sent, not received
+            return lag
+
+        # time spent by the line before Sopel got it: the shortest delay seen
+        # so far stands for the clock skew between the server and the bot
+        delay = pretrigger._received_at - pretrigger.time.timestamp()
+        if self._min_server_delay is None or delay < self._min_server_delay:
+            self._min_server_delay = delay
+
+        return lag + delay - self._min_server_delay
+
     @property
     def running_triggers(self) -> list:
-        """Current active threads for triggers.
+        """Current active tasks for triggers.
 
-        :return: the running thread(s) currently processing trigger(s)
+        :return: the task(s) currently queued or processing trigger(s)
         :rtype: :term:`iterable`
 
-        This is for testing and debugging purposes only.
-        """
-        with self._running_triggers_lock:
-            return [t for t in self._running_triggers if t.is_alive()]
-
-    def _update_running_triggers(self, running_triggers: list) -> None:
-        """Update list of running triggers.
+        This is for testing and debugging purposes only. Each task can be
+        waited for with its ``join()`` method, like a thread.
 
-        :param list running_triggers: newly started threads
+        .. versionchanged:: 8.1
 
-        We want to keep track of running triggers, mostly for testing and
-        debugging purposes. For instance, it'll help make sure, in tests, that
-        a bot plugin has finished processing a trigger, by manually joining
-        all running threads.
+            Triggers are processed by the :attr:`rules_executor`, so this is
+            now a list of :class:`~sopel.plugins.executor.RuleTask`.
 
-        This is kept private, as it's purely internal machinery and isn't
-        meant to be manipulated by outside code.
         """
-        # update bot's global running triggers
-        with self._running_triggers_lock:
-            running_triggers = running_triggers + self._running_triggers
-            self._running_triggers = [
-                t for t in running_triggers if t.is_alive()]
+        return self._rules_executor.running_tasks
 
     # capability negotiation
     def request_capabilities(self) -> bool:
@@ -1138,7 +1440,7 @@ class Sopel(irc.AbstractBot):
                 message, trigger.nick, trigger.group(0)
             )
 
-        LOGGER.exception(message)
+        LOGGER.exception(message, exc_info=exception or True)
 
         if trigger and self.settings.core.reply_errors and trigger.sender is not None:
             self.say(message, trigger.sender)
@@ -1148,15 +1450,7 @@ class Sopel(irc.AbstractBot):
 
         :param host: the hostname to check
         """
-        bad_masks = self.settings.core.host_blocks
-        for bad_mask in bad_masks:
-            bad_mask = bad_mask.strip()
-            if not bad_mask:
-                continue
-            if (re.match(bad_mask + '$', host, re.IGNORECASE) or
-                    bad_mask == host):
-                return True
-        return False
+        return self.blocklist.is_host_blocked(host)
 
     def _hostmask_blocked(self, hostmask: str | None) -> bool:
         """Check if a hostmask is blocked.
@@ -1166,34 +1460,14 @@ class Sopel(irc.AbstractBot):
         ``PreTrigger.hostmask`` can be ``None`` if the incoming line did not
         include a source, in which case this method always returns ``False``.
         """
-        if not hostmask:
-            # None, or empty string, cannot match any masks
-            return False
-
-        bad_masks = self.settings.core.hostmask_blocks
-        for bad_mask in bad_masks:
-            bad_mask = bad_mask.strip()
-            if not bad_mask:
-                continue
-            if (re.match(bad_mask + '$', hostmask, re.IGNORECASE) or
-                    bad_mask == hostmask):
-                return True
-        return False
+        return self.blocklist.is_hostmask_blocked(hostmask)
 
     def _nick_blocked(self, nick: str) -> bool:
         """Check if a nickname is blocked.
 
         :param nick: the nickname to check
         """
-        bad_nicks = self.settings.core.nick_blocks
-        for bad_nick in bad_nicks:
-            bad_nick = bad_nick.strip()
-            if not bad_nick:
-                continue
-            if (re.match(bad_nick + '$', nick, re.IGNORECASE) or
-                    self.make_identifier(bad_nick) == nick):
-                return True
-        return False
+        return self.blocklist.is_nick_blocked(nick)
 
     def _shutdown(self) -> None:
         """Internal bot shutdown method."""
@@ -1213,6 +1487,11 @@ class Sopel(irc.AbstractBot):
 
         self._scheduler.clear_jobs()
 
+        # Stop the rules executor once the queued rules are done
+        LOGGER.info("Stopping the rules executor.")
+        self._rules_executor.shutdown(timeout=15)
+        self._async_output.shutdown(wait=False)
+
         # Shutdown plugins
         LOGGER.info(
             "Calling shutdown for %d plugins.", len(self.shutdown_methods))
@@ -1442,7 +1721,7 @@ class SopelWrapper:
         For a channel, it also ensures that the status-specific prefix is added
         to the result, so the bot replies with the same status.
         """
-        if not self._trigger.sender:
+        if self._trigger is None or not self._trigger.sender:
             return None
 
         # ensure str and not Identifier
@@ -1578,3 +1857,117 @@ class SopelWrapper:
             raise RuntimeError('Error: KICK requires a nick.')
 
         self._bot.kick(nick, channel, message)
+
+
+class AsyncSopelWrapper(SopelWrapper):
+    """Wrapper around a Sopel instance and a Trigger, for coroutine functions.
+
+    :param sopel: Sopel instance
+    :type sopel: :class:`~sopel.bot.Sopel`
+    :param trigger: IRC Trigger line
+    :type trigger: :class:`~sopel.trigger.Trigger`
+    :param str output_prefix: prefix for messages sent through this wrapper
+                              (e.g. plugin tag)
+
+    This wrapper is used as the ``bot`` argument of rules defined with
+    ``async def``. It works like :class:`SopelWrapper`, except that
+    :meth:`say`, :meth:`action`, :meth:`notice`, and :meth:`reply` don't
+    block the event loop: they send their message from a separate thread,
+    and return an :class:`asyncio.Future` that can be awaited to wait until
+    the message is sent::
+
+        from sopel import plugin
+
+        @plugin.command('hello')
+        async def hello(bot, trigger):
+            await bot.say('Hello!')
+
+    Messages are sent in order, whether they are awaited or not, and the rule
+    is done only once all of them are sent. When called outside of the event
+    loop (for example, from a thread started by the rule), these methods
+    send their message right away and return ``None``, like
+    :class:`SopelWrapper`.
+
+    .. versionadded:: 8.1
+    """
+    def __init__(self, sopel, trigger, output_prefix=''):
+        super().__init__(sopel, trigger, output_prefix)
+        object.__setattr__(self, '_pending', set())
+
+    def _send(self, method, *args):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # not in the event loop: nothing to schedule
+            method(*args)
+            return None
+
+        future = loop.run_in_executor(self._bot._async_output, method, *args)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    async def flush(self) -> None:
+        """Wait until all messages sent through this wrapper are sent.
+
+        Errors raised while sending a message are logged.
+        """
+        while self._pending:
+            pending = list(self._pending)
+            self._pending.difference_update(pending)
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    LOGGER.error('Unable to send message: %s', result)
+
+    def say(self, message, destination=None, max_messages=1, truncation='', trailing=''):
+        """Override ``SopelWrapper.say`` to not block the event loop.
+
+        :return: a future done when the message is sent
+
+        .. seealso::
+
+            :meth:`sopel.bot.SopelWrapper.say`
+        """
+        return self._send(
+            super().say,
+            message,
+            destination,
+            max_messages,
+            truncation,
+            trailing,
+        )
+
+    def action(self, message, destination=None):
+        """Override ``SopelWrapper.action`` to not block the event loop.
+
+        :return: a future done when the action is sent
+
+        .. seealso::
+
+            :meth:`sopel.bot.SopelWrapper.action`
+        """
+        return self._send(super().action, message, destination)
+
+    def notice(self, message, destination=None):
+        """Override ``SopelWrapper.notice`` to not block the event loop.
+
+        :return: a future done when the notice is sent
+
+        .. seealso::
+
+            :meth:`sopel.bot.SopelWrapper.notice`
+        """
+        return self._send(super().notice, message, destination)
+
+    def reply(self, message, destination=None, reply_to=None, notice=False):
+        """Override ``SopelWrapper.reply`` to not block the event loop.
+
+        :return: a future done when the reply is sent
+
+        .. seealso::
+
+            :meth:`sopel.bot.SopelWrapper.reply`
+        """
+        return self._send(
+            super().reply, message, destination, reply_to, notice)
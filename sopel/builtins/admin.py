@@ -455,6 +455,7 @@ def set_config(bot, trigger):
             bot.say("Can't set attribute: " + str(exc))
             return
     setattr(section, option, value)
+    bot.reset_settings_caches()
     LOGGER.info('%s.%s set successfully.', section_name, option)
     bot.say("OK. Set '{}.{}' successfully.".format(section_name, option))
 
@@ -489,6 +490,7 @@ def unset_config(bot, trigger):
 
     try:
         setattr(section, option, None)
+        bot.reset_settings_caches()
         LOGGER.info('%s.%s unset.', section_name, option)
         bot.say("Unset '{}.{}' successfully.".format(section_name, option))
     except ValueError:
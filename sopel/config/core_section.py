@@ -37,6 +37,20 @@ def _parse_ssl_version(var: str) -> TLSVersion:
         )
 
 
+def _parse_rule_threads(var: str) -> int:
+    """Parse the rule_threads config variable.
+
+    :param var: The input string, e.g. "16".
+    :return: The number of threads, at least 1.
+    """
+    value = int(var)
+    if value < 1:
+        raise ValueError(
+            "'{}' is not a valid number of threads; it must be 1 or more."
+            .format(var))
+    return value
+
+
 def configure(config):
     """Interactively configure the bot's ``[core]`` config section.
 
@@ -1138,6 +1152,56 @@ class CoreSection(StaticSection):
     ``systemd`` or similar.
     """
 
+    plugin_concurrency_policy = ChoiceAttribute(
+        'plugin_concurrency_policy',
+        choices=['queue', 'drop'],
+        default='queue',
+    )
+    """What to do with a triggered rule when its plugin reached its limit.
+
+    :default: ``queue``
+
+    When a plugin already has :attr:`plugin_max_concurrency` rules running,
+    its newly triggered rules are either held until one of them is done
+    (``queue``), or not executed at all (``drop``). Dropped rules are logged
+    with the number of rules dropped so far.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        plugin_concurrency_policy = queue
+
+    .. seealso::
+
+        The :ref:`Rule Execution` chapter.
+
+    .. versionadded:: 8.1
+    """
+
+    plugin_max_concurrency = ValidatedAttribute(
+        'plugin_max_concurrency', int, default=0)
+    """How many threaded rules of the same plugin can run at the same time.
+
+    :default: ``0`` (no limit)
+
+    This prevents a single slow plugin from using all the threads available
+    (see :attr:`rule_threads`). Plugin authors can also limit each of their
+    rules with :func:`sopel.plugin.max_concurrency`.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        plugin_max_concurrency = 0
+
+    .. seealso::
+
+        The :ref:`Rule Execution` chapter.
+
+    .. versionadded:: 8.1
+    """
+
     port = ValidatedAttribute('port', int, default=6697)
     """The port to connect on.
 
@@ -1213,6 +1277,89 @@ class CoreSection(StaticSection):
     silently from the triggering IRC user's perspective.
     """
 
+    rule_queue_overflow = ChoiceAttribute(
+        'rule_queue_overflow',
+        choices=['drop', 'block', 'inline'],
+        default='drop',
+    )
+    """What to do with a triggered rule when the rule queue is full.
+
+    :default: ``drop``
+
+    The available policies are:
+
+    * ``drop``: the rule is not executed, and a warning is logged
+    * ``block``: Sopel waits until there is room in the queue
+    * ``inline``: the rule is executed right away, without a thread
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        rule_queue_overflow = drop
+
+    .. warning::
+
+        Sopel reads messages from the server and dispatches them to rules in
+        the same thread: with ``block`` and ``inline``, it won't read any new
+        message (not even a ``PING``) until the overflow is resolved.
+
+    .. seealso::
+
+        The :ref:`Rule Execution` chapter.
+
+    .. versionadded:: 8.1
+    """
+
+    rule_queue_size = ValidatedAttribute('rule_queue_size', int, default=1000)
+    """How many triggered rules can wait for a thread to execute them.
+
+    :default: ``1000``
+
+    When all the threads are busy, rules wait in a queue. When this queue is
+    full, :attr:`rule_queue_overflow` decides what to do. If set to ``0``, the
+    queue has no limit.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        rule_queue_size = 1000
+
+    .. seealso::
+
+        The :ref:`Rule Execution` chapter.
+
+    .. versionadded:: 8.1
+    """
+
+    rule_threads = ValidatedAttribute(
+        'rule_threads',
+        parse=_parse_rule_threads,
+        default=16,
+    )
+    """How many threads can execute rules at the same time.
+
+    :default: ``16``
+
+    Rules are threaded by default (see :func:`sopel.plugin.thread`), and they
+    are executed by a pool of up to this many threads.
+
+    It must be ``1`` or more.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        rule_threads = 16
+
+    .. seealso::
+
+        The :ref:`Rule Execution` chapter.
+
+    .. versionadded:: 8.1
+    """
+
     server_auth_method = ChoiceAttribute('server_auth_method',
                                          choices=['sasl', 'server'])
     """The server authentication method.
@@ -1247,6 +1394,86 @@ class CoreSection(StaticSection):
     .. versionadded:: 7.0
     """
 
+    shed_low_priority_backlog = ValidatedAttribute(
+        'shed_low_priority_backlog', int, default=0)
+    """Backlog above which Sopel skips ``low`` priority rules.
+
+    :default: ``0`` (disabled)
+
+    When more than this many triggered rules wait for a thread (see
+    :attr:`rule_threads`), Sopel skips ``low`` priority rules, except for
+    unblockable rules and its own ``coretasks``.
+
+    For example, to skip ``low`` priority rules when more than 50 rules wait
+    for a thread:
+
+    .. code-block:: ini
+
+        shed_low_priority_backlog = 50
+
+    .. seealso::
+
+        The :ref:`Load Shedding` chapter.
+
+    .. versionadded:: 8.1
+    """
+
+    shed_low_priority_lag = ValidatedAttribute(
+        'shed_low_priority_lag', float, default=0)
+    """Lag (in seconds) above which Sopel skips ``low`` priority rules.
+
+    :default: ``0`` (disabled)
+
+    When Sopel dispatches a message more than this many seconds after the
+    server received it, it skips ``low`` priority rules, except for
+    unblockable rules and its own ``coretasks``.
+
+    For example, to skip ``low`` priority rules when Sopel is more than 10
+    seconds behind:
+
+    .. code-block:: ini
+
+        shed_low_priority_lag = 10
+
+    .. seealso::
+
+        The :ref:`Load Shedding` chapter.
+
+    .. versionadded:: 8.1
+    """
+
+    shed_medium_priority_backlog = ValidatedAttribute(
+        'shed_medium_priority_backlog', int, default=0)
+    """Backlog above which Sopel skips ``medium`` priority rules.
+
+    :default: ``0`` (disabled)
+
+    Same as :attr:`shed_low_priority_backlog`, for both ``medium`` and
+    ``low`` priority rules. It should be higher than the ``low`` threshold.
+
+    .. seealso::
+
+        The :ref:`Load Shedding` chapter.
+
+    .. versionadded:: 8.1
+    """
+
+    shed_medium_priority_lag = ValidatedAttribute(
+        'shed_medium_priority_lag', float, default=0)
+    """Lag (in seconds) above which Sopel skips ``medium`` priority rules.
+
+    :default: ``0`` (disabled)
+
+    Same as :attr:`shed_low_priority_lag`, for both ``medium`` and ``low``
+    priority rules. It should be higher than the ``low`` threshold.
+
+    .. seealso::
+
+        The :ref:`Load Shedding` chapter.
+
+    .. versionadded:: 8.1
+    """
+
     throttle_join = ValidatedAttribute('throttle_join', int, default=0)
     """Slow down the initial join of channels to prevent getting kicked.
 
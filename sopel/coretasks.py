@@ -28,7 +28,7 @@ import copy
 from datetime import datetime, timedelta, timezone
 import functools
 import logging
-import re
+import threading
 import time
 from typing import Callable, TYPE_CHECKING
 
@@ -64,6 +64,16 @@ MODE_PREFIX_PRIVILEGES = {
     "Y": plugin.OPER,
 }
 
+NAMES_PREFIX_PRIVILEGES: dict[str, int] = {
+    "+": plugin.VOICE,
+    "%": plugin.HALFOP,
+    "@": plugin.OP,
+    "&": plugin.ADMIN,
+    "~": plugin.OWNER,
+    "!": plugin.OPER,
+}
+"""Default nick prefixes in ``RPL_NAMREPLY``, when ``PREFIX`` isn't advertised."""
+
 
 def _handle_account_and_extjoin_capabilities(
     cap_req: tuple[str, ...], bot: SopelWrapper, acknowledged: bool,
@@ -173,6 +183,8 @@ def setup(bot: Sopel) -> None:
     """
     bot.memory['retry_join'] = SopelMemory()
     bot.memory['join_events_queue'] = collections.deque()
+    bot.memory['who_scheduler'] = WhoScheduler()
+    bot.memory['names_pending'] = {}
 
     # Manage JOIN flood protection
     if bot.settings.core.throttle_join:
@@ -195,6 +207,14 @@ def shutdown(bot):
         bot.memory['join_events_queue'].clear()
     except KeyError:
         pass
+    try:
+        bot.memory['who_scheduler'].clear()
+    except KeyError:
+        pass
+    try:
+        bot.memory['names_pending'].clear()
+    except KeyError:
+        pass
 
 
 def _join_event_processing(bot):
@@ -606,7 +626,25 @@ def retry_join(bot, trigger):
     bot.join(channel)
 
 
-@plugin.rule('(.*)')
+def _get_names_prefixes(bot: SopelWrapper) -> dict[str, int]:
+    """Get the nick prefixes of ``RPL_NAMREPLY`` with their privilege.
+
+    :param bot: the bot instance
+    :return: a map of nick prefix to privilege value
+
+    The prefixes come from the server's ``PREFIX`` when advertised, with the
+    privilege of their mode (or ``0`` for a mode Sopel doesn't know about).
+    Otherwise, :data:`NAMES_PREFIX_PRIVILEGES` is used.
+    """
+    if 'PREFIX' not in bot.isupport:
+        return NAMES_PREFIX_PRIVILEGES
+
+    return {
+        prefix: MODE_PREFIX_PRIVILEGES.get(mode, 0)
+        for mode, prefix in bot.isupport.PREFIX.items()
+    }
+
+
 @plugin.event(events.RPL_NAMREPLY)
 @plugin.thread(False)
 @plugin.unblockable
@@ -615,39 +653,29 @@ def handle_names(bot, trigger):
     """Handle NAMES responses.
 
     This function keeps track of users' privileges when Sopel joins channels.
+    Members are kept aside until the matching ``RPL_ENDOFNAMES``, when
+    :func:`handle_end_of_names` adds them to the channel all at once.
     """
-    # TODO specific to one channel type. See issue 281.
-    channels = re.search(r'(#\S*)', trigger.raw)
-    if not channels:
+    # <client> [<symbol>] <channel> :[prefix]<nick>{ [prefix]<nick>}
+    if len(trigger.args) < 3:
+        return
+    channel = bot.make_identifier(trigger.args[-2])
+    if channel.is_nick():
+        # not one of the server's CHANTYPES
         return
-    channel = bot.make_identifier(channels.group(1))
-    if channel not in bot.channels:
-        bot.channels[channel] = target.Channel(
-            channel,
-            identifier_factory=bot.make_identifier,
-        )
-
-    # This could probably be made flexible in the future, but I don't think
-    # it'd be worth it.
-    # If this ever needs to be updated, remember to change the mode handling in
-    # the WHO-handler functions below, too.
-    mapping = {
-        "+": plugin.VOICE,
-        "%": plugin.HALFOP,
-        "@": plugin.OP,
-        "&": plugin.ADMIN,
-        "~": plugin.OWNER,
-        "!": plugin.OPER,
-    }
 
-    uhnames = 'UHNAMES' in bot.isupport
-    userhost_in_names = bot.capabilities.is_enabled('userhost-in-names')
+    prefixes = _get_names_prefixes(bot)
+    prefix_chars = ''.join(prefixes)
+    with_hostmask = (
+        'UHNAMES' in bot.isupport or
+        bot.capabilities.is_enabled('userhost-in-names')
+    )
 
-    names = trigger.split()
-    for name in names:
+    pending = bot.memory['names_pending'].setdefault(channel, [])
+    for name in trigger.args[-1].split():
         username = hostname = None
 
-        if uhnames or userhost_in_names:
+        if with_hostmask:
             try:
                 name, mask = name.rsplit('!', 1)
                 username, hostname = mask.split('@', 1)
@@ -658,14 +686,38 @@ def handle_names(bot, trigger):
                 LOGGER.debug(
                     '%s is enabled, but still got RPL_NAMREPLY item without a hostmask. '
                     'IRC server/bouncer is not spec compliant.',
-                    'UHNAMES' if uhnames else 'userhost-in-names')
+                    'UHNAMES' if 'UHNAMES' in bot.isupport else 'userhost-in-names')
 
+        nick = name.lstrip(prefix_chars)
         priv = 0
-        for prefix, value in mapping.items():
-            if prefix in name:
-                priv = priv | value
+        # with multi-prefix, a nick can have more than one prefix
+        for prefix in name[:len(name) - len(nick)]:
+            priv = priv | prefixes[prefix]
+
+        pending.append((nick, username, hostname, priv))
 
-        nick = bot.make_identifier(name.lstrip(''.join(mapping.keys())))
+
+@plugin.event(events.RPL_ENDOFNAMES)
+@plugin.thread(False)
+@plugin.unblockable
+@plugin.priority('medium')
+def handle_end_of_names(bot, trigger):
+    """Handle the end of NAMES responses.
+
+    This function adds the members listed by ``RPL_NAMREPLY`` to the channel,
+    so the channel's users are never seen half-way through a ``NAMES`` reply.
+    """
+    # <client> <channel> :End of /NAMES list
+    if len(trigger.args) < 2:
+        return
+    channel = bot.make_identifier(trigger.args[-2])
+    pending = bot.memory['names_pending'].pop(channel, None)
+    if pending is None:
+        return
+
+    members = []
+    for name, username, hostname, priv in pending:
+        nick = bot.make_identifier(name)
         user = bot.users.get(nick)
         if user is None:
             # The username/hostname will be included in a NAMES reply only if
@@ -674,7 +726,14 @@ def handle_names(bot, trigger):
             # time this code runs, so this is 99.9% ass-covering.
             user = target.User(nick, username, hostname)
             bot.users[nick] = user
-        bot.channels[channel].add_user(user, privs=priv)
+        members.append((user, priv))
+
+    if channel not in bot.channels:
+        bot.channels[channel] = target.Channel(
+            channel,
+            identifier_factory=bot.make_identifier,
+        )
+    bot.channels[channel].add_users(members)
 
 
 @plugin.rule('(.*)')
@@ -841,10 +900,12 @@ def track_nicks(bot, trigger):
         bot._nick = new
         return
 
-    for channel in bot.channels.values():
-        channel.rename_user(old, new)
-    if old in bot.users:
-        bot.users[new] = bot.users.pop(old)
+    # only the user's own channels need to know about the new nick
+    user = bot.users.pop(old, None)
+    if user is not None:
+        for channel in user.channels.values():
+            channel.rename_user(old, new)
+        bot.users[new] = user
 
     LOGGER.info("User named %r is now known as %r.", str(old), str(new))
 
@@ -904,15 +965,17 @@ def track_kick(bot, trigger):
 
 def _remove_from_channel(bot, nick, channel):
     if nick == bot.nick:
-        bot.channels.pop(channel, None)
+        # RPL_ENDOFNAMES may never come for this channel
+        bot.memory['names_pending'].pop(channel, None)
+        channel_obj = bot.channels.pop(channel, None)
+        if channel_obj is None:
+            return
 
-        lost_users = []
-        for nick_, user in bot.users.items():
+        # only the channel's users can lose their last channel
+        for nick_, user in channel_obj.users.items():
             user.channels.pop(channel, None)
             if not user.channels:
-                lost_users.append(nick_)
-        for nick_ in lost_users:
-            bot.users.pop(nick_, None)
+                bot.users.pop(nick_, None)
     else:
         user = bot.users.get(nick)
         if user and channel in user.channels:
@@ -921,7 +984,153 @@ def _remove_from_channel(bot, nick, channel):
                 bot.users.pop(nick, None)
 
 
-def _send_who(bot, mask):
+class WhoScheduler:
+    """Schedule the ``WHO`` requests sent by coretasks.
+
+    :param burst: number of requests that can be sent at once (optional)
+    :param refill_rate: number of requests allowed per second once the
+                        ``burst`` is used up (optional)
+    :param max_mask_length: maximum length (in bytes) of the targets of one
+                            request (optional)
+
+    Requests are sent right away as long as the budget allows it (up to
+    ``burst`` requests, refilled at ``refill_rate`` per second). Otherwise,
+    their targets wait until the next :meth:`flush`, and meanwhile:
+
+    * a target already waiting is not added again
+    * a nick is not added while a ``WHO`` for one of its channels is waiting,
+      and a ``WHO`` for a channel replaces the waiting ``WHO`` for its users
+
+    When the server supports ``WHOX`` and allows more than one target for
+    ``WHO`` (with ``TARGMAX``), waiting targets are merged into
+    comma-separated masks.
+
+    .. versionadded:: 8.1
+    """
+    def __init__(
+        self,
+        burst: int = 5,
+        refill_rate: float = 0.5,
+        max_mask_length: int = 400,
+    ) -> None:
+        self.burst = burst
+        self.refill_rate = refill_rate
+        self.max_mask_length = max_mask_length
+        self._pending: dict[Identifier, None] = {}
+        self._tokens: float = float(burst)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        # metrics
+        self.requested_count: int = 0
+        """Number of targets requested."""
+        self.deduplicated_count: int = 0
+        """Number of targets dropped because they were already waiting."""
+        self.covered_count: int = 0
+        """Number of nicks dropped because of a channel waiting for WHO."""
+        self.sent_count: int = 0
+        """Number of ``WHO`` commands sent."""
+        self.sent_targets_count: int = 0
+        """Number of targets sent in ``WHO`` commands."""
+        self.max_pending: int = 0
+        """Highest number of targets waiting at the same time."""
+
+    @property
+    def pending_count(self) -> int:
+        """Number of targets waiting to be sent."""
+        return len(self._pending)
+
+    def clear(self) -> None:
+        """Forget every waiting target."""
+        with self._lock:
+            self._pending.clear()
+
+    def request(self, bot: SopelWrapper, mask: str) -> None:
+        """Request a ``WHO`` for ``mask``, and send it if possible.
+
+        :param bot: the bot sending the request
+        :param mask: the nick or channel to request a ``WHO`` for
+        """
+        target_id = bot.make_identifier(mask)
+        with self._lock:
+            self.requested_count += 1
+            if target_id in self._pending:
+                self.deduplicated_count += 1
+            elif target_id.is_nick() and self._is_covered(bot, target_id):
+                self.covered_count += 1
+            else:
+                if not target_id.is_nick():
+                    self._cover_users(bot, target_id)
+                self._pending[target_id] = None
+                self.max_pending = max(self.max_pending, len(self._pending))
+
+        self.flush(bot)
+
+    def flush(self, bot: SopelWrapper) -> None:
+        """Send waiting requests, as long as the budget allows it.
+
+        :param bot: the bot sending the requests
+        """
+        max_targets = self._get_max_targets(bot)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._refilled_at) * self.refill_rate,
+            )
+            self._refilled_at = now
+
+            batches = []
+            while self._pending and self._tokens >= 1:
+                targets = self._pop_targets(max_targets)
+                batches.append(targets)
+                self._tokens -= 1
+                self.sent_count += 1
+                self.sent_targets_count += len(targets)
+
+        for targets in batches:
+            _write_who(bot, targets)
+
+    def _is_covered(self, bot: SopelWrapper, nick: Identifier) -> bool:
+        user = bot.users.get(nick)
+        if user is None:
+            return False
+        return any(channel in self._pending for channel in user.channels)
+
+    def _cover_users(self, bot: SopelWrapper, channel: Identifier) -> None:
+        channel_obj = bot.channels.get(channel)
+        if channel_obj is None:
+            return
+        covered = [nick for nick in self._pending if nick in channel_obj.users]
+        for nick in covered:
+            del self._pending[nick]
+        self.covered_count += len(covered)
+
+    def _get_max_targets(self, bot: SopelWrapper) -> int | None:
+        if 'WHOX' not in bot.isupport or 'TARGMAX' not in bot.isupport:
+            return 1
+        # no limit when advertised without a value
+        return bot.isupport.TARGMAX.get('WHO', 1)
+
+    def _pop_targets(self, max_targets: int | None) -> list[Identifier]:
+        targets: list[Identifier] = []
+        length = 0
+        for target_id in self._pending:
+            length += len(target_id.encode('utf-8')) + 1
+            if targets and (
+                length > self.max_mask_length
+                or (max_targets is not None and len(targets) >= max_targets)
+            ):
+                break
+            targets.append(target_id)
+
+        for target_id in targets:
+            del self._pending[target_id]
+        return targets
+
+
+def _write_who(bot, targets):
+    mask = ','.join(targets)
     if 'WHOX' in bot.isupport:
         # WHOX syntax, see http://faerion.sourceforge.net/doc/irc/whox.var
         # Needed for accounts in WHO replies. The `WHOX_QUERYTYPE` parameter
@@ -935,9 +1144,22 @@ def _send_who(bot, mask):
         # user list updated
         bot.write(['WHO', mask])
 
-    target_id = bot.make_identifier(mask)
-    if not target_id.is_nick():
-        bot.channels[target_id].last_who = datetime.now(timezone.utc)
+    now = datetime.now(timezone.utc)
+    for target_id in targets:
+        if not target_id.is_nick() and target_id in bot.channels:
+            bot.channels[target_id].last_who = now
+
+
+def _send_who(bot, mask):
+    bot.memory['who_scheduler'].request(bot, mask)
+
+
+@plugin.interval(1)
+def _flush_who_requests(bot):
+    """Send the WHO requests waiting for the budget to allow them."""
+    scheduler = bot.memory.get('who_scheduler')
+    if scheduler is not None and scheduler.pending_count:
+        scheduler.flush(bot)
 
 
 @plugin.interval(30)
@@ -964,7 +1186,7 @@ def _periodic_send_who(bot):
 
     if selected_channel is not None:
         # selected_channel's last who is either none or the oldest valid
-        LOGGER.debug("Sending WHO for channel: %s", selected_channel)
+        LOGGER.debug("Queued WHO for channel: %s", selected_channel)
         _send_who(bot, selected_channel)
 
 
@@ -1003,6 +1225,8 @@ def track_join(bot, trigger):
     # did *we* just join?
     if self_join:
         LOGGER.info("Channel joined: %s", channel)
+        # a new NAMES reply follows: forget any unfinished one
+        bot.memory['names_pending'].pop(channel, None)
         bot.channels[channel].join_time = trigger.time
         if bot.settings.core.throttle_join:
             LOGGER.debug("JOIN event added to queue for channel: %s", channel)
@@ -1041,9 +1265,11 @@ def track_join(bot, trigger):
 @plugin.priority('medium')
 def track_quit(bot, trigger):
     """Track when users quit channels."""
-    for channel in bot.channels.values():
-        channel.clear_user(trigger.nick)
-    bot.users.pop(trigger.nick, None)
+    user = bot.users.pop(trigger.nick, None)
+    if user is not None:
+        # only the user's own channels need to forget about them
+        for channel in list(user.channels.values()):
+            channel.clear_user(trigger.nick)
 
     LOGGER.info("User quit: %s", trigger.nick)
 
@@ -1449,14 +1675,17 @@ def blocks(bot, trigger):
             nicks.add(text[3])
             bot.settings.core.nick_blocks = nicks
             bot.settings.save()
+            bot.reset_blocklist()
         elif text[2] == "host":
             hosts.add(text[3].lower())
             bot.settings.core.host_blocks = list(hosts)
             bot.settings.save()
+            bot.reset_blocklist()
         elif text[2] == "hostmask":
             hostmasks.add(text[3])
             bot.settings.core.hostmask_blocks = list(hostmasks)
             bot.settings.save()
+            bot.reset_blocklist()
         else:
             bot.reply(STRINGS['invalid'] % ("adding"))
             return
@@ -1472,6 +1701,7 @@ def blocks(bot, trigger):
             nicks.remove(nick)
             bot.settings.core.nick_blocks = [str(n) for n in nicks]
             bot.settings.save()
+            bot.reset_blocklist()
             bot.reply(STRINGS['success_del'] % (text[3]))
         elif text[2] == "host":
             host = text[3].lower()
@@ -1481,6 +1711,7 @@ def blocks(bot, trigger):
             hosts.remove(host)
             bot.settings.core.host_blocks = [str(m) for m in hosts]
             bot.settings.save()
+            bot.reset_blocklist()
             bot.reply(STRINGS['success_del'] % (text[3]))
         elif text[2] == "hostmask":
             hostmask = text[3]
@@ -1490,6 +1721,7 @@ def blocks(bot, trigger):
             hostmasks.remove(hostmask)
             bot.settings.core.hostmask_blocks = [str(m) for m in hostmasks]
             bot.settings.save()
+            bot.reset_blocklist()
             bot.reply(STRINGS['success_del'] % (text[3]))
         else:
             bot.reply(STRINGS['invalid'] % ("deleting"))
@@ -1519,6 +1751,7 @@ def recv_chghost(bot, trigger):
 
     bot.users[trigger.nick].user = new_user
     bot.users[trigger.nick].host = new_host
+    bot.access_matcher.forget(trigger.nick)
     LOGGER.info(
         "Update user@host for nick %r: %s@%s",
         str(trigger.nick), new_user, new_host)
@@ -1537,6 +1770,7 @@ def account_notify(bot, trigger):
     if account == '*':
         account = None
     bot.users[trigger.nick].account = account
+    bot.access_matcher.forget(trigger.nick)
     LOGGER.info("Update account for nick %r: %s", str(trigger.nick), account)
 
 
@@ -1603,16 +1837,8 @@ def _record_who(
 
     priv = 0
     if modes:
-        mapping = {
-            "+": plugin.VOICE,
-            "%": plugin.HALFOP,
-            "@": plugin.OP,
-            "&": plugin.ADMIN,
-            "~": plugin.OWNER,
-            "!": plugin.OPER,
-        }
         for c in modes:
-            priv = priv | mapping[c]
+            priv = priv | NAMES_PREFIX_PRIVILEGES[c]
 
     if channel not in bot.channels:
         bot.channels[channel] = target.Channel(
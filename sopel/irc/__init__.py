@@ -31,12 +31,12 @@ interface for the bot itself (:class:`~sopel.irc.AbstractBot`).
 from __future__ import annotations
 
 import abc
-from collections import deque
+import asyncio
+import collections
 from datetime import datetime, timezone
 import logging
 import os
 import threading
-import time
 from typing import (
     Any,
     TYPE_CHECKING,
@@ -44,11 +44,12 @@ from typing import (
 
 from sopel import tools, trigger
 from sopel.lifecycle import deprecated
-from sopel.tools import identifiers, memories
+from sopel.tools import identifiers, memories, web
 
 from .backends import AsyncioBackend, UninitializedBackend
 from .capabilities import Capabilities
 from .isupport import ISupport
+from .outbound import OutboundScheduler
 
 
 if TYPE_CHECKING:
@@ -73,6 +74,8 @@ class AbstractBot(abc.ABC):
         self._user: str = settings.core.user
         self._name: str = settings.core.name
         self._isupport = ISupport()
+        self._identifier_factory = identifiers.InternedIdentifierFactory()
+        self._identifier_isupport = self._isupport
         self._capabilities = Capabilities()
         self._myinfo: MyInfo | None = None
         self._nick: identifiers.Identifier = self.make_identifier(
@@ -89,13 +92,18 @@ class AbstractBot(abc.ABC):
         """
 
         # internal machinery
-        self.sending = threading.RLock()
+        self.outbound = OutboundScheduler(self)
+        """Outgoing messages scheduler, with flood protection.
+
+        .. versionadded:: 8.1
+        """
+        self._sending = threading.RLock()
         self.last_error_timestamp: datetime | None = None
         self.error_count = 0
-        self.stack: dict[identifiers.Identifier, dict[str, Any]] = {}
         self.hasquit = False
         self.wantsrestart = False
         self.last_raw_line = ''  # last raw line received
+        self._url_extractor: web.URLExtractor | None = None
 
     @property
     def connection_registered(self) -> bool:
@@ -140,6 +148,57 @@ class AbstractBot(abc.ABC):
         # TODO: Deprecate config, replaced by settings
         return self.settings
 
+    @property
+    @deprecated(
+        reason='Outgoing messages are scheduled per recipient. '
+        'Use `bot.outbound` instead.',
+        version='8.1',
+        removed_in='9.0',
+    )
+    def stack(self) -> dict[identifiers.Identifier, dict[str, Any]]:
+        """A snapshot of the last messages sent to each recipient.
+
+        Each recipient maps to a dict with the last ``messages`` sent, as
+        ``(timestamp, text)``, and the number of messages it can still
+        receive without waiting (``flood_left``). Changing it has no effect.
+
+        .. deprecated:: 8.1
+
+            Flood protection is now managed by :attr:`outbound`, with a
+            :class:`~sopel.irc.outbound.FloodBucket` for each recipient.
+
+            Will be removed in Sopel 9.
+
+        """
+        return {
+            recipient: {
+                'messages': collections.deque(bucket.messages, maxlen=10),
+                'flood_left': bucket.flood_left,
+            }
+            for recipient, bucket in self.outbound.get_buckets().items()
+        }
+
+    @property
+    @deprecated(
+        reason='Outgoing messages are scheduled per recipient, '
+        'without a global lock. Use `bot.outbound` instead.',
+        version='8.1',
+        removed_in='9.0',
+    )
+    def sending(self) -> threading.RLock:
+        """A reentrant lock, kept for compatibility.
+
+        .. deprecated:: 8.1
+
+            :meth:`say` no longer holds a lock while it waits for flood
+            protection, so holding this lock doesn't prevent it from sending
+            messages.
+
+            Will be removed in Sopel 9.
+
+        """
+        return self._sending
+
     @property
     def capabilities(self) -> Capabilities:
         """Capabilities negotiated with the server.
@@ -216,6 +275,33 @@ class AbstractBot(abc.ABC):
         """
         return self._isupport
 
+    @property
+    def url_extractor(self) -> web.URLExtractor:
+        """URL extractor for the ``core.auto_url_schemes`` setting.
+
+        It finds the :attr:`~sopel.trigger.PreTrigger.urls` of incoming
+        messages. It is built the first time it is required, and then kept
+        until :meth:`reset_url_extractor` is called.
+
+        .. versionadded:: 8.1
+        """
+        url_extractor = self._url_extractor
+        if url_extractor is None:
+            url_extractor = web.get_url_extractor(
+                self.settings.core.auto_url_schemes)
+            self._url_extractor = url_extractor
+        return url_extractor
+
+    def reset_url_extractor(self) -> None:
+        """Forget the :attr:`url_extractor`, to build it again when needed.
+
+        This must be called when the ``core.auto_url_schemes`` setting
+        changes.
+
+        .. versionadded:: 8.1
+        """
+        self._url_extractor = None
+
     @property
     def myinfo(self) -> MyInfo:
         """Server/network information.
@@ -237,20 +323,39 @@ class AbstractBot(abc.ABC):
         """Instantiate an Identifier using the bot's context.
 
         .. versionadded:: 8.0
+
+        .. versionchanged:: 8.1
+
+            Identifiers are interned: the same name gives the same
+            Identifier, until the server's ``CASEMAPPING`` or ``CHANTYPES``
+            change.
+
         """
-        casemapping = {
-            'ascii': identifiers.ascii_lower,
-            'rfc1459': identifiers.rfc1459_lower,
-            'rfc1459-strict': identifiers.rfc1459_strict_lower,
-        }.get(self.isupport.get('CASEMAPPING'), identifiers.rfc1459_lower)
-        chantypes = (
-            self.isupport.get('CHANTYPES', identifiers.DEFAULT_CHANTYPES))
-
-        return identifiers.Identifier(
-            name,
-            casemapping=casemapping,
-            chantypes=chantypes,
-        )
+        isupport = self._isupport
+        if isupport is not self._identifier_isupport:
+            # ISUPPORT changed: the casemapping may have changed too
+            self._identifier_isupport = isupport
+            casemapping = {
+                'ascii': identifiers.ascii_lower,
+                'rfc1459': identifiers.rfc1459_lower,
+                'rfc1459-strict': identifiers.rfc1459_strict_lower,
+            }.get(isupport.get('CASEMAPPING'), identifiers.rfc1459_lower)
+            chantypes = (
+                isupport.get('CHANTYPES', identifiers.DEFAULT_CHANTYPES))
+
+            factory = self._identifier_factory
+            if (
+                factory.casemapping is not casemapping
+                or factory.chantypes != chantypes
+            ):
+                self._identifier_factory = (
+                    identifiers.InternedIdentifierFactory(
+                        casemapping=casemapping,
+                        chantypes=chantypes,
+                    )
+                )
+
+        return self._identifier_factory(name)
 
     def make_identifier_memory(self) -> memories.SopelIdentifierMemory:
         """Instantiate a SopelIdentifierMemory using the bot's context.
@@ -430,7 +535,7 @@ class AbstractBot(abc.ABC):
         pretrigger = trigger.PreTrigger(
             self.nick,
             message,
-            url_schemes=self.settings.core.auto_url_schemes,
+            url_extractor=self.url_extractor,
             identifier_factory=self.make_identifier,
             statusmsg_prefixes=self.isupport.get('STATUSMSG'),
         )
@@ -480,7 +585,7 @@ class AbstractBot(abc.ABC):
             pretrigger = trigger.PreTrigger(
                 self.nick,
                 ":{0}!{1}@{2} {3}".format(self.nick, self.user, host, raw),
-                url_schemes=self.settings.core.auto_url_schemes,
+                url_extractor=self.url_extractor,
                 identifier_factory=self.make_identifier,
                 statusmsg_prefixes=self.isupport.get('STATUSMSG'),
             )
@@ -549,6 +654,7 @@ class AbstractBot(abc.ABC):
     def on_close(self) -> None:
         """Call shutdown methods."""
         self._connection_registered.clear()
+        self.outbound.clear()
         self._shutdown()
 
     def _shutdown(self) -> None:
@@ -749,6 +855,7 @@ class AbstractBot(abc.ABC):
         max_messages: int = 1,
         truncation: str = '',
         trailing: str = '',
+        wait: bool = False,
     ) -> None:
         """Send a ``PRIVMSG`` to a user or channel.
 
@@ -761,6 +868,8 @@ class AbstractBot(abc.ABC):
                            ``max_messages`` is greater than 1 (optional)
         :param trailing: string to append after ``text`` and (if used)
                          ``truncation`` (optional)
+        :param wait: wait until the messages are sent before returning
+                     (optional)
 
         By default, this will attempt to send the entire ``text`` in one
         message. If the text is too long for the server, it may be truncated.
@@ -809,122 +918,71 @@ class AbstractBot(abc.ABC):
             # Sopel says: "This quote is very long […]
             # The ending " goes missing
 
+        Messages are subject to flood protection, for each recipient (see
+        :class:`~sopel.irc.outbound.OutboundScheduler`). A message that has to
+        wait is queued, and this method returns without waiting, unless
+        ``wait`` is true. Waiting is not possible from the event loop itself,
+        where ``wait`` is ignored.
+
         .. versionadded:: 7.1
 
             The ``truncation`` and ``trailing`` parameters.
 
+        .. versionchanged:: 8.1
+
+            Messages that have to wait for flood protection are queued, and
+            no longer delay messages to other recipients. Added the ``wait``
+            parameter.
+
         """
         if self.backend is None:
             raise RuntimeError(ERR_BACKEND_NOT_INITIALIZED)
 
-        excess = ''
-
         if not isinstance(text, str):
             # Make sure we are dealing with a Unicode string
             text = text.decode('utf-8')
 
-        safe_length = self.safe_text_length(recipient)
-        if trailing and max_messages == 1:
-            # last message needs to leave room for `trailing`
-            safe_length -= len(trailing.encode('utf-8'))
+        messages = []
+        while True:
+            excess = ''
+            safe_length = self.safe_text_length(recipient)
+            if trailing and max_messages == 1:
+                # last message needs to leave room for `trailing`
+                safe_length -= len(trailing.encode('utf-8'))
+
+            # only think about `truncation` if we need to
+            if safe_length < len(text.encode('utf-8')):
+                if max_messages == 1:
+                    # last message needs to leave room for `truncation`
+                    # if it's still too long to fit in the line
+                    safe_length -= len(truncation.encode('utf-8'))
+                text, excess = tools.get_sendable_message(text, safe_length)
+                if max_messages == 1:
+                    text += truncation
 
-        # only think about `truncation` if we need to
-        if safe_length < len(text.encode('utf-8')):
-            if max_messages == 1:
-                # last message needs to leave room for `truncation`
-                # if it's still too long to fit in the line
-                safe_length -= len(truncation.encode('utf-8'))
-            text, excess = tools.get_sendable_message(text, safe_length)
             if max_messages == 1:
-                text += truncation
-
-        if max_messages == 1:
-            # ALWAYS append `trailing` to the last message;
-            # its size is included in the initial `safe_length` check
-            text += trailing
-
-        flood_max_wait = self.settings.core.flood_max_wait
-        flood_burst_lines = self.settings.core.flood_burst_lines
-        flood_refill_rate = self.settings.core.flood_refill_rate
-        flood_empty_wait = self.settings.core.flood_empty_wait
-
-        flood_text_length = self.settings.core.flood_text_length
-        flood_penalty_ratio = self.settings.core.flood_penalty_ratio
-
-        antiloop_threshold = min(10, self.settings.core.antiloop_threshold)
-        antiloop_window = self.settings.core.antiloop_window
-        antiloop_repeat_text = self.settings.core.antiloop_repeat_text
-        antiloop_silent_after = self.settings.core.antiloop_silent_after
-
-        with self.sending:
-            recipient_id = self.make_identifier(recipient)
-            recipient_stack = self.stack.setdefault(recipient_id, {
-                'messages': deque(maxlen=10),
-                'flood_left': flood_burst_lines,
-            })
-
-            if recipient_stack['messages']:
-                elapsed = time.time() - recipient_stack['messages'][-1][0]
+                # ALWAYS append `trailing` to the last message;
+                # its size is included in the initial `safe_length` check
+                text += trailing
+
+            messages.append(text)
+
+            # Now that we have the first part, we need the rest if requested
+            if max_messages > 1 and excess:
+                text = excess
+                max_messages -= 1
             else:
-                # Default to a high enough value that we won't care.
-                # Five minutes should be enough not to matter anywhere below.
-                elapsed = 300
-
-            # If flood bucket is empty, refill the appropriate number of lines
-            # based on how long it's been since our last message to recipient
-            if not recipient_stack['flood_left']:
-                recipient_stack['flood_left'] = min(
-                    flood_burst_lines,
-                    int(elapsed) * flood_refill_rate)
-
-            # If it's too soon to send another message, wait
-            if not recipient_stack['flood_left']:
-                penalty = 0
-
-                if flood_penalty_ratio > 0:
-                    penalty_ratio = flood_text_length * flood_penalty_ratio
-                    text_length_overflow = float(
-                        max(0, len(text) - flood_text_length))
-                    penalty = text_length_overflow / penalty_ratio
-
-                # Maximum wait time is 2 sec by default
-                initial_wait_time = flood_empty_wait + penalty
-                wait = min(initial_wait_time, flood_max_wait)
-                if elapsed < wait:
-                    sleep_time = wait - elapsed
-                    LOGGER.debug(
-                        'Flood protection wait time: %.3fs; '
-                        'elapsed time: %.3fs; '
-                        'initial wait time (limited to %.3fs): %.3fs '
-                        '(including %.3fs of penalty).',
-                        sleep_time,
-                        elapsed,
-                        flood_max_wait,
-                        initial_wait_time,
-                        penalty,
-                    )
-                    time.sleep(sleep_time)
-
-            # Loop detection
-            if antiloop_threshold > 0 and elapsed < antiloop_window:
-                messages = [m[1] for m in recipient_stack['messages']]
-
-                # If what we're about to send repeated at least N times
-                # in the anti-looping window, replace it
-                if messages.count(text) >= antiloop_threshold:
-                    text = antiloop_repeat_text
-                    if messages.count(text) >= antiloop_silent_after:
-                        # If we've already said that N times, discard message
-                        return
-
-            self.backend.send_privmsg(recipient, text)
-
-            # update recipient metadata
-            flood_left = recipient_stack['flood_left'] - 1
-            recipient_stack['flood_left'] = max(0, flood_left)
-            recipient_stack['messages'].append((time.time(), text))
-
-        # Now that we've sent the first part, we need to send the rest if
-        # requested. Doing so recursively seems simpler than iteratively.
-        if max_messages > 1 and excess:
-            self.say(excess, recipient, max_messages - 1, truncation, trailing)
+                break
+
+        future = self.outbound.send(recipient, messages)
+
+        if wait:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # not in the event loop: the messages can be waited for
+                future.result()
+            else:
+                LOGGER.debug(
+                    'Unable to wait for messages to %s in the event loop.',
+                    recipient)
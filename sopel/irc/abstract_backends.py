@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import abc
+import enum
 import logging
 from typing import TYPE_CHECKING
 
@@ -22,10 +23,44 @@ from .utils import safe
 
 
 if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    import concurrent.futures
+
     from sopel.irc import AbstractBot
     from sopel.trigger import PreTrigger
 
 
+class SendPriority(enum.IntEnum):
+    """Priority of an outgoing IRC line.
+
+    Lines with a lower priority value are sent first: a backend that queues
+    its outgoing lines must send every queued line of a priority before any
+    line of the next one. Lines of the same priority are sent in order.
+
+    .. versionadded:: 8.1
+    """
+    PROTOCOL = 0
+    """Connection-critical commands, such as ``PONG`` or ``CAP``."""
+    NORMAL = 1
+    """Everything else, such as messages sent by plugins."""
+
+
+PROTOCOL_COMMANDS = frozenset({
+    b'AUTHENTICATE',
+    b'CAP',
+    b'NICK',
+    b'PASS',
+    b'PING',
+    b'PONG',
+    b'USER',
+    b'WHO',
+})
+"""Commands sent with the :attr:`SendPriority.PROTOCOL` priority.
+
+.. versionadded:: 8.1
+"""
+
+
 class AbstractIRCBackend(abc.ABC):
     """Abstract class defining the interface and basic logic of an IRC backend.
 
@@ -69,7 +104,9 @@ class AbstractIRCBackend(abc.ABC):
 
         :param bytes data: raw line to send
 
-        This method must be thread-safe.
+        This method must be thread-safe. A backend that queues outgoing lines
+        should use :meth:`get_send_priority` to send protocol-critical lines
+        first.
         """
 
     @abc.abstractmethod
@@ -85,6 +122,50 @@ class AbstractIRCBackend(abc.ABC):
         thread-safe way.
         """
 
+    def run_coroutine(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine to run on the backend's event loop.
+
+        :param coro: the coroutine to run
+        :return: a future for the coroutine's result
+        :raise RuntimeError: when the backend can't run coroutines
+
+        This method must be thread-safe. By default, a backend can't run
+        coroutines: the ``coro`` is closed, and a :exc:`RuntimeError` is
+        raised.
+
+        .. versionadded:: 8.1
+        """
+        coro.close()
+        raise RuntimeError(
+            '%s cannot run coroutines.' % self.__class__.__name__)
+
+    def get_send_priority(self, data: bytes) -> SendPriority:
+        """Get the priority of a raw IRC line to send.
+
+        :param data: raw line to send
+        :return: :attr:`SendPriority.PROTOCOL` if the line's command is one of
+                 the :data:`PROTOCOL_COMMANDS`, :attr:`SendPriority.NORMAL`
+                 otherwise
+
+        Message tags and source, if any, are ignored to find the command.
+
+        .. versionadded:: 8.1
+        """
+        parts = data.split(b' ', 3)
+        index = 0
+        if parts[index].startswith(b'@'):
+            index += 1
+        if index < len(parts) and parts[index].startswith(b':'):
+            index += 1
+        if index >= len(parts):
+            return SendPriority.NORMAL
+
+        command = parts[index].rstrip(b'\r\n').upper()
+        if command in PROTOCOL_COMMANDS:
+            return SendPriority.PROTOCOL
+
+        return SendPriority.NORMAL
+
     def decode_line(self, line: bytes) -> str:
         """Decode a raw IRC line from ``bytes`` to ``str``."""
         # We can't trust clients to pass valid Unicode.
@@ -149,8 +230,12 @@ class AbstractIRCBackend(abc.ABC):
 
         The returned message contains the CR-LF pair required at the end,
         and can be sent as-is.
+
+        .. versionchanged:: 8.1
+
+            The message is encoded only once to find where to cut it.
+
         """
-        max_length = unicode_max_length = 510
         raw_command = ' '.join(safe(arg) for arg in args)
         if text is not None:
             raw_command = '{args} :{text}'.format(args=raw_command,
@@ -158,10 +243,10 @@ class AbstractIRCBackend(abc.ABC):
 
         # The max length of 512 is in bytes, not Unicode characters:
         # we can't split the message on bytes, or we may cut in the middle of a
-        # multi-byte character.
-        while len(raw_command.encode('utf-8')) > max_length:
-            raw_command = raw_command[:unicode_max_length]
-            unicode_max_length = unicode_max_length - 1
+        # multi-byte character, so an incomplete last character is dropped.
+        encoded = raw_command.encode('utf-8')
+        if len(encoded) > 510:
+            raw_command = encoded[:510].decode('utf-8', 'ignore')
 
         # Ends the message with CR-LF
         return raw_command + '\r\n'
@@ -15,17 +15,22 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import logging
 import signal
 import socket
 import ssl
 import threading
+import time
 from typing import Any, TYPE_CHECKING
 
-from .abstract_backends import AbstractIRCBackend
+from .abstract_backends import AbstractIRCBackend, SendPriority
 
 
 if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    import concurrent.futures
+
     from sopel.irc import AbstractBot
     from sopel.trigger import PreTrigger
 
@@ -41,6 +46,13 @@ RESTART_SIGNALS = [
     for name in ['SIGUSR2', 'SIGILL']
     if hasattr(signal, name)
 ]
+READ_LIMIT = 2 ** 16
+"""Size (in bytes) of the chunks read from the IRC connection.
+
+It is also the maximum length of an incoming IRC line, as with the default
+limit of :class:`asyncio.StreamReader`: reading stops when more data than that
+is received without a line ending.
+"""
 
 
 class UninitializedBackend(AbstractIRCBackend):
@@ -117,6 +129,62 @@ class UninitializedBackend(AbstractIRCBackend):
         raise RuntimeError("Attempt to run dummy backend that cannot connect.")
 
 
+class SendLane:
+    """Queue of outgoing lines of the same priority, with its metrics.
+
+    :param priority: the priority of the lines in this lane
+
+    .. versionadded:: 8.1
+    """
+    def __init__(self, priority: SendPriority) -> None:
+        self.priority: SendPriority = priority
+        """Priority of the lines in this lane."""
+        self.lines: collections.deque[tuple[float, bytes]] = (
+            collections.deque())
+        """Lines waiting to be sent, with the time they were queued."""
+        self.sent_count: int = 0
+        """Number of lines sent from this lane."""
+        self.sent_bytes: int = 0
+        """Number of bytes sent from this lane."""
+        self.max_queued: int = 0
+        """Highest number of lines waiting in this lane at the same time."""
+        self.total_wait: float = 0.0
+        """Time (in seconds) the lines sent spent waiting in this lane."""
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @property
+    def average_wait(self) -> float:
+        """Average time (in seconds) a line sent waited in this lane."""
+        if not self.sent_count:
+            return 0.0
+
+        return self.total_wait / self.sent_count
+
+    def put(self, data: bytes) -> None:
+        """Queue ``data`` at the end of this lane.
+
+        :param data: raw line to send
+        """
+        self.lines.append((time.monotonic(), data))
+        self.max_queued = max(self.max_queued, len(self.lines))
+
+    def pop(self) -> bytes:
+        """Remove and return the first line of this lane.
+
+        :return: the raw line to send
+        :raise IndexError: when this lane is empty
+
+        The line is counted as sent.
+        """
+        queued_at, data = self.lines.popleft()
+        self.sent_count += 1
+        self.sent_bytes += len(data)
+        self.total_wait += time.monotonic() - queued_at
+        return data
+
+
 class AsyncioBackend(AbstractIRCBackend):
     """IRC Backend implementation using :mod:`asyncio`.
 
@@ -142,6 +210,11 @@ class AsyncioBackend(AbstractIRCBackend):
                     ``verify_ssl`` is ``False``
     :param ssl_ciphers: the OpenSSL cipher suites to use
     :param ssl_minimum_version: the lowest SSL/TLS version to accept
+
+    Outgoing lines are queued in a :class:`SendLane` for each
+    :class:`~.abstract_backends.SendPriority`, and a single task writes them
+    in priority order: protocol-critical lines, such as ``PONG``, are never
+    delayed by the messages queued before them.
     """
     def __init__(
         self,
@@ -187,10 +260,25 @@ class AsyncioBackend(AbstractIRCBackend):
         self._writer: asyncio.StreamWriter | None = None
         self._reader: asyncio.StreamReader | None = None
 
+        # outgoing lines, by priority
+        self.lanes: dict[SendPriority, SendLane] = {
+            priority: SendLane(priority)
+            for priority in sorted(SendPriority)
+        }
+        """Queues of outgoing lines, by priority (highest priority first)."""
+        self._write_ready: asyncio.Event | None = None
+        self.write_count: int = 0
+        """Number of writes to the connection, each followed by one drain.
+
+        Compared to the lines sent by each lane, it tells how many lines are
+        written together on average.
+        """
+
         # connection tasks
         self._read_task: asyncio.Task | None = None
-        self._ping_task: asyncio.TimerHandle | None = None
-        self._timeout_task: asyncio.TimerHandle | None = None
+        self._write_task: asyncio.Task | None = None
+        self._watchdog_task: asyncio.Task | None = None
+        self._last_activity: float = 0.0
 
     # signal handlers
 
@@ -211,11 +299,9 @@ class AsyncioBackend(AbstractIRCBackend):
         self.send_ping(self._host)
 
     def _timeout_callback(self) -> None:
-        # cancel other tasks
-        for task in [self._ping_task, self._read_task]:
-            if task is not None:
-                task.cancel()
-        self._ping_task = None
+        # cancel the read task
+        if self._read_task is not None:
+            self._read_task.cancel()
         self._read_task = None
         # log a warning
         LOGGER.warning(
@@ -223,25 +309,45 @@ class AsyncioBackend(AbstractIRCBackend):
             self._server_timeout,
         )
 
+    async def _watchdog(self) -> None:
+        # send a PING after ping_interval, and stop reading after
+        # server_timeout, without any activity
+        pinged_activity: float | None = None
+        while True:
+            last_activity = self._last_activity
+            idle = time.monotonic() - last_activity
+
+            if idle >= self._server_timeout:
+                self._watchdog_task = None
+                self._timeout_callback()
+                return
+
+            if pinged_activity != last_activity and (
+                idle >= self._ping_interval
+            ):
+                # one PING for each inactivity period
+                pinged_activity = last_activity
+                self._ping_callback()
+
+            if pinged_activity == last_activity:
+                # check again within a ping interval, in case activity resumes
+                delay = self._ping_interval
+            else:
+                delay = self._ping_interval - idle
+
+            await asyncio.sleep(min(delay, self._server_timeout - idle))
+
     def _cancel_timeout_tasks(self) -> None:
-        # cancel every timeout tasks (PING & Server Timeout)
-        for task in [self._ping_task, self._timeout_task]:
-            if task is not None:
-                task.cancel()
-        self._ping_task = None
-        self._timeout_task = None
+        # cancel the watchdog (PING & Server Timeout)
+        if self._watchdog_task is not None:
+            self._watchdog_task.cancel()
+        self._watchdog_task = None
 
     def _reset_timeout_tasks(self) -> None:
-        # cancel first
-        self._cancel_timeout_tasks()
-        # then schedule again
-        loop = asyncio.get_running_loop()
-        self._ping_task = loop.call_later(
-            self._ping_interval, self._ping_callback,
-        )
-        self._timeout_task = loop.call_later(
-            self._server_timeout, self._timeout_callback,
-        )
+        # connection is active: the watchdog checks this from now on
+        self._last_activity = time.monotonic()
+        if self._watchdog_task is None:
+            self._watchdog_task = asyncio.create_task(self._watchdog())
 
     # backend interface
 
@@ -255,15 +361,43 @@ class AsyncioBackend(AbstractIRCBackend):
         if self._loop is None:
             raise RuntimeError('EventLoop not initialized.')
 
+        priority = self.get_send_priority(data)
         if threading.current_thread() is threading.main_thread():
-            self._loop.create_task(self.send(data))
+            self._queue_line(data, priority)
         else:
-            asyncio.run_coroutine_threadsafe(self.send(data), self._loop)
+            self._loop.call_soon_threadsafe(self._queue_line, data, priority)
+
+    def run_coroutine(self, coro: Coroutine) -> concurrent.futures.Future:
+        if self._loop is None:
+            coro.close()
+            raise RuntimeError('EventLoop not initialized.')
+
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
 
     # read/write
 
+    def _queue_line(self, data: bytes, priority: SendPriority) -> None:
+        self.lanes[priority].put(data)
+        if self._write_ready is not None:
+            self._write_ready.set()
+
+    def _pop_batch(self) -> list[bytes]:
+        # every queued line, highest priority lane first
+        batch = []
+        for lane in self.lanes.values():
+            while lane.lines:
+                batch.append(lane.pop())
+        return batch
+
     async def send(self, data: bytes) -> None:
-        """Send ``data`` through the writer."""
+        """Send ``data`` through the writer.
+
+        .. note::
+
+            This writes ``data`` right away, ahead of the lines queued by
+            :meth:`irc_send`, which should be preferred.
+
+        """
         if self._writer is None:
             raise RuntimeError(
                 'Writer not initialized. '
@@ -275,31 +409,107 @@ class AsyncioBackend(AbstractIRCBackend):
         except asyncio.CancelledError:
             LOGGER.debug('Writer was cancelled')
 
+    async def write_forever(self) -> None:
+        """Main writing loop of the backend.
+
+        This waits for lines queued by :meth:`irc_send`, and writes them in
+        order of priority: a line is written only when no line of a higher
+        priority is waiting, and lines of the same priority are written in
+        the order they were queued. It runs until it is cancelled.
+
+        Every line waiting is written at once, with a single drain: lines
+        queued while the writer drains are written together in the next
+        batch (see :attr:`write_count`).
+
+        .. versionadded:: 8.1
+        """
+        if self._writer is None or self._write_ready is None:
+            raise RuntimeError(
+                'Writer not initialized. '
+                'Are you sure the backend is running?')
+
+        while True:
+            await self._write_ready.wait()
+            self._write_ready.clear()
+
+            batch = self._pop_batch()
+            if not batch:
+                continue
+
+            self.write_count += 1
+            try:
+                self._writer.write(b''.join(batch))
+                await self._writer.drain()
+            except ConnectionError as err:
+                LOGGER.error('Connection error on write: %s', err)
+            except Exception:
+                LOGGER.exception('Unexpected error on write.')
+
+    def _split_lines(self, buffer: bytearray) -> list[bytes]:
+        # remove every complete line from the buffer, in one pass
+        lines = []
+        view = memoryview(buffer)
+        start = 0
+        end = buffer.find(b'\r\n')
+        while end >= 0:
+            lines.append(bytes(view[start:end + 2]))
+            start = end + 2
+            end = buffer.find(b'\r\n', start)
+        view.release()
+        del buffer[:start]
+        return lines
+
+    def _handle_line(self, line: bytes) -> bool:
+        # decode and pass a line to the bot; return False to stop reading
+        try:
+            data: str = self.decode_line(line)
+        except ValueError:
+            LOGGER.error('Unable to decode line from IRC server: %r', line)
+            return True
+
+        # use bot's callbacks
+        try:
+            self.bot.on_message(data)
+        except Exception:
+            LOGGER.exception('Unexpected exception on message handling.')
+            LOGGER.warning('Stopping the backend after error.')
+            return False
+
+        return True
+
     async def read_forever(self) -> None:
         """Main reading loop of the backend.
 
-        This listens to the reader for an incoming IRC line, decodes the data,
-        and passes it to
+        This reads incoming data from the reader by chunks, splits each IRC
+        line, decodes it, and passes it to
         :meth:`bot.on_message(data) <sopel.irc.AbstractBot.on_message>`, until
         the reader reaches the EOF (i.e. connection closed).
 
-        It manages connection timeouts by scheduling two tasks:
+        It manages connection timeouts with a watchdog task, started with the
+        first data received, that will:
 
-        * a PING task, that will send a PING to the server as defined by
-          the ping interval (from the configuration)
-        * a Timeout task, that will stop the bot if it reaches the timeout
+        * send a PING to the server after the ping interval (from the
+          configuration) without receiving any data
+        * stop reading if it reaches the timeout without receiving any data
 
-        Whenever a message is received, both tasks are cancelled and
-        rescheduled.
+        Receiving data only records the time of this activity, once for all
+        the lines of a chunk.
 
         When the connection is closed, the reader will reach EOF, and return
-        an empty string, which in turn will end the coroutine.
+        an empty chunk, which in turn will end the coroutine. A partial line
+        left at that point is still passed to the bot; a line longer than
+        :data:`READ_LIMIT` stops the coroutine.
 
         .. seealso::
 
             The :meth:`~.decode_line` method is used to decode the IRC line
             from :class:`bytes` to :class:`str`.
 
+        .. versionchanged:: 8.1
+
+            Data is read by chunks of up to :data:`READ_LIMIT` bytes, instead
+            of line by line, and a single watchdog task manages timeouts.
+
         """
         if self._reader is None:
             raise RuntimeError(
@@ -309,38 +519,34 @@ class AsyncioBackend(AbstractIRCBackend):
         # cancel timeout tasks
         self._cancel_timeout_tasks()
 
+        buffer = bytearray()
+
         # loop forever until EOF
-        while not self._reader.at_eof():
-            try:
-                line: bytes = await self._reader.readuntil(separator=b'\r\n')
-            except asyncio.IncompleteReadError as err:
-                LOGGER.warning('Receiving partial message from IRC.')
-                line = err.partial
-            except asyncio.LimitOverrunError:
-                LOGGER.exception('Unable to read from IRC server.')
+        while True:
+            chunk: bytes = await self._reader.read(READ_LIMIT)
+
+            if not chunk:
+                # EOF: what's left can't be a complete line
+                if buffer:
+                    LOGGER.warning('Receiving partial message from IRC.')
+                    self._handle_line(bytes(buffer))
                 break
 
             # connection is active: reset timeout tasks
             self._reset_timeout_tasks()
 
-            # check content
-            if not line:
-                LOGGER.debug('No data received.')
-                continue
+            buffer += chunk
+            lines = self._split_lines(buffer)
 
-            # decode content to unicode
-            try:
-                data: str = self.decode_line(line)
-            except ValueError:
-                LOGGER.error('Unable to decode line from IRC server: %r', line)
-                continue
+            if not all(self._handle_line(line) for line in lines):
+                break
 
-            # use bot's callbacks
-            try:
-                self.bot.on_message(data)
-            except Exception:
-                LOGGER.exception('Unexpected exception on message handling.')
-                LOGGER.warning('Stopping the backend after error.')
+            if len(buffer) > READ_LIMIT:
+                LOGGER.error(
+                    'Unable to read from IRC server: '
+                    'line longer than %d bytes.',
+                    READ_LIMIT,
+                )
                 break
 
         # cancel timeout tasks when reading loop ends
@@ -472,6 +678,7 @@ class AsyncioBackend(AbstractIRCBackend):
 
     async def _run_forever(self) -> None:
         self._loop = asyncio.get_running_loop()
+        self._write_ready = asyncio.Event()
         connection_kwargs = self.get_connection_kwargs()
 
         # register signal handlers
@@ -492,6 +699,10 @@ class AsyncioBackend(AbstractIRCBackend):
         # on socket connection
         LOGGER.debug('Connection registered.')
         self._connected = True
+        self._write_task = asyncio.create_task(self.write_forever())
+        if any(self.lanes.values()):
+            # lines queued before the connection
+            self._write_ready.set()
         self.bot.on_connect()
 
         # read forever
@@ -527,6 +738,9 @@ class AsyncioBackend(AbstractIRCBackend):
         # cancel timeout tasks
         self._cancel_timeout_tasks()
 
+        # nothing to write anymore
+        await self._stop_writing()
+
         # nothing to read anymore
         LOGGER.debug('Shutting down writer.')
         self._writer.close()
@@ -552,6 +766,28 @@ class AsyncioBackend(AbstractIRCBackend):
 
         LOGGER.debug('All clear, exiting now.')
 
+    async def _stop_writing(self) -> None:
+        if self._write_task is not None:
+            self._write_task.cancel()
+            try:
+                await self._write_task
+            except asyncio.CancelledError:
+                LOGGER.debug('Write task was cancelled.')
+            except Exception:
+                LOGGER.error('Unexpected error on write.')
+                self.log_exception()
+            self._write_task = None
+
+        # lines can't be sent after the connection is closed
+        for lane in self.lanes.values():
+            if lane.lines:
+                LOGGER.debug(
+                    'Dropping %d unsent line(s) of priority %s.',
+                    len(lane),
+                    lane.priority.name,
+                )
+                lane.lines.clear()
+
     def run_forever(self) -> None:
         """Run forever."""
         LOGGER.debug('Running forever.')
@@ -0,0 +1,365 @@
+""":mod:`sopel.irc.outbound` schedules the bot's outgoing messages.
+
+Messages sent with :meth:`bot.say() <sopel.irc.AbstractBot.say>` are subject
+to flood protection: a recipient that received too many messages in a short
+time must wait before it can receive another one. Each recipient has its own
+:class:`FloodBucket`, and the :class:`OutboundScheduler` keeps a queue of
+messages for each of them, so waiting before sending to one recipient never
+delays messages sent to another.
+
+.. versionadded:: 8.1
+
+.. warning::
+
+    This is all internal code, not intended for direct use by plugins. It is
+    subject to change between versions, even patch releases, without any
+    advance warning.
+
+    Please use the public APIs on :class:`bot <sopel.bot.Sopel>`.
+
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from sopel.config.core_section import CoreSection
+    from sopel.irc import AbstractBot
+    from sopel.tools.identifiers import Identifier
+
+
+__all__ = [
+    'FloodBucket',
+    'OutboundScheduler',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FloodBucket:
+    """Flood protection state of one recipient.
+
+    :param settings: the ``[core]`` section of the bot's settings
+
+    The bucket holds up to ``flood_burst_lines`` messages that can be sent
+    right away. Once it is empty, it is refilled by ``flood_refill_rate``
+    messages for each second elapsed since the last message; until then, a
+    message must wait ``flood_empty_wait`` seconds after the last one, plus a
+    penalty for long messages (see ``flood_penalty_ratio``), up to
+    ``flood_max_wait`` seconds.
+
+    The settings are read each time, so they can change while the bot runs.
+    """
+    def __init__(self, settings: CoreSection) -> None:
+        self.settings = settings
+        self.flood_left: int = settings.flood_burst_lines
+        """Number of messages that can be sent without waiting."""
+        self.messages: collections.deque[tuple[float, str]] = (
+            collections.deque(maxlen=10))
+        """Last messages sent, as ``(timestamp, text)``."""
+
+    @property
+    def elapsed(self) -> float:
+        """Number of seconds since the last message was sent.
+
+        Defaults to a high enough value that it doesn't matter (five minutes)
+        when no message was sent yet.
+        """
+        if not self.messages:
+            return 300
+
+        return time.monotonic() - self.messages[-1][0]
+
+    def get_wait_time(self, text: str) -> float:
+        """Get the number of seconds to wait before sending ``text``.
+
+        :param text: the text to send
+        :return: the time to wait, or ``0`` if ``text`` can be sent now
+
+        The bucket is refilled first, according to the time elapsed since the
+        last message.
+        """
+        settings = self.settings
+        elapsed = self.elapsed
+
+        # If flood bucket is empty, refill the appropriate number of lines
+        # based on how long it's been since our last message to recipient
+        if not self.flood_left:
+            self.flood_left = min(
+                settings.flood_burst_lines,
+                int(elapsed) * settings.flood_refill_rate)
+
+        if self.flood_left:
+            return 0
+
+        penalty = 0.0
+        if settings.flood_penalty_ratio > 0:
+            penalty_ratio = (
+                settings.flood_text_length * settings.flood_penalty_ratio)
+            text_length_overflow = float(
+                max(0, len(text) - settings.flood_text_length))
+            penalty = text_length_overflow / penalty_ratio
+
+        # Maximum wait time is 2 sec by default
+        initial_wait_time = settings.flood_empty_wait + penalty
+        wait = min(initial_wait_time, settings.flood_max_wait)
+        if elapsed >= wait:
+            return 0
+
+        LOGGER.debug(
+            'Flood protection wait time: %.3fs; '
+            'elapsed time: %.3fs; '
+            'initial wait time (limited to %.3fs): %.3fs '
+            '(including %.3fs of penalty).',
+            wait - elapsed,
+            elapsed,
+            settings.flood_max_wait,
+            initial_wait_time,
+            penalty,
+        )
+        return wait - elapsed
+
+    def is_looping(self, text: str) -> bool:
+        """Tell if sending ``text`` would repeat it too many times.
+
+        :param text: the text to send
+        :return: ``True`` if ``text`` was already sent at least
+                 ``antiloop_threshold`` times in the ``antiloop_window``
+        """
+        threshold = min(10, self.settings.antiloop_threshold)
+        if threshold <= 0 or self.elapsed >= self.settings.antiloop_window:
+            return False
+
+        return [m[1] for m in self.messages].count(text) >= threshold
+
+    def consume(self, text: str) -> None:
+        """Record that ``text`` was sent.
+
+        :param text: the text sent
+        """
+        self.flood_left = max(0, self.flood_left - 1)
+        self.messages.append((time.monotonic(), text))
+
+
+class _RecipientQueue:
+    def __init__(self, settings: CoreSection) -> None:
+        self.bucket = FloodBucket(settings)
+        self.messages: collections.deque[
+            tuple[str, str, concurrent.futures.Future | None]
+        ] = collections.deque()
+        self.draining = False
+        # reentrant: sending a message can dispatch it to rules that say more
+        self.lock = threading.RLock()
+
+
+class OutboundScheduler:
+    """Queue messages by recipient, and send them with flood protection.
+
+    :param bot: the bot sending the messages
+
+    Each recipient has a queue of messages and a :class:`FloodBucket`.
+    Messages are sent right away, in the caller's thread, as long as their
+    recipient's bucket allows it. Otherwise they stay in the queue, and a
+    coroutine sends them on the backend's event loop once their wait is over.
+    In the meantime, messages to other recipients are sent as usual.
+
+    When the backend can't run coroutines, a thread sends them instead, so
+    the caller never waits either way.
+
+    Messages still queued when the bot disconnects are discarded (see
+    :meth:`clear`).
+    """
+    def __init__(self, bot: AbstractBot) -> None:
+        self.bot = bot
+        self._queues: dict[Identifier, _RecipientQueue] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def queued_count(self) -> int:
+        """Number of messages waiting to be sent."""
+        with self._lock:
+            queues = list(self._queues.values())
+        return sum(len(recipient_queue.messages) for recipient_queue in queues)
+
+    def get_buckets(self) -> dict[Identifier, FloodBucket]:
+        """Get the flood protection bucket of every known recipient."""
+        with self._lock:
+            return {
+                recipient: recipient_queue.bucket
+                for recipient, recipient_queue in self._queues.items()
+            }
+
+    def get_bucket(self, recipient: str) -> FloodBucket:
+        """Get the flood protection bucket of a ``recipient``.
+
+        :param recipient: the nick or channel messages are sent to
+        """
+        return self._get_queue(recipient).bucket
+
+    def send(
+        self,
+        recipient: str,
+        messages: list[str],
+    ) -> concurrent.futures.Future:
+        """Queue ``messages`` for ``recipient``, and send them when possible.
+
+        :param recipient: the nick or channel to send the messages to
+        :param messages: the texts to send, in order
+        :return: a future done once the last message is sent (or discarded
+                 by the loop detection); it is cancelled if the messages are
+                 discarded before they can be sent (see :meth:`clear`)
+        :raise RuntimeError: when a message can't be sent right away because
+                             the bot is not connected
+
+        Messages that don't have to wait are sent before this method returns.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        recipient_queue = self._get_queue(recipient)
+
+        with recipient_queue.lock:
+            for index, text in enumerate(messages, start=1):
+                recipient_queue.messages.append((
+                    recipient,
+                    text,
+                    future if index == len(messages) else None,
+                ))
+
+            if not messages:
+                future.set_result(None)
+
+            if recipient_queue.draining:
+                # already waiting: the drain will send them in order
+                return future
+
+            wait = self._send_ready(recipient_queue, reraise=True)
+            if wait is None:
+                return future
+            recipient_queue.draining = True
+
+        try:
+            self.bot.backend.run_coroutine(self._drain(recipient_queue, wait))
+        except RuntimeError:
+            # no event loop to wait on: wait in another thread instead
+            threading.Thread(
+                target=self._drain_blocking,
+                args=(recipient_queue, wait),
+                name='SopelOutbound-%s' % recipient,
+                daemon=True,
+            ).start()
+
+        return future
+
+    def clear(self) -> None:
+        """Discard every queued message.
+
+        The futures of discarded messages are cancelled. This is called when
+        the bot disconnects, as the drains waiting to send these messages may
+        never run again.
+        """
+        with self._lock:
+            queues = list(self._queues.values())
+        for recipient_queue in queues:
+            self._discard(recipient_queue)
+
+    def _get_queue(self, recipient: str) -> _RecipientQueue:
+        recipient_id = self.bot.make_identifier(recipient)
+        with self._lock:
+            recipient_queue = self._queues.get(recipient_id)
+            if recipient_queue is None:
+                recipient_queue = self._queues[recipient_id] = _RecipientQueue(
+                    self.bot.settings.core)
+        return recipient_queue
+
+    def _send_ready(
+        self,
+        recipient_queue: _RecipientQueue,
+        reraise: bool = False,
+    ) -> float | None:
+        # send queued messages until one must wait; return its wait time, or
+        # None when the queue is empty (and no longer draining)
+        settings = self.bot.settings.core
+        bucket = recipient_queue.bucket
+
+        with recipient_queue.lock:
+            while recipient_queue.messages:
+                recipient, text, future = recipient_queue.messages[0]
+                wait = bucket.get_wait_time(text)
+                if wait > 0:
+                    return wait
+
+                recipient_queue.messages.popleft()
+                if bucket.is_looping(text):
+                    text = settings.antiloop_repeat_text
+                    if [m[1] for m in bucket.messages].count(text) >= (
+                        settings.antiloop_silent_after
+                    ):
+                        # If we've already said that N times, discard message
+                        if future is not None:
+                            future.set_result(None)
+                        continue
+
+                try:
+                    self.bot.backend.send_privmsg(recipient, text)
+                except Exception as error:
+                    if future is not None:
+                        future.set_exception(error)
+                    if reraise:
+                        # the caller gets the error: drop what can't be sent
+                        for _, _, pending in recipient_queue.messages:
+                            if pending is not None:
+                                pending.set_exception(error)
+                        recipient_queue.messages.clear()
+                        raise
+                    LOGGER.exception('Unable to send message to %s', recipient)
+                    continue
+
+                bucket.consume(text)
+                if future is not None:
+                    future.set_result(None)
+
+            recipient_queue.draining = False
+            return None
+
+    def _discard(self, recipient_queue: _RecipientQueue) -> None:
+        with recipient_queue.lock:
+            for _, _, future in recipient_queue.messages:
+                if future is not None:
+                    future.cancel()
+            recipient_queue.messages.clear()
+            recipient_queue.draining = False
+
+    async def _drain(
+        self,
+        recipient_queue: _RecipientQueue,
+        wait: float,
+    ) -> None:
+        next_wait: float | None = wait
+        try:
+            while next_wait is not None:
+                await asyncio.sleep(next_wait)
+                next_wait = self._send_ready(recipient_queue)
+        finally:
+            if next_wait is not None:
+                # cancelled or failed: no one else would send the messages
+                self._discard(recipient_queue)
+
+    def _drain_blocking(
+        self,
+        recipient_queue: _RecipientQueue,
+        wait: float,
+    ) -> None:
+        next_wait: float | None = wait
+        try:
+            while next_wait is not None:
+                time.sleep(next_wait)
+                next_wait = self._send_ready(recipient_queue)
+        finally:
+            if next_wait is not None:
+                self._discard(recipient_queue)
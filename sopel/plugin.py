@@ -86,6 +86,7 @@ __all__ = [
     'find_lazy',
     'interval',
     'label',
+    'max_concurrency',
     'nickname_command',
     'nickname_commands',
     'output_prefix',
@@ -630,6 +631,52 @@ def thread(value: bool) -> TypedCallableDecorator:
     return decorator
 
 
+def max_concurrency(
+    limit: int,
+    policy: Literal['queue', 'drop'] = 'queue',
+) -> TypedCallableDecorator:
+    """Decorate a function to limit how many of its calls can run at once.
+
+    :param limit: maximum number of calls running at the same time
+    :param policy: what to do when a call is triggered while ``limit`` calls
+                   are already running: ``queue`` to run it once one of
+                   them is done, or ``drop`` to not run it at all
+
+    This is useful for slow callables, such as the ones waiting for a
+    network response, so they don't take all the threads available to run
+    plugin callables::
+
+        from sopel import plugin
+
+        @plugin.command('weather')
+        @plugin.max_concurrency(2, 'drop')
+        def weather(bot, trigger):
+            # at most two calls to a slow web API at a time
+            ...
+
+    Dropped calls are logged with the number of calls dropped so far.
+
+    .. note::
+
+        This limit applies to callables run in a separate thread only (as is
+        the default; see :func:`thread`). The bot's owner can also limit all
+        callables of the same plugin with the
+        :attr:`~sopel.config.core_section.CoreSection.plugin_max_concurrency`
+        setting.
+
+    .. versionadded:: 8.1
+    """
+    def decorator(
+        function: TypedPluginCallableHandler | AbstractPluginObject
+    ) -> PluginCallable:
+        handler = PluginCallable.ensure_callable(function)
+        handler.max_concurrency = limit
+        handler.concurrency_policy = policy
+        return handler
+
+    return decorator
+
+
 # Overloads allow both `@allow_bots` and `@allow_bots()` to work
 # without angering the type checker
 @overload
@@ -215,6 +215,14 @@ class AbstractPluginObject(abc.ABC):
     def thread(self):
         return self.threaded
 
+    @property
+    def is_async(self) -> bool:
+        """Tell if the handler is a coroutine function (``async def``).
+
+        .. versionadded:: 8.1
+        """
+        return inspect.iscoroutinefunction(self.get_handler())
+
     @classmethod
     def from_plugin_object(
         cls: Type[TypedPluginObject],
@@ -422,6 +430,10 @@ class PluginCallable(AbstractPluginObject):
         handler.priority = getattr(obj, 'priority', handler.priority)
         handler.output_prefix = getattr(
             obj, 'output_prefix', handler.output_prefix)
+        handler.max_concurrency = getattr(
+            obj, 'max_concurrency', handler.max_concurrency)
+        handler.concurrency_policy = getattr(
+            obj, 'concurrency_policy', handler.concurrency_policy)
         handler._docs = getattr(obj, '_docs', handler._docs)
 
         # rules
@@ -649,6 +661,12 @@ class PluginCallable(AbstractPluginObject):
         """
         self.predicates: list[TypedCallablePredicate] = []
         """List of predicates used to allow or prevent execution."""
+        self.max_concurrency: int = 0
+        """Maximum number of threaded executions at once (``0`` for no limit).
+        """
+        self.concurrency_policy: Literal['queue', 'drop'] = 'queue'
+        """What to do with an execution when the concurrency limit is reached.
+        """
 
         # rate limiting
         self.rate_limit_admins: bool = False
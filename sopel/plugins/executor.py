@@ -0,0 +1,636 @@
+"""Sopel's plugin rules execution.
+
+.. versionadded:: 8.1
+
+.. important::
+
+    This is all fresh and new. Its usage and documentation is for Sopel core
+    development and advanced developers. It is subject to rapid changes
+    between versions without much (or any) warning.
+
+    Do **not** build your plugin based on what is here, you do **not** need to.
+
+"""
+from __future__ import annotations
+
+import collections
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+
+__all__ = [
+    'CONCURRENCY_DROP',
+    'CONCURRENCY_QUEUE',
+    'OVERFLOW_BLOCK',
+    'OVERFLOW_DROP',
+    'OVERFLOW_INLINE',
+    'ConcurrencyLimit',
+    'LoadShedder',
+    'RuleExecutor',
+    'RuleTask',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+OVERFLOW_DROP = 'drop'
+"""Overflow policy: drop a task when the queue is full."""
+OVERFLOW_BLOCK = 'block'
+"""Overflow policy: wait for room in the queue when it is full."""
+OVERFLOW_INLINE = 'inline'
+"""Overflow policy: run a task in the caller's thread when the queue is full."""
+OVERFLOW_POLICIES = (OVERFLOW_DROP, OVERFLOW_BLOCK, OVERFLOW_INLINE)
+"""Valid overflow policies."""
+
+CONCURRENCY_QUEUE = 'queue'
+"""Concurrency policy: hold a task until an instance is done."""
+CONCURRENCY_DROP = 'drop'
+"""Concurrency policy: drop a task when too many instances are running."""
+CONCURRENCY_POLICIES = (CONCURRENCY_QUEUE, CONCURRENCY_DROP)
+"""Valid concurrency policies."""
+
+WORKER_IDLE_TIMEOUT = 60
+"""Number of seconds an idle worker waits for a task before it stops."""
+WORKER_POLL_INTERVAL = 1
+"""Number of seconds between two checks by an idle worker to stop early."""
+
+SHED_PRIORITIES = ('low', 'medium')
+"""Rule priorities that can be shed, in the order they are shed."""
+
+
+class ConcurrencyLimit:
+    """Maximum number of tasks of the same kind running at once.
+
+    :param name: the limit's name, used in logs (such as a plugin's name)
+    :param limit: maximum number of tasks running at once
+    :param policy: what to do with a task when the limit is reached, one of
+                   :data:`CONCURRENCY_POLICIES`
+
+    When the limit is reached, a new task is either held by the executor
+    until a running task is done (``queue``), or dropped (``drop``). In both
+    cases, a task waiting for a worker counts as running.
+
+    Its counters are managed by the :class:`RuleExecutor` the tasks are
+    submitted to.
+    """
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        policy: str = CONCURRENCY_QUEUE,
+    ) -> None:
+        if limit < 1:
+            raise ValueError(
+                'Invalid concurrency limit: %r (must be 1 or more)' % limit)
+
+        if policy not in CONCURRENCY_POLICIES:
+            raise ValueError('Invalid concurrency policy: %r' % policy)
+
+        self.name = name
+        self.limit = limit
+        self.policy = policy
+        self.running = 0
+        """Number of tasks currently running under this limit."""
+        self.dropped_count = 0
+        """Number of tasks dropped because the limit was reached."""
+
+    def __repr__(self):
+        return '<%s %s (%d/%d)>' % (
+            self.__class__.__name__, self.name, self.running, self.limit)
+
+    def is_reached(self) -> bool:
+        """Tell if no more tasks can run under this limit for now."""
+        return self.running >= self.limit
+
+
+class RuleTask:
+    """A callable to execute with its arguments, as a thread would.
+
+    :param func: the callable to execute
+    :param args: the arguments to give to ``func``
+    :param name: the task's name
+
+    A task has the same :meth:`join` and :meth:`is_alive` methods as a
+    :class:`threading.Thread`, so code that used to wait for threads, such as
+    tests, can wait for tasks instead.
+    """
+    def __init__(
+        self,
+        func: Callable,
+        args: tuple[Any, ...] = tuple(),
+        name: str | None = None,
+    ) -> None:
+        self.func = func
+        self.args = args
+        self.name = name or getattr(func, '__name__', 'task')
+        self.limits: tuple[ConcurrencyLimit, ...] = tuple()
+        self._done = threading.Event()
+
+    def __repr__(self):
+        state = 'running' if self.is_alive() else 'done'
+        return '<%s %s (%s)>' % (self.__class__.__name__, self.name, state)
+
+    def run(self) -> None:
+        """Execute the task, then mark it as done.
+
+        Any exception raised by the callable is logged, and the task is done
+        either way.
+        """
+        try:
+            self.execute()
+        finally:
+            self.finish()
+
+    def execute(self) -> None:
+        """Call the task's callable, logging any exception it raises."""
+        try:
+            self.func(*self.args)
+        except Exception:
+            LOGGER.exception('Unexpected error in task %s', self.name)
+
+    def finish(self) -> None:
+        """Mark the task as done, without executing it."""
+        self._done.set()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait until the task is done.
+
+        :param timeout: maximum number of seconds to wait
+        """
+        self._done.wait(timeout)
+
+    def is_alive(self) -> bool:
+        """Tell if the task is queued or running."""
+        return not self._done.is_set()
+
+
+class RuleExecutor:
+    """Bounded pool of worker threads to execute threaded rules.
+
+    :param max_workers: maximum number of worker threads
+    :param max_queue_size: maximum number of tasks waiting for a worker;
+                           ``0`` means no limit
+    :param overflow: what to do with a task when the queue is full, one of
+                     :data:`OVERFLOW_POLICIES`
+    :param name: prefix of the worker threads' names
+
+    Workers are started when tasks are submitted and none is idle, up to
+    ``max_workers``, and they stop after :data:`WORKER_IDLE_TIMEOUT` seconds
+    without a task. When more tasks are submitted than the workers can take,
+    they wait in a queue. When the queue is full, the ``overflow`` policy
+    applies:
+
+    * ``drop``: the task is not executed, and it is logged and counted
+    * ``block``: the caller waits until there is room in the queue
+    * ``inline``: the task is executed right away in the caller's thread
+
+    Tasks can also be submitted with :class:`ConcurrencyLimit`\\s: a task
+    held because one of its limits is reached doesn't take a place in the
+    queue until it can run; at most ``max_queue_size`` tasks can be held that
+    way, and any extra task is dropped.
+
+    .. note::
+
+        Sopel dispatches messages from the same thread that reads them from
+        the server, so both ``block`` and ``inline`` will delay the reading of
+        new messages until the overflow is resolved.
+
+    """
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int = 0,
+        overflow: str = OVERFLOW_DROP,
+        name: str = 'sopel-rules',
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError(
+                'Invalid max_workers: %r (must be 1 or more)' % max_workers)
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy: %r' % overflow)
+
+        self.max_workers = max_workers
+        self.max_queue_size = max(max_queue_size, 0)
+        self.overflow = overflow
+        self.name = name
+        self._queue: queue.Queue[RuleTask | None] = queue.Queue(
+            self.max_queue_size)
+        self._lock = threading.Lock()
+        self._workers: set[threading.Thread] = set()
+        self._idle_workers = 0
+        self._active_workers = 0
+        self._tasks: set[RuleTask] = set()
+        self._held: collections.deque[RuleTask] = collections.deque()
+        self._dropped = 0
+        self._counter = itertools.count(1)
+        self._shutdown = False
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of tasks waiting for a worker."""
+        return self._queue.qsize()
+
+    @property
+    def held_count(self) -> int:
+        """Number of tasks held until one of their limits allows them to run.
+        """
+        with self._lock:
+            return len(self._held)
+
+    @property
+    def worker_count(self) -> int:
+        """Number of started worker threads."""
+        with self._lock:
+            return len(self._workers)
+
+    @property
+    def active_workers(self) -> int:
+        """Number of workers currently executing a task."""
+        with self._lock:
+            return self._active_workers
+
+    @property
+    def dropped_count(self) -> int:
+        """Number of tasks dropped because the queue was full."""
+        with self._lock:
+            return self._dropped
+
+    @property
+    def running_tasks(self) -> list[RuleTask]:
+        """Tasks that are held, queued, or running."""
+        with self._lock:
+            return [task for task in self._tasks if task.is_alive()]
+
+    def submit(
+        self,
+        func: Callable,
+        *args: Any,
+        name: str | None = None,
+        limits: Iterable[ConcurrencyLimit] = tuple(),
+    ) -> RuleTask | None:
+        """Submit ``func`` to be called with ``args`` by a worker.
+
+        :param func: the callable to execute
+        :param args: the arguments to give to ``func``
+        :param name: the task's name
+        :param limits: concurrency limits that apply to this task
+        :return: the submitted task, or ``None`` if it was dropped
+
+        Tasks submitted after :meth:`shutdown` are dropped.
+        """
+        task = RuleTask(func, args, name)
+        task.limits = tuple(limits)
+
+        if self._shutdown:
+            LOGGER.warning(
+                'Rules executor is shut down; dropping %s', task.name)
+            return None
+
+        with self._lock:
+            reached = [limit for limit in task.limits if limit.is_reached()]
+            dropping = [
+                limit for limit in reached
+                if limit.policy == CONCURRENCY_DROP
+            ]
+            is_held_full = bool(
+                self.max_queue_size
+                and len(self._held) >= self.max_queue_size
+            )
+
+            if dropping:
+                limit = dropping[0]
+                limit.dropped_count = limit.dropped_count + 1
+            elif reached and is_held_full:
+                self._dropped = self._dropped + 1
+            elif reached:
+                self._tasks.add(task)
+                self._held.append(task)
+                return task
+            else:
+                self._acquire(task)
+
+        if dropping:
+            LOGGER.warning(
+                'Concurrency limit reached for %s (%d); '
+                'dropping %s (%d dropped so far)',
+                limit.name, limit.limit, task.name, limit.dropped_count)
+            return None
+        elif reached:
+            LOGGER.warning(
+                'Too many tasks held by concurrency limits (%d); dropping %s',
+                self.max_queue_size, task.name)
+            return None
+
+        return self._enqueue(task, block=self.overflow == OVERFLOW_BLOCK)
+
+    def shutdown(self, timeout: float | None = 0) -> None:
+        """Stop the workers once the queued tasks are done.
+
+        :param timeout: maximum number of seconds to wait for the workers to
+                        stop; ``None`` to wait as long as it takes (by
+                        default, it doesn't wait)
+
+        Held tasks are discarded without being executed.
+        """
+        with self._lock:
+            self._shutdown = True
+            workers = list(self._workers)
+            held = list(self._held)
+            self._held.clear()
+            self._tasks.difference_update(held)
+
+        for task in held:
+            task.finish()
+
+        # wake up idle workers; busy workers stop once the queue is empty
+        for _ in workers:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+
+        if timeout == 0:
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in workers:
+            if worker is threading.current_thread():
+                continue
+            if deadline is None:
+                worker.join()
+            else:
+                worker.join(max(deadline - time.monotonic(), 0))
+
+    def _acquire(self, task: RuleTask) -> None:
+        # must be called with the lock
+        self._tasks.add(task)
+        for limit in task.limits:
+            limit.running = limit.running + 1
+
+    def _release(self, task: RuleTask) -> None:
+        # A held task that can't be queued is handled right away, and
+        # releasing it may let more held tasks run: loop instead of recursing
+        released = collections.deque([task])
+        while released:
+            current = released.popleft()
+            ready = self._release_limits(current)
+            if current is not task:
+                # the caller finishes its own task
+                current.finish()
+
+            for waiting in ready:
+                # never block a worker: it could wait for itself
+                if not self._put(waiting, block=False):
+                    self._overflow(waiting)
+                    released.append(waiting)
+
+    def _release_limits(self, task: RuleTask) -> list[RuleTask]:
+        ready = []
+        with self._lock:
+            self._tasks.discard(task)
+            for limit in task.limits:
+                limit.running = limit.running - 1
+
+            if self._held:
+                held: collections.deque[RuleTask] = collections.deque()
+                for waiting in self._held:
+                    if any(limit.is_reached() for limit in waiting.limits):
+                        held.append(waiting)
+                    else:
+                        self._acquire(waiting)
+                        ready.append(waiting)
+                self._held = held
+
+        return ready
+
+    def _enqueue(self, task: RuleTask, block: bool) -> RuleTask | None:
+        if self._put(task, block=block):
+            return task
+
+        try:
+            executed = self._overflow(task)
+        finally:
+            self._release(task)
+            task.finish()
+
+        return task if executed else None
+
+    def _put(self, task: RuleTask, block: bool) -> bool:
+        try:
+            self._queue.put(task, block=block)
+        except queue.Full:
+            return False
+
+        self._adjust_workers()
+        return True
+
+    def _overflow(self, task: RuleTask) -> bool:
+        # the task must be released and finished by the caller
+        if self.overflow != OVERFLOW_DROP:
+            LOGGER.debug(
+                'Rule queue is full (%d); running %s inline',
+                self.max_queue_size, task.name)
+            task.execute()
+            return True
+
+        with self._lock:
+            self._dropped = self._dropped + 1
+        LOGGER.warning(
+            'Rule queue is full (%d); dropping %s',
+            self.max_queue_size, task.name)
+        return False
+
+    def _adjust_workers(self) -> None:
+        with self._lock:
+            if self._idle_workers >= self._queue.qsize():
+                return
+
+            if len(self._workers) >= self.max_workers:
+                return
+
+            thread = threading.Thread(
+                target=self._work,
+                name='%s-%d' % (self.name, next(self._counter)),
+            )
+            self._workers.add(thread)
+            self._idle_workers = self._idle_workers + 1
+        thread.start()
+
+    def _work(self) -> None:
+        thread = threading.current_thread()
+        base_name = thread.name
+        idle_since = time.monotonic()
+
+        while True:
+            try:
+                # after shutdown, only take the tasks already queued
+                task = self._queue.get(
+                    block=not self._shutdown,
+                    timeout=WORKER_POLL_INTERVAL,
+                )
+            except queue.Empty:
+                stopping = (
+                    self._shutdown or
+                    time.monotonic() - idle_since >= WORKER_IDLE_TIMEOUT or
+                    # workers aren't daemon threads: an idle worker must not
+                    # keep the interpreter from exiting
+                    not threading.main_thread().is_alive()
+                )
+                if not stopping:
+                    continue
+                with self._lock:
+                    if self._queue.empty():
+                        self._idle_workers = self._idle_workers - 1
+                        self._workers.discard(thread)
+                        return
+                continue
+
+            if task is None:
+                # shutdown
+                with self._lock:
+                    self._idle_workers = self._idle_workers - 1
+                    self._workers.discard(thread)
+                return
+
+            with self._lock:
+                self._idle_workers = self._idle_workers - 1
+                self._active_workers = self._active_workers + 1
+
+            thread.name = '%s-%s' % (base_name, task.name)
+            try:
+                task.execute()
+            finally:
+                thread.name = base_name
+                with self._lock:
+                    self._active_workers = self._active_workers - 1
+                    self._idle_workers = self._idle_workers + 1
+                self._release(task)
+                task.finish()
+                idle_since = time.monotonic()
+
+
+class LoadShedder:
+    """Decide which rules to skip when the bot falls behind.
+
+    :param low_lag: lag (in seconds) above which ``low`` priority rules are
+                    skipped
+    :param medium_lag: lag (in seconds) above which ``medium`` priority rules
+                       are skipped, along with ``low`` priority rules
+    :param low_backlog: number of rules waiting for a thread above which
+                        ``low`` priority rules are skipped
+    :param medium_backlog: number of rules waiting for a thread above which
+                           ``medium`` priority rules are skipped, along with
+                           ``low`` priority rules
+
+    A threshold set to ``0`` is disabled. The lag of a message is the time
+    between when the server received it and when the bot dispatches it
+    (as measured by the bot); the backlog is the number of threaded rules waiting for a worker (see
+    :attr:`RuleExecutor.queue_depth`).
+
+    The shedder doesn't know about rules: the bot asks which priorities to
+    shed with :meth:`get_shed_priorities` for each message, then it calls
+    :meth:`shed` for each rule it skips. ``high`` priority rules are never
+    shed, and it is up to the bot to never skip the rules it can't skip.
+    """
+    def __init__(
+        self,
+        low_lag: float = 0,
+        medium_lag: float = 0,
+        low_backlog: int = 0,
+        medium_backlog: int = 0,
+    ) -> None:
+        self.low_lag = low_lag
+        self.medium_lag = medium_lag
+        self.low_backlog = low_backlog
+        self.medium_backlog = medium_backlog
+        self._lock = threading.Lock()
+        self._shed_counts: dict[str, int] = {
+            priority: 0 for priority in SHED_PRIORITIES
+        }
+        self._shed_priorities: frozenset[str] = frozenset()
+
+    @property
+    def is_enabled(self) -> bool:
+        """Tell if at least one threshold is set."""
+        return any(
+            threshold > 0
+            for threshold in (
+                self.low_lag,
+                self.medium_lag,
+                self.low_backlog,
+                self.medium_backlog,
+            )
+        )
+
+    @property
+    def shed_counts(self) -> dict[str, int]:
+        """Number of rules skipped so far, by priority."""
+        with self._lock:
+            return dict(self._shed_counts)
+
+    def get_shed_priorities(self, lag: float, backlog: int) -> frozenset[str]:
+        """Get the priorities of the rules to skip.
+
+        :param lag: the lag of the message to dispatch, in seconds
+        :param backlog: the number of rules waiting for a thread
+        :return: the priorities of the rules to skip for this message
+
+        Every time the result changes, i.e. when the bot starts or stops
+        shedding rules of a priority, it is logged with the number of rules
+        skipped so far.
+        """
+        if self._is_above(lag, self.medium_lag, backlog, self.medium_backlog):
+            priorities = frozenset(SHED_PRIORITIES)
+        elif self._is_above(lag, self.low_lag, backlog, self.low_backlog):
+            priorities = frozenset(SHED_PRIORITIES[:1])
+        else:
+            priorities = frozenset()
+
+        with self._lock:
+            if priorities == self._shed_priorities:
+                return priorities
+            self._shed_priorities = priorities
+            counts = dict(self._shed_counts)
+
+        if priorities:
+            LOGGER.warning(
+                'Shedding %s priority rules (lag: %.1fs, backlog: %d); '
+                'skipped so far: %s',
+                ' & '.join(sorted(priorities)), lag, backlog, counts)
+        else:
+            LOGGER.info(
+                'Stopped shedding rules (lag: %.1fs, backlog: %d); '
+                'skipped so far: %s',
+                lag, backlog, counts)
+
+        return priorities
+
+    def shed(self, priority: str, rule: object) -> None:
+        """Count and log a ``rule`` skipped because of its ``priority``.
+
+        :param priority: the skipped rule's priority
+        :param rule: the skipped rule
+        """
+        with self._lock:
+            self._shed_counts[priority] = self._shed_counts[priority] + 1
+            count = self._shed_counts[priority]
+
+        LOGGER.debug(
+            'Shedding %s (%s priority, %d skipped so far)',
+            rule, priority, count)
+
+    @staticmethod
+    def _is_above(
+        lag: float,
+        lag_threshold: float,
+        backlog: int,
+        backlog_threshold: int,
+    ) -> bool:
+        return bool(
+            (lag_threshold > 0 and lag > lag_threshold)
+            or (backlog_threshold > 0 and backlog > backlog_threshold)
+        )
@@ -18,6 +18,7 @@ from __future__ import annotations
 
 import itertools
 import logging
+import time
 
 from sopel import tools
 from sopel.tools import jobs
@@ -102,6 +103,36 @@ class Scheduler(jobs.Scheduler):
                 if job._handler != callable
             ]
 
+    def _run_job(self, job):
+        if not job.is_async():
+            super()._run_job(job)
+            return
+
+        # the job is running until its coroutine is done on the event loop
+        job.is_running.set()
+        try:
+            self.manager.run_coroutine(self._call_async(job))
+        except RuntimeError as error:
+            LOGGER.warning('Unable to run job %s: %s', job, error)
+            job.next(time.time())
+            job.is_running.clear()
+
+    async def _call_async(self, job):
+        """Wrap the async job's execution to handle its state and errors."""
+        # sopel.bot imports this module
+        from sopel.bot import AsyncSopelWrapper
+
+        # there is no trigger, so messages need an explicit destination
+        wrapper = AsyncSopelWrapper(self.manager, None)
+        try:
+            with job:
+                await job.execute(wrapper)
+        except Exception as error:  # TODO: Be specific
+            LOGGER.error('Error while processing job: %s', error)
+            self.manager.on_job_error(self, job, error)
+        finally:
+            await wrapper.flush()
+
     def _get_ready_jobs(self, now):
         with self._mutex:
             jobs = [
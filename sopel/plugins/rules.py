@@ -17,29 +17,41 @@
 from __future__ import annotations
 
 import abc
+import ast
 import datetime
+import functools
+import inspect
 import itertools
 import logging
 import re
 import threading
 from typing import (
     Any,
+    NamedTuple,
     Type,
     TYPE_CHECKING,
     TypeVar,
 )
 from urllib.parse import urlparse
 
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:
+    # Python < 3.11
+    import sre_parse  # type: ignore[no-redef]
+
 from sopel import tools
 from sopel.config.core_section import (
     COMMAND_DEFAULT_HELP_PREFIX,
     COMMAND_DEFAULT_PREFIX,
     URL_DEFAULT_SCHEMES,
 )
+from sopel.plugins.executor import CONCURRENCY_QUEUE, ConcurrencyLimit
 
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Callable, Iterable, Sequence
 
     from sopel.bot import Sopel
     from sopel.config import Config
@@ -50,6 +62,10 @@ if TYPE_CHECKING:
 
 __all__ = [
     'Manager',
+    'CommandLookup',
+    'LiteralPrefilter',
+    'ChannelPolicy',
+    'DispatchContext',
     'Rule',
     'FindRule',
     'SearchRule',
@@ -89,6 +105,12 @@ PRIORITY_SCALES = {
     PRIORITY_LOW: 1000,
 }
 """Mapping of priority label to priority scale."""
+EVENT_INDEX_MAX_SIZE = 1024
+"""Maximum number of ``(event, ctcp)`` keys cached by the rules manager.
+
+The CTCP command of a line is chosen by whoever sent it, so the index must be
+bounded: once full, rules for unknown keys are selected without being cached.
+"""
 
 
 def _clean_rules(
@@ -185,6 +207,550 @@ def _clean_callable_examples(examples: Iterable[dict]) -> tuple[dict, ...]:
     )
 
 
+_LOOKUP_TRANSLATION = str.maketrans({'\u0130': 'i', '\u0131': 'i'})
+# A prefix made only of these tokens always matches a fixed number of chars:
+# escaped chars, character classes, plain chars, and alternations of these.
+_FIXED_PREFIX_TOKENS = re.compile(
+    r'\\.|\[(?:\\.|[^\]\\])+\]|\||[^\\\[\](){}*+?#]', re.DOTALL)
+
+
+def _lookup_key(word: str) -> str:
+    # ``re.IGNORECASE`` lets "İ" and "ı" match an ASCII "i", unlike casefold
+    return word.translate(_LOOKUP_TRANSLATION).casefold()
+
+
+def _get_prefix_alternatives(prefix: str) -> tuple[re.Pattern, ...] | None:
+    # same whitespace escaping as in Command.get_rule_regex
+    prefix = re.sub(r"(\s)", r"\\\1", prefix)
+    tokens = _FIXED_PREFIX_TOKENS.findall(prefix)
+    if ''.join(tokens) != prefix:
+        # the prefix may match a variable number of chars
+        return None
+
+    alternatives = ['']
+    for token in tokens:
+        if token == '|':
+            alternatives.append('')
+        else:
+            alternatives[-1] = alternatives[-1] + token
+
+    try:
+        return tuple(
+            re.compile(alternative, re.IGNORECASE | re.VERBOSE)
+            for alternative in alternatives
+        )
+    except re.error:
+        return None
+
+
+_REPEAT_OPS = tuple(
+    op
+    for op in (
+        sre_parse.MAX_REPEAT,
+        sre_parse.MIN_REPEAT,
+        getattr(sre_parse, 'POSSESSIVE_REPEAT', None),
+    )
+    if op is not None
+)
+
+
+def _get_literal_runs(parsed: Iterable) -> list[str]:
+    # runs of literal chars required by any match of a parsed pattern
+    runs: list[str] = []
+    current: list[str] = []
+
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+
+        if current:
+            runs.append(''.join(current))
+            current = []
+
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, subpattern = value
+            if not add_flags and not del_flags:
+                runs.extend(_get_literal_runs(subpattern))
+        elif op in _REPEAT_OPS:
+            min_count, _, subpattern = value
+            if min_count > 0:
+                runs.extend(_get_literal_runs(subpattern))
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            runs.extend(_get_literal_runs(value))
+
+    if current:
+        runs.append(''.join(current))
+
+    return runs
+
+
+def _get_required_literal(pattern: re.Pattern) -> tuple[str, bool] | None:
+    """Get the longest literal required by ``pattern``, if any.
+
+    :param pattern: a compiled regex
+    :return: a 2-value tuple ``(literal, ignore_case)``, or ``None``
+
+    When ``ignore_case`` is true, the ``literal`` is normalized like the
+    words of :class:`CommandLookup`, and the text to search must be too.
+    """
+    if not isinstance(pattern.pattern, str):
+        return None
+
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except (re.error, RecursionError):
+        return None
+
+    ignore_case = bool(pattern.flags & re.IGNORECASE)
+    runs = [
+        _lookup_key(run) if ignore_case else run
+        for run in _get_literal_runs(parsed)
+        # only ASCII chars are known to fold the same way as the regex engine
+        if run.isascii() or not ignore_case
+    ]
+
+    if not runs:
+        return None
+
+    return max(runs, key=len), ignore_case
+
+
+class LiteralPrefilter:
+    """Prefilter of generic rules, by the literals their regexes require.
+
+    :param rules: generic rules to prefilter
+
+    Most patterns contain some literal text that any match must include,
+    such as ``://`` or the ``s/`` of a ``s/find/replace/`` pattern. The
+    prefilter gets the longest of these literals for each regex of each rule,
+    then it checks which literals occur in a text, all at once::
+
+        >>> rule = Rule([re.compile(r'hello (\\w+)')])
+        >>> prefilter = LiteralPrefilter([rule])
+        >>> found = prefilter.search('hello world')
+        >>> prefilter.is_candidate(rule, found)
+        True
+        >>> found = prefilter.search('goodbye world')
+        >>> prefilter.is_candidate(rule, found)
+        False
+
+    A rule is a candidate unless every one of its regexes requires a literal
+    that doesn't occur in the text. Each literal is checked only once per
+    text, even when several rules require it. Like with the
+    :class:`CommandLookup`, instances of a subclass are always candidates.
+
+    .. versionadded:: 8.1
+    """
+    def __init__(self, rules: Iterable[AbstractRule]) -> None:
+        self._rule_literals: dict[
+            AbstractRule, frozenset[tuple[str, bool]]
+        ] = {}
+        self._literals: set[str] = set()
+        self._folded_literals: set[str] = set()
+
+        for rule in rules:
+            if not isinstance(rule, Rule) or (
+                # a subclass may match lines differently
+                type(rule) not in (Rule, FindRule, SearchRule)
+            ):
+                continue
+
+            literals = rule.get_required_literals()
+            if not literals or None in literals:
+                # at least one regex must always be evaluated
+                continue
+
+            self._rule_literals[rule] = frozenset(
+                literal for literal in literals if literal is not None)
+            for literal, ignore_case in self._rule_literals[rule]:
+                if ignore_case:
+                    self._folded_literals.add(literal)
+                else:
+                    self._literals.add(literal)
+
+    def search(self, text: str) -> frozenset[tuple[str, bool]]:
+        """Search the known literals in ``text``.
+
+        :param text: the text of a line
+        :return: the literals that occur in ``text``, as ``(literal,
+                 ignore_case)`` tuples
+        """
+        found = [
+            (literal, False)
+            for literal in self._literals
+            if literal in text
+        ]
+
+        if self._folded_literals:
+            folded_text = _lookup_key(text)
+            found.extend(
+                (literal, True)
+                for literal in self._folded_literals
+                if literal in folded_text
+            )
+
+        return frozenset(found)
+
+    def is_candidate(
+        self,
+        rule: AbstractRule,
+        found: frozenset[tuple[str, bool]],
+    ) -> bool:
+        """Tell if ``rule`` may match a text, given the ``found`` literals.
+
+        :param rule: a generic rule
+        :param found: the literals that occur in the text, as returned by
+                      :meth:`search`
+        :return: ``False`` when none of the literals the ``rule`` requires
+                 occur in the text, ``True`` otherwise
+        """
+        literals = self._rule_literals.get(rule)
+        if literals is None:
+            return True
+
+        return not literals.isdisjoint(found)
+
+
+class CommandLookup:
+    """Lookup table of named rules, by the first word of their names.
+
+    :param commands: rules registered as commands
+    :param nick_commands: rules registered as nick commands
+    :param action_commands: rules registered as action commands
+
+    Instead of trying the regex of every named rule against a line, the lookup
+    takes the word used to invoke a command (after the command prefix, after
+    the bot's nick, or at the start of an action), and gives only the rules
+    that have a name or an alias starting with that word::
+
+        >>> lookup = CommandLookup(commands=[Command('hello', prefix=r'\\.')])
+        >>> lookup.get_candidates('.hello world')
+        (<Command (no-plugin).hello []>,)
+        >>> lookup.get_candidates('.bye world')
+        ()
+
+    The candidates must then be matched with their own regex. Named rules that
+    can't be looked up by name are always candidates, such as:
+
+    * a command with a non-ASCII name,
+    * a command with a prefix that can match a variable number of characters,
+    * a nick command with a nick (or nick alias) that contains whitespace,
+    * an instance of a subclass, which may match lines differently.
+
+    .. versionadded:: 8.1
+    """
+    def __init__(
+        self,
+        commands: Iterable[AbstractNamedRule] = tuple(),
+        nick_commands: Iterable[AbstractNamedRule] = tuple(),
+        action_commands: Iterable[AbstractNamedRule] = tuple(),
+    ) -> None:
+        self._order: dict[AbstractNamedRule, int] = {}
+        self._fallback: list[AbstractNamedRule] = []
+        self._prefixed: dict[
+            str,
+            tuple[tuple[re.Pattern, ...], dict[str, list[AbstractNamedRule]]],
+        ] = {}
+        self._nick_names: dict[str, list[AbstractNamedRule]] = {}
+        self._action_names: dict[str, list[AbstractNamedRule]] = {}
+
+        position = itertools.count()
+        for rule in commands:
+            self._order[rule] = next(position)
+            if type(rule) is not Command or not self._can_look_up(rule):
+                self._fallback.append(rule)
+                continue
+            alternatives = _get_prefix_alternatives(rule.prefix)
+            if alternatives is None:
+                self._fallback.append(rule)
+                continue
+            _, names = self._prefixed.setdefault(
+                rule.prefix, (alternatives, {}))
+            self._add(names, rule)
+
+        for rule in nick_commands:
+            self._order[rule] = next(position)
+            if type(rule) is not NickCommand or any(
+                # the command is looked up as the word after the nick
+                any(char.isspace() for char in nick)
+                for nick in (rule.nick, *rule.nick_aliases)
+            ) or not self._can_look_up(rule):
+                self._fallback.append(rule)
+                continue
+            self._add(self._nick_names, rule)
+
+        for rule in action_commands:
+            self._order[rule] = next(position)
+            if type(rule) is not ActionCommand or not self._can_look_up(rule):
+                self._fallback.append(rule)
+                continue
+            self._add(self._action_names, rule)
+
+    @staticmethod
+    def _can_look_up(rule: AbstractNamedRule) -> bool:
+        return all(
+            name and name.isascii() and not name[0].isspace()
+            for name in (rule.name, *rule.aliases)
+        )
+
+    def _add(
+        self,
+        names: dict[str, list[AbstractNamedRule]],
+        rule: AbstractNamedRule,
+    ) -> None:
+        keys: set[str] = {
+            _lookup_key(name.split(None, 1)[0])
+            for name in (rule.name, *rule.aliases)
+        }
+        for key in keys:
+            names.setdefault(key, []).append(rule)
+
+    def get_candidates(self, text: str) -> tuple[AbstractNamedRule, ...]:
+        """Get the named rules that may match ``text``.
+
+        :param text: the text of a line
+        :return: a tuple of candidate rules, in their registration order
+        """
+        candidates = set(self._fallback)
+        words = text.split(None, 2)
+
+        if words and self._action_names:
+            candidates.update(
+                self._action_names.get(_lookup_key(words[0]), []))
+
+        if len(words) > 1 and self._nick_names:
+            candidates.update(
+                self._nick_names.get(_lookup_key(words[1]), []))
+
+        for alternatives, names in self._prefixed.values():
+            for alternative in alternatives:
+                prefix_match = alternative.match(text)
+                if prefix_match is None:
+                    continue
+                word = text[prefix_match.end():].split(None, 1)
+                if word:
+                    candidates.update(names.get(_lookup_key(word[0]), []))
+
+        return tuple(sorted(candidates, key=self._order.__getitem__))
+
+
+class ChannelPolicy:
+    """Plugins and rules disabled in a channel.
+
+    :param disabled_plugins: names of the plugins disabled in the channel;
+                             ``*`` disables every plugin
+    :param disabled_commands: labels of the rules disabled in the channel,
+                              by plugin name
+
+    The rules of the ``coretasks`` plugin are never disabled::
+
+        >>> policy = ChannelPolicy(
+        ...     disabled_plugins=['*'],
+        ...     disabled_commands={'hello': ['say_hello']})
+        >>> policy.is_plugin_disabled('hello')
+        True
+        >>> policy.is_plugin_disabled('coretasks')
+        False
+
+    A policy is usually built once from a channel's section of the
+    configuration with :meth:`from_section`, then used to filter rules out
+    before they are matched against that channel's messages (see
+    :meth:`Manager.get_triggered_rules`).
+
+    .. versionadded:: 8.1
+    """
+    def __init__(
+        self,
+        disabled_plugins: Iterable[str] = tuple(),
+        disabled_commands: dict[str, Iterable[str]] | None = None,
+    ) -> None:
+        plugins = frozenset(
+            name.strip() for name in disabled_plugins if name.strip())
+        self.all_disabled: bool = '*' in plugins
+        """Tell if every plugin is disabled (except ``coretasks``)."""
+        self.disabled_plugins: frozenset[str] = plugins - {'*'}
+        """Names of the disabled plugins."""
+        self.disabled_commands: dict[str, frozenset[str]] = {
+            plugin_name: frozenset(
+                [labels] if isinstance(labels, str) else labels)
+            for plugin_name, labels in (disabled_commands or {}).items()
+            if labels
+        }
+        """Labels of the disabled rules, by plugin name."""
+
+    def __repr__(self):
+        return '<%s plugins=%s commands=%s>' % (
+            self.__class__.__name__,
+            '*' if self.all_disabled else sorted(self.disabled_plugins),
+            {
+                name: sorted(labels)
+                for name, labels in self.disabled_commands.items()
+            },
+        )
+
+    def __bool__(self):
+        return bool(
+            self.all_disabled
+            or self.disabled_plugins
+            or self.disabled_commands
+        )
+
+    @classmethod
+    def from_section(cls, section: Any) -> ChannelPolicy:
+        """Build a policy from a channel's section of the configuration.
+
+        :param section: a channel's section of the configuration
+        :type section: :class:`sopel.config.Config.ConfigSection`
+        :return: the policy for that channel
+
+        The ``disable_plugins`` option is a comma-separated list of plugin
+        names, and the ``disable_commands`` option is a Python literal of a
+        :class:`dict` of rule labels by plugin name. An invalid
+        ``disable_commands`` option is logged and ignored.
+        """
+        disabled_plugins: list[str] = []
+        disabled_commands: dict[str, Iterable[str]] = {}
+
+        if 'disable_plugins' in section and section.disable_plugins:
+            disabled_plugins = str(section.disable_plugins).split(',')
+
+        if 'disable_commands' in section and section.disable_commands:
+            try:
+                value = ast.literal_eval(str(section.disable_commands))
+                if not isinstance(value, dict):
+                    raise ValueError('not a dict')
+            except (ValueError, SyntaxError) as error:
+                LOGGER.warning(
+                    'Ignoring invalid disable_commands in section %s: %s',
+                    section._name, error)
+            else:
+                disabled_commands = value
+
+        policy = cls(disabled_plugins, disabled_commands)
+        if (
+            'coretasks' in policy.disabled_plugins
+            or policy.all_disabled
+            or 'coretasks' in policy.disabled_commands
+        ):
+            LOGGER.debug(
+                'Channel section %s refuses to disable coretasks handlers',
+                section._name)
+
+        return policy
+
+    def is_plugin_disabled(self, plugin_name: str) -> bool:
+        """Tell if every rule of a plugin is disabled.
+
+        :param plugin_name: the plugin's name
+        """
+        if plugin_name == 'coretasks':
+            return False
+
+        return self.all_disabled or plugin_name in self.disabled_plugins
+
+    def is_disabled(self, rule: AbstractRule) -> bool:
+        """Tell if a ``rule`` is disabled.
+
+        :param rule: the rule to check
+        """
+        plugin_name = rule.get_plugin_name()
+        if self.is_plugin_disabled(plugin_name):
+            return True
+
+        if plugin_name == 'coretasks':
+            return False
+
+        labels = self.disabled_commands.get(plugin_name)
+        return labels is not None and rule.get_rule_label() in labels
+
+
+class DispatchContext:
+    """Facts about a line, shared by the rules it is matched against.
+
+    :param bot: Sopel instance
+    :param pretrigger: the line
+
+    Instead of having each rule look at the line to check its preconditions
+    (see :meth:`Rule.match_preconditions`), the rules manager computes these
+    facts once per line with :meth:`from_pretrigger`, then gives them to
+    every rule. Facts that are costly to get, such as the line's tags, are
+    computed only when a rule asks for them.
+
+    .. versionadded:: 8.1
+    """
+    __slots__ = ('event', 'ctcp', 'is_echo_message', '_is_message',
+                 '_pretrigger', '_is_bot_message')
+
+    def __init__(self, bot: Sopel, pretrigger: PreTrigger) -> None:
+        event = pretrigger.event
+        is_message = event == 'PRIVMSG' or event == 'NOTICE'
+
+        self.event: str = event
+        """The line's IRC command."""
+        self.ctcp: str | None = pretrigger.ctcp
+        """The line's CTCP command, if any."""
+        self.is_echo_message: bool = (
+            is_message
+            and pretrigger.nick.lower() == bot.nick.lower()
+        )
+        """If the line is a message sent by the bot itself."""
+        self._is_message = is_message
+        self._pretrigger = pretrigger
+        self._is_bot_message: bool | None = None
+
+    @property
+    def is_bot_message(self) -> bool:
+        """If the line is a message tagged as sent by a bot."""
+        if self._is_bot_message is None:
+            self._is_bot_message = (
+                self._is_message and 'bot' in self._pretrigger.tags)
+        return self._is_bot_message
+
+    @classmethod
+    def from_pretrigger(
+        cls,
+        bot: Sopel,
+        pretrigger: PreTrigger,
+    ) -> DispatchContext:
+        """Compute the dispatch context of a line.
+
+        :param bot: Sopel instance
+        :param pretrigger: the line
+        :return: the line's context
+        """
+        return cls(bot, pretrigger)
+
+
+@functools.lru_cache(maxsize=1024)
+def _accepts_context(method: Callable) -> bool:
+    """Tell if a ``method`` can be given a ``context`` keyword argument.
+
+    :param method: a rule's method, such as :meth:`AbstractRule.match`
+
+    Third-party rules may override a method without its ``context``
+    parameter; they must be called without it.
+    """
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+
+    return any(
+        parameter.name == 'context'
+        or parameter.kind is inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters
+    )
+
+
+class _IndexedRules(NamedTuple):
+    rules: tuple[AbstractRule, ...]
+    generic: tuple[AbstractRule, ...]
+    prefilter: LiteralPrefilter
+    commands: CommandLookup
+    url_callbacks: tuple[AbstractRule, ...]
+
+
 class Manager:
     """Manager of plugin rules.
 
@@ -210,6 +776,11 @@ class Manager:
         self._action_commands = tools.SopelMemoryWithDefault(dict)
         self._url_callbacks = tools.SopelMemoryWithDefault(list)
         self._register_lock = threading.Lock()
+        self._event_index: dict[tuple[str, str | None], _IndexedRules] = {}
+
+    def _invalidate_index(self) -> None:
+        # must be called with the register lock acquired
+        self._event_index = {}
 
     def unregister_plugin(self, plugin_name: str) -> int:
         """Unregister all the rules from a plugin.
@@ -234,6 +805,7 @@ class Manager:
                 rules_count = len(registry[plugin_name])
                 del registry[plugin_name]
                 unregistered_rules = unregistered_rules + rules_count
+            self._invalidate_index()
 
         LOGGER.debug(
             '[%s] Successfully unregistered %d rules',
@@ -249,6 +821,7 @@ class Manager:
         """
         with self._register_lock:
             self._rules[rule.get_plugin_name()].append(rule)
+            self._invalidate_index()
         LOGGER.debug('Rule registered: %s', str(rule))
 
     def register_command(self, command: Command) -> None:
@@ -259,6 +832,7 @@ class Manager:
         with self._register_lock:
             plugin = command.get_plugin_name()
             self._commands[plugin][command.name] = command
+            self._invalidate_index()
         LOGGER.debug('Command registered: %s', str(command))
 
     def register_nick_command(self, command: NickCommand) -> None:
@@ -269,6 +843,7 @@ class Manager:
         with self._register_lock:
             plugin = command.get_plugin_name()
             self._nick_commands[plugin][command.name] = command
+            self._invalidate_index()
         LOGGER.debug('Nick Command registered: %s', str(command))
 
     def register_action_command(self, command: NickCommand) -> None:
@@ -280,6 +855,7 @@ class Manager:
         with self._register_lock:
             plugin = command.get_plugin_name()
             self._action_commands[plugin][command.name] = command
+            self._invalidate_index()
         LOGGER.debug('Action Command registered: %s', str(command))
 
     def register_url_callback(self, url_callback: URLCallback) -> None:
@@ -291,6 +867,7 @@ class Manager:
         with self._register_lock:
             plugin = url_callback.get_plugin_name()
             self._url_callbacks[plugin].append(url_callback)
+            self._invalidate_index()
         LOGGER.debug('URL callback registered: %s', str(url_callback))
 
     def has_rule(self, label: str, plugin: str | None = None) -> bool:
@@ -438,10 +1015,81 @@ class Manager:
         # expose a copy of the registered generic rules
         return self._url_callbacks.items()
 
+    def get_event_rules(
+        self,
+        event: str,
+        ctcp: str | None = None,
+    ) -> tuple[AbstractRule, ...]:
+        """Get the rules that can match an ``event`` and a ``ctcp`` command.
+
+        :param event: the IRC event (command or numeric) of a line
+        :param ctcp: the CTCP command of a line, if any
+        :return: a tuple of the registered rules accepting both, in their
+                 registration order
+
+        The result is kept in an index keyed by ``(event, ctcp)``, which is
+        reset each time a rule is registered or unregistered. It is used by
+        :meth:`get_triggered_rules` so that a line is matched only against the
+        rules whose :meth:`~AbstractRule.match_event` and
+        :meth:`~AbstractRule.match_ctcp` accept it.
+
+        .. versionadded:: 8.1
+        """
+        return self._get_indexed_rules(event, ctcp).rules
+
+    def _get_indexed_rules(
+        self,
+        event: str,
+        ctcp: str | None,
+    ) -> _IndexedRules:
+        key = (event, ctcp)
+        indexed = self._event_index.get(key)
+        if indexed is not None:
+            return indexed
+
+        def accept(rules: Iterable[TypedRule]) -> list[TypedRule]:
+            return [
+                rule
+                for rule in rules
+                if rule.match_event(event) and rule.match_ctcp(ctcp)
+            ]
+
+        with self._register_lock:
+            generic = accept(itertools.chain(*self._rules.values()))
+            commands: list[AbstractNamedRule] = accept(itertools.chain(
+                *(rules.values() for rules in self._commands.values())))
+            nick_commands: list[AbstractNamedRule] = accept(itertools.chain(
+                *(rules.values() for rules in self._nick_commands.values())))
+            action_commands: list[AbstractNamedRule] = accept(itertools.chain(
+                *(rules.values() for rules in self._action_commands.values())))
+            url_callbacks = accept(
+                itertools.chain(*self._url_callbacks.values()))
+
+            indexed = _IndexedRules(
+                rules=tuple(itertools.chain(
+                    generic,
+                    commands,
+                    nick_commands,
+                    action_commands,
+                    url_callbacks,
+                )),
+                generic=tuple(generic),
+                prefilter=LiteralPrefilter(generic),
+                commands=CommandLookup(
+                    commands, nick_commands, action_commands),
+                url_callbacks=tuple(url_callbacks),
+            )
+            if len(self._event_index) < EVENT_INDEX_MAX_SIZE:
+                self._event_index[key] = indexed
+
+        return indexed
+
     def get_triggered_rules(
         self,
         bot: Sopel,
         pretrigger: PreTrigger,
+        policy: ChannelPolicy | None = None,
+        context: DispatchContext | None = None,
     ) -> tuple[tuple[AbstractRule, re.Match[str]], ...]:
         """Get triggered rules with their match objects, sorted by priorities.
 
@@ -449,32 +1097,61 @@ class Manager:
         :type bot: :class:`sopel.bot.Sopel`
         :param pretrigger: IRC line
         :type pretrigger: :class:`sopel.trigger.PreTrigger`
+        :param policy: optional policy of the channel the line comes from;
+                       rules it disables are not matched at all
+        :param context: optional context of the line; computed from the
+                        ``pretrigger`` if omitted
         :return: a tuple of ``(rule, match)``, sorted by priorities
         :rtype: tuple
+
+        Only the rules that accept the ``pretrigger``'s event and CTCP command
+        are tried (see :meth:`get_event_rules`). Among them, named rules are
+        first looked up by the word used to invoke them (see
+        :class:`CommandLookup`), and generic rules are skipped when the text
+        lacks the literals their regexes require (see
+        :class:`LiteralPrefilter`).
+
+        .. versionchanged:: 8.1
+
+            Rules are selected from an index keyed by event and CTCP command
+            instead of trying every registered rule, named rules are looked
+            up by name, and generic rules are prefiltered by literals.
+
+            Added the ``policy`` and ``context`` parameters. The context
+            is computed once and shared by all the rules (see
+            :class:`DispatchContext`).
+
         """
-        generic_rules = self._rules.values()
-        command_rules = (
-            rules_dict.values()
-            for rules_dict in self._commands.values())
-        nick_rules = (
-            rules_dict.values()
-            for rules_dict in self._nick_commands.values())
-        action_rules = (
-            rules_dict.values()
-            for rules_dict in self._action_commands.values())
-        url_callback_rules = self._url_callbacks.values()
-
-        rules = itertools.chain(
-            itertools.chain(*generic_rules),
-            itertools.chain(*command_rules),
-            itertools.chain(*nick_rules),
-            itertools.chain(*action_rules),
-            itertools.chain(*url_callback_rules),
+        indexed = self._get_indexed_rules(pretrigger.event, pretrigger.ctcp)
+        args = pretrigger.args
+        text = args[-1] if args else ''
+        found = indexed.prefilter.search(text)
+        generic_rules = []
+        for rule in indexed.generic:
+            if indexed.prefilter.is_candidate(rule, found):
+                generic_rules.append(rule)
+                if isinstance(rule, Rule):
+                    rule.get_prefilter_metrics().evaluate()
+            elif isinstance(rule, Rule):
+                rule.get_prefilter_metrics().skip()
+
+        rules: Iterable[AbstractRule] = itertools.chain(
+            generic_rules,
+            indexed.commands.get_candidates(text),
+            indexed.url_callbacks,
         )
+        if policy:
+            rules = (rule for rule in rules if not policy.is_disabled(rule))
+        if context is None:
+            context = DispatchContext.from_pretrigger(bot, pretrigger)
         matches = (
             (rule, match)
             for rule in rules
-            for match in rule.match(bot, pretrigger)
+            for match in (
+                rule.match(bot, pretrigger, context=context)
+                if _accepts_context(type(rule).match)
+                else rule.match(bot, pretrigger)
+            )
         )
         # Returning a tuple instead of a sorted object ensures that:
         #   1. it's not a lazy object
@@ -559,6 +1236,31 @@ class RuleMetrics:
         self.end()
 
 
+class PrefilterMetrics:
+    """Tracker of how often a rule's regexes are skipped by the prefilter.
+
+    .. seealso::
+
+        The :class:`LiteralPrefilter` decides when a rule can be skipped.
+
+    .. versionadded:: 8.1
+    """
+    def __init__(self, regex_count: int) -> None:
+        self.regex_count = regex_count
+        self.skipped: int = 0
+        """Number of regex evaluations avoided by the prefilter."""
+        self.evaluated: int = 0
+        """Number of regex evaluations after the prefilter."""
+
+    def skip(self) -> None:
+        """Record that the rule's regexes were skipped for a line."""
+        self.skipped = self.skipped + self.regex_count
+
+    def evaluate(self) -> None:
+        """Record that the rule's regexes were evaluated for a line."""
+        self.evaluated = self.evaluated + self.regex_count
+
+
 class AbstractRule(abc.ABC):
     """Abstract definition of a plugin's rule.
 
@@ -695,11 +1397,21 @@ class AbstractRule(abc.ABC):
         """
 
     @abc.abstractmethod
-    def match(self, bot: Sopel, pretrigger: PreTrigger) -> Iterable[re.Match]:
+    def match(
+        self,
+        bot: Sopel,
+        pretrigger: PreTrigger,
+        context: DispatchContext | None = None,
+    ) -> Iterable[re.Match]:
         """Match a pretrigger according to the rule.
 
         :param bot: Sopel instance
         :param pretrigger: line to match
+        :param context: optional context of the line, shared by all rules
+                        (see :class:`DispatchContext`)
+
+        The rules manager gives the ``context`` only to implementations that
+        accept it, so subclasses may omit it.
 
         This method must return a list of `match objects`__.
 
@@ -758,6 +1470,30 @@ class AbstractRule(abc.ABC):
         :rtype: bool
         """
 
+    def is_async(self) -> bool:
+        """Tell if the rule's handler is a coroutine function.
+
+        :return: ``True`` if the rule must be executed with
+                 :meth:`execute_async` on the bot's event loop, ``False``
+                 otherwise
+
+        By default, a rule is not asynchronous.
+
+        .. versionadded:: 8.1
+        """
+        return False
+
+    def get_concurrency_limit(self) -> ConcurrencyLimit | None:
+        """Get the limit of threaded executions of this rule at once.
+
+        :return: the rule's concurrency limit, if any
+
+        By default, a rule has no concurrency limit.
+
+        .. versionadded:: 8.1
+        """
+        return None
+
     @abc.abstractmethod
     def is_unblockable(self) -> bool:
         """Tell if the rule is unblockable.
@@ -904,6 +1640,22 @@ class AbstractRule(abc.ABC):
         This is the method called by the bot when a rule matches a ``trigger``.
         """
 
+    async def execute_async(self, bot, trigger):
+        """Execute the triggered rule on the bot's event loop.
+
+        :param bot: Sopel wrapper
+        :type bot: :class:`sopel.bot.AsyncSopelWrapper`
+        :param trigger: IRC line
+        :type trigger: :class:`sopel.trigger.Trigger`
+
+        This is the method called by the bot instead of :meth:`execute` when
+        the rule :meth:`is asynchronous<is_async>`. By default, it calls
+        :meth:`execute`.
+
+        .. versionadded:: 8.1
+        """
+        return self.execute(bot, trigger)
+
 
 class Rule(AbstractRule):
     """Generic rule definition.
@@ -964,6 +1716,9 @@ class Rule(AbstractRule):
             'allow_bots': handler.allow_bots,
             'allow_echo': handler.allow_echo,
             'threaded': handler.threaded,
+            'asynchronous': handler.is_async,
+            'max_concurrency': handler.max_concurrency,
+            'concurrency_policy': handler.concurrency_policy,
             'output_prefix': handler.output_prefix or '',
             'unblockable': handler.unblockable,
             'rate_limit_admins': handler.rate_limit_admins,
@@ -1076,6 +1831,9 @@ class Rule(AbstractRule):
         allow_bots: bool = False,
         allow_echo: bool = False,
         threaded: bool = True,
+        asynchronous: bool = False,
+        max_concurrency: int = 0,
+        concurrency_policy: str = CONCURRENCY_QUEUE,
         output_prefix: str | None = None,
         unblockable: bool = False,
         rate_limit_admins: bool = False,
@@ -1105,7 +1863,15 @@ class Rule(AbstractRule):
 
         # execution
         self._threaded = bool(threaded)
+        self._asynchronous = bool(asynchronous)
         self._output_prefix = output_prefix or ''
+        self._concurrency_limit: ConcurrencyLimit | None = None
+        if max_concurrency:
+            self._concurrency_limit = ConcurrencyLimit(
+                '%s.%s' % (plugin or '(no-plugin)', label or '(generic)'),
+                max_concurrency,
+                concurrency_policy,
+            )
 
         # rate limiting
         self._unblockable = bool(unblockable)
@@ -1122,6 +1888,10 @@ class Rule(AbstractRule):
         self._metrics_nick: dict[Identifier, RuleMetrics] = {}
         self._metrics_sender: dict[Identifier, RuleMetrics] = {}
         self._metrics_global = RuleMetrics()
+        self._metrics_prefilter = PrefilterMetrics(len(regexes))
+        self._required_literals: tuple[
+            tuple[str, bool] | None, ...
+        ] | None = None
 
         # docs & tests
         self._usages = usages or tuple()
@@ -1186,38 +1956,52 @@ class Rule(AbstractRule):
     def get_output_prefix(self):
         return self._output_prefix
 
-    def match(self, bot, pretrigger):
+    def match(self, bot, pretrigger, context=None):
         args = pretrigger.args
         text = args[-1] if args else ''
 
-        if not self.match_preconditions(bot, pretrigger):
+        if not self._match_preconditions(bot, pretrigger, context):
             return []
 
         # parse text
         return self.parse(text)
 
-    def match_preconditions(self, bot, pretrigger):
-        event = pretrigger.event
-        ctcp_command = pretrigger.ctcp
-        nick = pretrigger.nick
-        is_bot_message = (
-            'bot' in pretrigger.tags and
-            event in ["PRIVMSG", "NOTICE"]
-        )
-        is_echo_message = (
-            nick.lower() == bot.nick.lower() and
-            event in ["PRIVMSG", "NOTICE"]
-        )
+    def match_preconditions(self, bot, pretrigger, context=None):
+        """Tell if the rule accepts the line before parsing its text.
+
+        :param bot: Sopel instance
+        :param pretrigger: the line
+        :param context: optional context of the line; computed from the
+                        ``pretrigger`` if omitted
+        :type context: :class:`DispatchContext`
+        :return: ``True`` when the line's event, CTCP command, and origin
+                 (bot or echo message) are accepted
+
+        .. versionchanged:: 8.1
+
+            Added the ``context`` parameter.
 
+        """
+        if context is None:
+            context = DispatchContext.from_pretrigger(bot, pretrigger)
+
+        is_echo_message = context.is_echo_message
         return (
-            self.match_event(event) and
-            self.match_ctcp(ctcp_command) and
+            self.match_event(context.event) and
+            self.match_ctcp(context.ctcp) and
             (
-                (not is_bot_message or self.allow_bots()) or
+                (not context.is_bot_message or self.allow_bots()) or
                 (is_echo_message and self.allow_echo())
             ) and (not is_echo_message or self.allow_echo())
         )
 
+    def _match_preconditions(self, bot, pretrigger, context):
+        # subclasses may override match_preconditions without the context
+        if context is not None and _accepts_context(
+                type(self).match_preconditions):
+            return self.match_preconditions(bot, pretrigger, context)
+        return self.match_preconditions(bot, pretrigger)
+
     def parse(self, text: str) -> Iterable[re.Match]:
         for regex in self._regexes:
             result = regex.match(text)
@@ -1245,6 +2029,12 @@ class Rule(AbstractRule):
     def is_threaded(self):
         return self._threaded
 
+    def is_async(self):
+        return self._asynchronous
+
+    def get_concurrency_limit(self):
+        return self._concurrency_limit
+
     def is_unblockable(self):
         return self._unblockable
 
@@ -1260,6 +2050,30 @@ class Rule(AbstractRule):
     def get_global_metrics(self) -> RuleMetrics:
         return self._metrics_global
 
+    def get_prefilter_metrics(self) -> PrefilterMetrics:
+        """Get the rule's prefilter metrics.
+
+        .. versionadded:: 8.1
+        """
+        return self._metrics_prefilter
+
+    def get_required_literals(self) -> tuple[tuple[str, bool] | None, ...]:
+        """Get the literal required by each of the rule's regexes.
+
+        :return: a tuple with a ``(literal, ignore_case)`` tuple for each
+                 regex, or ``None`` for a regex that doesn't require any
+
+        This is used by the :class:`LiteralPrefilter` to skip the rule when
+        the text of a line lacks the literals its regexes require.
+
+        .. versionadded:: 8.1
+        """
+        if self._required_literals is None:
+            self._required_literals = tuple(
+                _get_required_literal(regex) for regex in self._regexes)
+
+        return self._required_literals
+
     @property
     def user_rate_limit(self) -> datetime.timedelta:
         return datetime.timedelta(seconds=self._user_rate_limit)
@@ -1335,6 +2149,27 @@ class Rule(AbstractRule):
         # return exit code
         return exit_code
 
+    async def execute_async(self, bot, trigger):
+        if not self._handler:
+            raise RuntimeError('Improperly configured rule: no handler')
+
+        user_metrics: RuleMetrics = self._metrics_nick.setdefault(
+            trigger.nick, RuleMetrics())
+        sender_metrics: RuleMetrics = self._metrics_sender.setdefault(
+            trigger.sender, RuleMetrics())
+
+        # execute and await the handler
+        with user_metrics, sender_metrics, self._metrics_global:
+            exit_code = self._handler(bot, trigger)
+            if inspect.isawaitable(exit_code):
+                exit_code = await exit_code
+            user_metrics.set_return_value(exit_code)
+            sender_metrics.set_return_value(exit_code)
+            self._metrics_global.set_return_value(exit_code)
+
+        # return exit code
+        return exit_code
+
 
 class AbstractNamedRule(Rule):
     """Abstract base class for named rules.
@@ -1460,6 +2295,14 @@ class Command(AbstractNamedRule):
         self._help_prefix = help_prefix
         self._regexes = (self.get_rule_regex(),)
 
+    @property
+    def prefix(self) -> str:
+        """The command prefix, as a regex pattern.
+
+        .. versionadded:: 8.1
+        """
+        return self._prefix
+
     def __str__(self):
         label = self.get_rule_label()
         plugin = self.get_plugin_name() or '(no-plugin)'
@@ -1587,6 +2430,22 @@ class NickCommand(AbstractNamedRule):
                               else tuple())
         self._regexes = (self.get_rule_regex(),)
 
+    @property
+    def nick(self) -> str:
+        """The nick this command reacts to.
+
+        .. versionadded:: 8.1
+        """
+        return self._nick
+
+    @property
+    def nick_aliases(self) -> tuple[str, ...]:
+        """The other nicks this command reacts to.
+
+        .. versionadded:: 8.1
+        """
+        return self._nick_aliases
+
     def __str__(self):
         label = self.get_rule_label()
         plugin = self.get_plugin_name() or '(no-plugin)'
@@ -1907,11 +2766,18 @@ class URLCallback(Rule):
         # prevent mutability of registered schemes
         self._schemes: tuple[str, ...] = tuple(schemes or URL_DEFAULT_SCHEMES)
 
-    def match(self, bot: Sopel, pretrigger: PreTrigger) -> Iterable[re.Match]:
+    def match(
+        self,
+        bot: Sopel,
+        pretrigger: PreTrigger,
+        context: DispatchContext | None = None,
+    ) -> Iterable[re.Match]:
         """Match URL(s) in a pretrigger according to the rule.
 
         :param bot: Sopel instance
         :param pretrigger: line to match
+        :param context: optional context of the line (see
+                        :meth:`~Rule.match_preconditions`)
 
         This method looks for :attr:`URLs in the IRC line
         <sopel.trigger.PreTrigger.urls>`, and for each it yields
@@ -1924,7 +2790,7 @@ class URLCallback(Rule):
             <sopel.config.core_section.CoreSection.auto_url_schemes>` option.
 
         """
-        if not self.match_preconditions(bot, pretrigger):
+        if not self._match_preconditions(bot, pretrigger, context):
             return
 
         # Parse only valid URLs with wanted schemes
@@ -4,12 +4,17 @@
 """
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import threading
 from typing import Iterable, NoReturn, TYPE_CHECKING
 
 from sopel.irc.abstract_backends import AbstractIRCBackend
 
 
 if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
     from sopel.bot import Sopel
     from sopel.irc import AbstractBot
     from sopel.trigger import PreTrigger
@@ -81,6 +86,40 @@ class MockIRCBackend(AbstractIRCBackend):
         """Store ``data`` into :attr:`message_sent`."""
         self.message_sent.append(data)
 
+    def run_coroutine(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Run ``coro`` in a new event loop, and wait until it is done.
+
+        :return: a future already done with the coroutine's result
+
+        Unlike a real backend, this doesn't run ``coro`` concurrently, so
+        tests can check its effects (such as :attr:`message_sent`) as soon as
+        this method returns.
+
+        When called from a running event loop, ``coro`` runs in a new event
+        loop in another thread, as :func:`asyncio.run` can't be called from a
+        running event loop; the caller still waits until it is done.
+
+        .. versionadded:: 8.1
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def run() -> None:
+            try:
+                future.set_result(asyncio.run(coro))
+            except Exception as error:
+                future.set_exception(error)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            run()
+        else:
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+
+        return future
+
     def clear_message_sent(self) -> list[bytes]:
         """Clear and return previous messages sent.
 
@@ -43,9 +43,10 @@ def get_sendable_message(text, max_length=400):
     when messages will be split, but callers can specify a different value
     (e.g. to account precisely for the bot's hostmask).
 
-    The ``max_length`` is the max length of text in **bytes**, but we take
-    care of multibyte UTF-8 characters by working on the Unicode string,
-    then making sure the bytes version is smaller than the max length.
+    The ``max_length`` is the max length of text in **bytes**: the text is
+    encoded once, and cut at the last space that fits, or else at the last
+    complete UTF-8 character that fits, so multibyte characters are never
+    split.
 
     .. note::
 
@@ -59,24 +60,30 @@ def get_sendable_message(text, max_length=400):
         ``max_length`` argument.
 
     .. versionadded:: 6.6.2
+    .. versionchanged:: 8.1
+
+        The text is no longer encoded again for each removed character, which
+        made splitting long multibyte messages slow. The result is the same.
+
     """
-    unicode_max_length = max_length
-    excess = ''
-
-    while len(text.encode('utf-8')) > max_length:
-        last_space = text.rfind(' ', 0, unicode_max_length)
-        if last_space == -1:
-            # No last space, just split where it is possible
-            excess = text[unicode_max_length:] + excess
-            text = text[:unicode_max_length]
-            # Decrease max length for the unicode string
-            unicode_max_length = unicode_max_length - 1
-        else:
-            # Split at the last best space found
-            excess = text[last_space:] + excess
-            text = text[:last_space]
-
-    return text, excess.lstrip()
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_length:
+        return text, ''
+
+    # a space is always a single byte, never part of a multibyte character
+    last_space = encoded.rfind(b' ', 0, max_length + 1)
+    if last_space == max_length and encoded[:last_space].isascii():
+        # a space right after max_length characters is not a valid cut
+        last_space = encoded.rfind(b' ', 0, max_length)
+
+    if last_space != -1:
+        # split at the last space that fits
+        sendable = encoded[:last_space].decode('utf-8')
+    else:
+        # no space to split on: keep as many whole characters as possible
+        sendable = encoded[:max_length].decode('utf-8', 'ignore')
+
+    return sendable, text[len(sendable):].lstrip()
 
 
 def get_hostmask_regex(mask):
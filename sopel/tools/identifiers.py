@@ -34,6 +34,7 @@ which should be provided by the :class:`bot<sopel.bot.Sopel>`.
 """
 from __future__ import annotations
 
+import functools
 import string
 from typing import Callable
 
@@ -158,8 +159,13 @@ class Identifier(str):
 
             Now uses the :attr:`casemapping` function to lower the identifier.
 
+        .. versionchanged:: 8.1
+
+            The lowercase version is computed once, when the identifier is
+            created.
+
         """
-        return self.casemapping(self)
+        return self._lowered
 
     @staticmethod
     def _lower(identifier: str) -> str:
@@ -242,7 +248,12 @@ class Identifier(str):
         return str.__ge__(self._lowered, other)
 
     def __eq__(self, other):
-        if isinstance(other, str):
+        if isinstance(other, Identifier) and (
+            other.casemapping is self.casemapping
+        ):
+            # already lowered the same way
+            other = other._lowered
+        elif isinstance(other, str):
             other = self.casemapping(other)
         return str.__eq__(self._lowered, other)
 
@@ -281,3 +292,65 @@ class Identifier(str):
 
 IdentifierFactory = Callable[[str], Identifier]
 """Type definition of an identifier factory."""
+
+
+class InternedIdentifierFactory:
+    """Identifier factory that reuses the identifiers it creates.
+
+    :param casemapping: a casemapping function (optional keyword argument)
+    :param chantypes: tuple of prefixes used for channels (optional keyword
+                      argument)
+    :param maxsize: maximum number of identifiers to keep (optional keyword
+                    argument)
+
+    Calling this factory with a name returns an :class:`Identifier` for that
+    name, using ``casemapping`` and ``chantypes``. The same identifier is
+    returned for the same name, so it is lowered only once, and dict lookups
+    with it can match by identity::
+
+        >>> from sopel.tools import identifiers
+        >>> factory = identifiers.InternedIdentifierFactory()
+        >>> factory('Sopel') is factory('Sopel')
+        True
+        >>> factory('Sopel') is factory('sopel')
+        False
+
+    Names are compared as plain strings (case-sensitive), and up to
+    ``maxsize`` of the most recently used identifiers are kept.
+
+    .. note::
+
+        A factory is bound to a casemapping: a new factory is required when
+        the server's ``CASEMAPPING`` or ``CHANTYPES`` change.
+
+    .. versionadded:: 8.1
+    """
+    def __init__(
+        self,
+        *,
+        casemapping: Casemapping = rfc1459_lower,
+        chantypes: tuple = DEFAULT_CHANTYPES,
+        maxsize: int = 10000,
+    ) -> None:
+        self.casemapping: Casemapping = casemapping
+        """Casemapping function of the identifiers."""
+        self.chantypes: tuple = chantypes
+        """Tuple of prefixes used for channels by the identifiers."""
+        self._get = functools.lru_cache(maxsize=maxsize)(self._create)
+
+    def _create(self, name: str) -> Identifier:
+        return Identifier(
+            name,
+            casemapping=self.casemapping,
+            chantypes=self.chantypes,
+        )
+
+    def __call__(self, name: str) -> Identifier:
+        if type(name) is not str:
+            # Identifiers compare case-insensitively: key by the plain string
+            name = str(name)
+        return self._get(name)
+
+    def cache_clear(self) -> None:
+        """Forget every identifier created so far."""
+        self._get.cache_clear()
@@ -277,6 +277,7 @@ class Job:
             'plugin': handler.plugin_name,
             'label': handler.label,
             'threaded': handler.threaded,
+            'asynchronous': handler.is_async,
             'doc': handler.doc,
         }
 
@@ -301,7 +302,8 @@ class Job:
                  label=None,
                  handler=None,
                  threaded=True,
-                 doc=None):
+                 doc=None,
+                 asynchronous=False):
         # scheduling
         now = time.time()
         self.intervals = set(intervals)
@@ -320,6 +322,7 @@ class Job:
         # execution
         self._handler = handler
         self._threaded = bool(threaded)
+        self._asynchronous = bool(asynchronous)
         self.is_running = threading.Event()
         """Running flag: it tells if the job is running or not.
 
@@ -419,6 +422,17 @@ class Job:
         """
         return self._threaded
 
+    def is_async(self):
+        """Tell if the job's handler is a coroutine function.
+
+        :return: ``True`` if the handler must be awaited on an event loop,
+                 ``False`` otherwise
+        :rtype: bool
+
+        .. versionadded:: 8.1
+        """
+        return self._asynchronous
+
     def is_ready_to_run(self, at_time):
         """Check if this job is (or will be) ready to run at the given time.
 
@@ -0,0 +1,437 @@
+"""Precompiled matchers for nicknames, hosts, and hostmasks.
+
+Sopel checks every message it receives against the ``nick_blocks``,
+``host_blocks``, and ``hostmask_blocks`` settings, and every triggered rule
+against the ``owner`` and ``admins`` settings. Instead of compiling each
+entry of these lists again and again, the bot keeps a :class:`Blocklist` and
+an :class:`AccessMatcher`, and rebuilds them only when the settings change.
+
+.. versionadded:: 8.1
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import logging
+import re
+import threading
+from typing import Callable, Iterable, NamedTuple, TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from sopel.config import Config
+    from sopel.tools.identifiers import Identifier
+
+
+__all__ = [
+    'AccessMatcher',
+    'AccessVerdict',
+    'BlockVerdict',
+    'Blocklist',
+    'PatternSet',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+VERDICT_CACHE_SIZE = 1024
+"""Maximum number of verdicts a :class:`Blocklist` or an
+:class:`AccessMatcher` remembers."""
+
+# a pattern without any of these can match only one (case-insensitive) string
+_REGEX_SPECIAL_CHARS = frozenset('\\.^$*+?{}[]|()')
+
+
+def _is_literal(pattern: str) -> bool:
+    return _REGEX_SPECIAL_CHARS.isdisjoint(pattern)
+
+
+def _get_hostmask_pattern(mask: str) -> str:
+    # same as sopel.tools.get_hostmask_regex, without compiling it
+    return re.escape(mask).replace(r'\*', '.*') + '$'
+
+
+class PatternSet:
+    """Set of regex patterns, each matching a whole string.
+
+    :param patterns: the regex patterns; empty entries are ignored
+    :param name: the set's name, used in logs
+
+    A string matches the set when it is equal to one of its entries, or when
+    one of them, as a case-insensitive regex, matches the whole string::
+
+        >>> patterns = PatternSet([r'spam(bot)?', r'evil\\.example\\.com'])
+        >>> patterns.matches('SpamBot')
+        True
+        >>> patterns.matches('evil.example.com')
+        True
+        >>> patterns.matches('spambot2')
+        False
+
+    Entries without any special character are checked with a lookup in a
+    set of lowercased strings, and the other entries are combined into a
+    single compiled regex. An entry that is not a valid regex is logged, and
+    only matches a string equal to it.
+    """
+    def __init__(self, patterns: Iterable[str], name: str = 'patterns') -> None:
+        self.name = name
+        self.exact: frozenset[str] = frozenset()
+        """Entries, matching strings equal to them."""
+        self.literals: frozenset[str] = frozenset()
+        """Lowercased entries without any special character."""
+        self.regexes: tuple[re.Pattern, ...] = tuple()
+        """Compiled regexes of the other entries.
+
+        Entries that can be combined share a single regex.
+        """
+
+        exact = set()
+        literals = set()
+        combinable = []
+        standalone = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern:
+                continue
+
+            exact.add(pattern)
+            if _is_literal(pattern):
+                literals.add(pattern.lower())
+                continue
+
+            try:
+                compiled = re.compile(pattern + '$', re.IGNORECASE)
+            except re.error as error:
+                LOGGER.warning(
+                    'Invalid regex in %s: %r (%s); matching it as is',
+                    name, pattern, error)
+                continue
+
+            if compiled.groups or pattern.startswith('(?'):
+                # groups are renumbered and flags are misplaced when combined
+                standalone.append(compiled)
+            else:
+                combinable.append(pattern)
+
+        self.exact = frozenset(exact)
+        self.literals = frozenset(literals)
+
+        regexes = []
+        if combinable:
+            combined = '|'.join(
+                '(?:%s$)' % pattern for pattern in combinable)
+            try:
+                regexes.append(re.compile(combined, re.IGNORECASE))
+            except re.error:
+                regexes.extend(
+                    re.compile(pattern + '$', re.IGNORECASE)
+                    for pattern in combinable
+                )
+        self.regexes = tuple(regexes + standalone)
+
+    def __bool__(self):
+        return bool(self.exact)
+
+    def __len__(self):
+        return len(self.exact)
+
+    def matches(self, value: str) -> bool:
+        """Tell if ``value`` matches any of the patterns.
+
+        :param value: the string to check
+        """
+        if value in self.exact or value.lower() in self.literals:
+            return True
+
+        return any(regex.match(value) for regex in self.regexes)
+
+
+class BlockVerdict(NamedTuple):
+    """Result of the check of a message's source against a blocklist."""
+    nick: bool
+    """If the nickname is blocked."""
+    host: bool
+    """If the hostname is blocked."""
+    hostmask: bool
+    """If the hostmask is blocked."""
+
+    def __bool__(self):
+        return self.nick or self.host or self.hostmask
+
+
+class Blocklist:
+    """Precompiled ``nick_blocks``, ``host_blocks``, and ``hostmask_blocks``.
+
+    :param nicks: patterns of blocked nicknames
+    :param hosts: patterns of blocked hostnames
+    :param hostmasks: patterns of blocked hostmasks
+    :param identifier_factory: factory used to compare nicknames; if
+                               omitted, nicknames are compared as strings
+    :param cache_size: maximum number of verdicts to remember
+
+    Each list is compiled into a :class:`PatternSet`. A nickname also matches
+    an entry that is the same :class:`~sopel.tools.identifiers.Identifier`.
+
+    The most recent verdicts are remembered by source, so a busy user's
+    messages are not checked again and again. The settings being read only
+    once, the blocklist must be built again when they change.
+    """
+    def __init__(
+        self,
+        nicks: Iterable[str] = tuple(),
+        hosts: Iterable[str] = tuple(),
+        hostmasks: Iterable[str] = tuple(),
+        identifier_factory: Callable[[str], Identifier] | None = None,
+        cache_size: int = VERDICT_CACHE_SIZE,
+    ) -> None:
+        self.nicks = PatternSet(nicks, 'nick_blocks')
+        self.hosts = PatternSet(hosts, 'host_blocks')
+        self.hostmasks = PatternSet(hostmasks, 'hostmask_blocks')
+        self._identifier_factory = identifier_factory
+        self._nick_identifiers: frozenset[str] = frozenset(
+            identifier_factory(nick) if identifier_factory else nick
+            for nick in self.nicks.exact
+        )
+        self._cached_check = functools.lru_cache(maxsize=cache_size)(
+            self._check)
+
+    def __bool__(self):
+        return bool(self.nicks or self.hosts or self.hostmasks)
+
+    def check(
+        self,
+        nick: str | None,
+        host: str | None,
+        hostmask: str | None,
+    ) -> BlockVerdict:
+        """Check a message's source against the blocklist.
+
+        :param nick: the source's nickname
+        :param host: the source's hostname
+        :param hostmask: the source's full hostmask
+        :return: which parts of the source are blocked
+
+        Verdicts are cached, and the cache is bounded by the ``cache_size``
+        given to the blocklist.
+        """
+        # identifiers are equal when casemapped, but regexes must get the
+        # exact nickname: the cache must not mix them up
+        if nick is not None:
+            nick = str(nick)
+
+        return self._cached_check(nick, host, hostmask)
+
+    def is_nick_blocked(self, nick: str | None) -> bool:
+        """Tell if a nickname is blocked.
+
+        :param nick: the nickname to check
+        """
+        if not nick:
+            return False
+
+        identifier = (
+            self._identifier_factory(nick)
+            if self._identifier_factory
+            else nick
+        )
+        return (
+            identifier in self._nick_identifiers
+            or self.nicks.matches(str(nick))
+        )
+
+    def is_host_blocked(self, host: str | None) -> bool:
+        """Tell if a hostname is blocked.
+
+        :param host: the hostname to check
+        """
+        if not host:
+            return False
+
+        return self.hosts.matches(host)
+
+    def is_hostmask_blocked(self, hostmask: str | None) -> bool:
+        """Tell if a hostmask is blocked.
+
+        :param hostmask: the hostmask to check
+        """
+        if not hostmask:
+            return False
+
+        return self.hostmasks.matches(hostmask)
+
+    def _check(
+        self,
+        nick: str | None,
+        host: str | None,
+        hostmask: str | None,
+    ) -> BlockVerdict:
+        return BlockVerdict(
+            self.is_nick_blocked(nick),
+            self.is_host_blocked(host),
+            self.is_hostmask_blocked(hostmask),
+        )
+
+
+class AccessVerdict(NamedTuple):
+    """Result of the check of a message's source against the bot's access
+    settings."""
+    owner: bool
+    """If the source is the bot's owner."""
+    admin: bool
+    """If the source is one of the bot's admins (including its owner)."""
+
+
+class AccessMatcher:
+    """Precompiled ``owner`` and ``admins`` settings.
+
+    :param owner: the owner's nickname or hostmask
+    :param owner_account: the owner's account; if set, the ``owner``
+                          setting is ignored
+    :param admins: the admins' nicknames or hostmasks
+    :param admin_accounts: the admins' accounts
+    :param cache_size: maximum number of verdicts to remember
+
+    Nicknames and hostmasks can contain ``*`` wildcards (see
+    :func:`sopel.tools.get_hostmask_regex`), and they are matched against
+    both the source's ``nick`` and ``nick@host``::
+
+        >>> matcher = AccessMatcher('Owner', admins=['*@admin.example'])
+        >>> matcher.check('owner', 'example.com', None)
+        AccessVerdict(owner=True, admin=True)
+        >>> matcher.check('Someone', 'admin.example', None)
+        AccessVerdict(owner=False, admin=True)
+
+    The most recent verdicts are remembered by nickname, along with the host
+    and account they were given for: a verdict is not used for another host
+    or account. Still, a nickname can be forgotten with :meth:`forget` when
+    its host or account changes. The settings being read only once, the
+    matcher must be built again when they change.
+    """
+    def __init__(
+        self,
+        owner: str | None = None,
+        owner_account: str | None = None,
+        admins: Iterable[str] = tuple(),
+        admin_accounts: Iterable[str] = tuple(),
+        cache_size: int = VERDICT_CACHE_SIZE,
+    ) -> None:
+        self.owner_account = owner_account
+        self.admin_accounts: frozenset[str] = frozenset(admin_accounts)
+        self.owner_regex: re.Pattern | None = None
+        """Regex of the owner's nickname or hostmask, if any."""
+        self.admins_regex: re.Pattern | None = None
+        """Combined regex of the admins' nicknames and hostmasks, if any."""
+
+        if owner and not owner_account:
+            self.owner_regex = re.compile(
+                _get_hostmask_pattern(owner), re.IGNORECASE)
+
+        admin_patterns = [
+            '(?:%s)' % _get_hostmask_pattern(admin)
+            for admin in admins
+        ]
+        if admin_patterns:
+            self.admins_regex = re.compile(
+                '|'.join(admin_patterns), re.IGNORECASE)
+
+        self.cache_size = cache_size
+        self._cache: collections.OrderedDict[
+            str, tuple[str, str | None, str | None, AccessVerdict],
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Config,
+        cache_size: int = VERDICT_CACHE_SIZE,
+    ) -> AccessMatcher:
+        """Build a matcher from the bot's settings.
+
+        :param settings: the bot's settings
+        :param cache_size: maximum number of verdicts to remember
+        :return: a matcher for the ``owner``, ``owner_account``, ``admins``,
+                 and ``admin_accounts`` settings of the ``[core]`` section
+        """
+        return cls(
+            owner=settings.core.owner,
+            owner_account=settings.core.owner_account,
+            admins=settings.core.admins,
+            admin_accounts=settings.core.admin_accounts,
+            cache_size=cache_size,
+        )
+
+    def check(
+        self,
+        nick: str,
+        host: str | None,
+        account: str | None,
+    ) -> AccessVerdict:
+        """Check a message's source against the access settings.
+
+        :param nick: the source's nickname
+        :param host: the source's hostname
+        :param account: the source's account, if known
+        :return: if the source is the bot's owner, and if it is an admin
+        """
+        nick = str(nick)
+        key = nick.lower()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[:3] == (nick, host, account):
+                self._cache.move_to_end(key)
+                return cached[3]
+
+        verdict = self._check(nick, host, account)
+
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[key] = (nick, host, account, verdict)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return verdict
+
+    def forget(self, nick: str) -> None:
+        """Forget the verdict remembered for a nickname.
+
+        :param nick: the nickname to forget
+        """
+        with self._lock:
+            self._cache.pop(str(nick).lower(), None)
+
+    def clear(self) -> None:
+        """Forget every remembered verdict."""
+        with self._lock:
+            self._cache.clear()
+
+    def _check(
+        self,
+        nick: str,
+        host: str | None,
+        account: str | None,
+    ) -> AccessVerdict:
+        hostmask = '@'.join((nick, host or ''))
+
+        if self.owner_account:
+            owner = self.owner_account == account
+        else:
+            owner = self._matches(self.owner_regex, nick, hostmask)
+
+        admin = (
+            owner
+            or account in self.admin_accounts
+            or self._matches(self.admins_regex, nick, hostmask)
+        )
+        return AccessVerdict(owner, admin)
+
+    @staticmethod
+    def _matches(
+        regex: re.Pattern | None,
+        nick: str,
+        hostmask: str,
+    ) -> bool:
+        return bool(
+            regex is not None
+            and (regex.match(nick) or regex.match(hostmask))
+        )
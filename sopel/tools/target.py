@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import functools
+import sys
 from typing import Any, TYPE_CHECKING
 
 from sopel.privileges import AccessLevel
@@ -10,6 +11,7 @@ from sopel.tools.identifiers import Identifier, IdentifierFactory
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
     import datetime
 
 
@@ -213,6 +215,28 @@ class Channel:
         self.privileges[user.nick] = privs or 0
         user.channels[self.name] = self
 
+    def add_users(self, members: Iterable[tuple[User, int]]) -> None:
+        """Add many users to this channel at once.
+
+        :param members: pairs of ``(user, privs)``, as for :meth:`add_user`
+
+        This is the same as calling :meth:`add_user` for each user, except
+        that the channel's :attr:`users` and :attr:`privileges` are each
+        updated only once, such as for a ``NAMES`` reply.
+
+        .. versionadded:: 8.1
+        """
+        users: dict[Identifier, User] = {}
+        privileges: dict[Identifier, int] = {}
+        for user, privs in members:
+            assert isinstance(user, User)
+            users[user.nick] = user
+            privileges[user.nick] = privs or 0
+            user.channels[self.name] = self
+
+        self.users.update(users)
+        self.privileges.update(privileges)
+
     def has_privilege(self, nick: str, privilege: int) -> bool:
         """Tell if a user has a ``privilege`` level or above in this channel.
 
@@ -449,3 +473,84 @@ class Channel:
         if not isinstance(other, Channel):
             return NotImplemented
         return self.name < other.name
+
+
+def _sizeof_identifier(identifier: Identifier) -> int:
+    size = sys.getsizeof(identifier)
+    if isinstance(identifier, Identifier):
+        size += sys.getsizeof(vars(identifier))
+        size += sys.getsizeof(identifier.lower())
+    return size
+
+
+def get_memory_report(
+    users: Mapping[Identifier, User],
+    channels: Mapping[Identifier, Channel],
+) -> dict[str, int]:
+    """Estimate the memory used to track ``users`` and ``channels``.
+
+    :param users: the users to report on, such as ``bot.users``
+    :param channels: the channels to report on, such as ``bot.channels``
+    :return: the number of ``users``, ``channels``, ``memberships``, and
+             ``identifiers``, and their size in bytes (``users_size``,
+             ``channels_size``, ``memberships_size``, ``identifiers_size``,
+             and ``total_size``)
+
+    Sizes are computed with :func:`sys.getsizeof`: each object is counted
+    once, with its containers, but without the strings, such as the topic or
+    the user's hostname. Memberships are the entries of :attr:`User.channels`,
+    :attr:`Channel.users`, and :attr:`Channel.privileges`, and identifiers
+    are counted once even when the same object is used in many places::
+
+        from sopel.tools import target
+
+        report = target.get_memory_report(bot.users, bot.channels)
+        print('%(memberships)d memberships: %(total_size)d bytes' % report)
+
+    This is meant to compare the cost of state tracking between versions or
+    configurations, not to measure the bot's memory usage.
+
+    .. versionadded:: 8.1
+    """
+    identifiers: dict[int, Identifier] = {}
+    report = {
+        'users': len(users),
+        'channels': len(channels),
+        'memberships': 0,
+        'users_size': sys.getsizeof(users),
+        'channels_size': sys.getsizeof(channels),
+        'memberships_size': 0,
+    }
+
+    for nick, user in users.items():
+        identifiers[id(nick)] = nick
+        identifiers[id(user.nick)] = user.nick
+        report['users_size'] += sys.getsizeof(user)
+        report['memberships'] += len(user.channels)
+        report['memberships_size'] += sys.getsizeof(user.channels)
+        identifiers.update((id(name), name) for name in user.channels)
+
+    for name, channel in channels.items():
+        identifiers[id(name)] = name
+        identifiers[id(channel.name)] = channel.name
+        report['channels_size'] += sys.getsizeof(channel)
+        report['channels_size'] += sys.getsizeof(channel.modes)
+        report['memberships'] += len(channel.users) + len(channel.privileges)
+        report['memberships_size'] += sys.getsizeof(channel.users)
+        report['memberships_size'] += sys.getsizeof(channel.privileges)
+        identifiers.update((id(nick), nick) for nick in channel.users)
+        identifiers.update((id(nick), nick) for nick in channel.privileges)
+
+    report['identifiers'] = len(identifiers)
+    report['identifiers_size'] = sum(
+        _sizeof_identifier(identifier) for identifier in identifiers.values())
+    report['total_size'] = sum(
+        report[key]
+        for key in (
+            'users_size',
+            'channels_size',
+            'memberships_size',
+            'identifiers_size',
+        )
+    )
+    return report
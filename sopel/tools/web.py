@@ -19,6 +19,7 @@ applications, APIs, or websites in your plugins.
 
 from __future__ import annotations
 
+import functools
 import html
 from html.entities import name2codepoint
 import re
@@ -31,7 +32,7 @@ from sopel.lifecycle import deprecated
 
 
 if TYPE_CHECKING:
-    from typing import Iterable
+    from typing import Iterable, Iterator
 
 
 __all__ = [
@@ -39,6 +40,7 @@ __all__ = [
     'DEFAULT_HEADERS',
     'decode',
     'entity',
+    'get_url_extractor',
     'iri_to_uri',
     'quote',
     'unquote',
@@ -47,6 +49,7 @@ __all__ = [
     'trim_url',
     'urlencode',
     'urlencode_non_ascii',
+    'URLExtractor',
 ]
 
 USER_AGENT = 'Sopel/{} (https://sopel.chat)'.format(__version__)
@@ -281,6 +284,123 @@ def trim_url(url: str) -> str:
     return url
 
 
+class URLExtractor:
+    """Precompiled extractor of URLs from text.
+
+    :param schemes: optional list of URL schemes to look for; defaults to
+                    ``['http', 'https', 'ftp']``
+    :param exclusion_char: optional character that, if placed before a URL
+                           in a text, will exclude it from being extracted
+    :param skip_ascii_iri: if ``True``, URLs that are pure ASCII are not
+                           passed through :func:`iri_to_uri`; default
+                           ``False``
+
+    The regex used to find URLs is compiled only once, and a text that
+    doesn't contain ``://`` is not even searched::
+
+        >>> extractor = URLExtractor(schemes=['https'])
+        >>> list(extractor.search('see https://example.com/ or http://a.b'))
+        ['https://example.com/']
+
+    :func:`iri_to_uri` doesn't change a pure ASCII URL much, but it still
+    parses and rebuilds it, which normalizes its scheme's case and drops an
+    empty query or fragment. Set ``skip_ascii_iri`` when these differences
+    don't matter, to save that cost.
+
+    .. versionadded:: 8.1
+
+    .. seealso::
+
+        Use :func:`get_url_extractor` to share extractors built for the same
+        arguments.
+
+    """
+    def __init__(
+        self,
+        schemes: Iterable[str] | None = None,
+        exclusion_char: str | None = None,
+        skip_ascii_iri: bool = False,
+    ) -> None:
+        self.schemes: tuple[str, ...] = tuple(
+            schemes or ['http', 'https', 'ftp'])
+        self.exclusion_char = exclusion_char
+        self.skip_ascii_iri = skip_ascii_iri
+
+        schemes_patterns = '|'.join(
+            re.escape(scheme) for scheme in self.schemes)
+        re_url = r'((?<!\S)(?:%s)(?::\/\/\S+))' % schemes_patterns
+        if exclusion_char is not None:
+            re_url = r'((?<!\S)(?<!%s)(?:%s)(?::\/\/\S+))' % (
+                exclusion_char, schemes_patterns)
+
+        self.pattern: re.Pattern = re.compile(
+            re_url, re.IGNORECASE | re.UNICODE)
+        """The compiled regex used to find URLs."""
+
+    def search(self, text: str, clean: bool = False) -> Iterator[str]:
+        """Extract all URLs in ``text``.
+
+        :param text: the text to search for URLs
+        :param clean: if ``True``, all found URLs are passed through
+                      :func:`trim_url` before being returned; default
+                      ``False``
+        :return: :term:`generator iterator` of the unique URLs found in
+                 ``text``, in their order of appearance
+        """
+        if '://' not in text:
+            return
+
+        urls = self.pattern.findall(text)
+        if clean:
+            urls = [trim_url(url) for url in urls]
+
+        # yield unique URLs in their order of appearance
+        seen = set()
+        for url in urls:
+            if not (self.skip_ascii_iri and url.isascii()):
+                try:
+                    url = iri_to_uri(url)
+                except Exception:  # TODO: Be specific
+                    pass
+
+            if url not in seen:
+                seen.add(url)
+                yield url
+
+
+@functools.lru_cache(maxsize=32)
+def _get_url_extractor(
+    schemes: tuple[str, ...] | None,
+    exclusion_char: str | None,
+    skip_ascii_iri: bool,
+) -> URLExtractor:
+    return URLExtractor(schemes, exclusion_char, skip_ascii_iri)
+
+
+def get_url_extractor(
+    schemes: Iterable[str] | None = None,
+    exclusion_char: str | None = None,
+    skip_ascii_iri: bool = False,
+) -> URLExtractor:
+    """Get a shared :class:`URLExtractor` for these arguments.
+
+    :param schemes: optional list of URL schemes to look for; defaults to
+                    ``['http', 'https', 'ftp']``
+    :param exclusion_char: optional character that, if placed before a URL
+                           in a text, will exclude it from being extracted
+    :param skip_ascii_iri: if ``True``, URLs that are pure ASCII are not
+                           passed through :func:`iri_to_uri`
+    :return: an extractor built once for the same set of arguments
+
+    .. versionadded:: 8.1
+    """
+    return _get_url_extractor(
+        tuple(schemes) if schemes else None,
+        exclusion_char,
+        skip_ascii_iri,
+    )
+
+
 def search_urls(
     text: str,
     exclusion_char: str | None = None,
@@ -302,28 +422,12 @@ def search_urls(
 
         list(search_urls(text))
 
+    .. versionchanged:: 8.1
+
+        The search is done by a shared :class:`URLExtractor` (see
+        :func:`get_url_extractor`), so its regex is not compiled again and
+        again.
+
     """
-    allowed: Iterable[str] = schemes or ['http', 'https', 'ftp']
-    schemes_patterns = '|'.join(re.escape(scheme) for scheme in allowed)
-    re_url = r'((?<!\S)(?:%s)(?::\/\/\S+))' % schemes_patterns
-    if exclusion_char is not None:
-        re_url = r'((?<!\S)(?<!%s)(?:%s)(?::\/\/\S+))' % (
-            exclusion_char, schemes_patterns)
-
-    r = re.compile(re_url, re.IGNORECASE | re.UNICODE)
-
-    urls = re.findall(r, text)
-    if clean:
-        urls = [trim_url(url) for url in urls]
-
-    # yield unique URLs in their order of appearance
-    seen = set()
-    for url in urls:
-        try:
-            url = iri_to_uri(url)
-        except Exception:  # TODO: Be specific
-            pass
-
-        if url not in seen:
-            seen.add(url)
-            yield url
+    extractor = get_url_extractor(schemes, exclusion_char)
+    yield from extractor.search(text, clean=clean)
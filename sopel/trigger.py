@@ -10,7 +10,9 @@ aid of Sopel's core development.
 from __future__ import annotations
 
 from datetime import datetime, timezone
+import functools
 import re
+import time
 from typing import (
     cast,
     Match,
@@ -18,8 +20,8 @@ from typing import (
     TYPE_CHECKING,
 )
 
-from sopel import formatting, tools
-from sopel.tools import web
+from sopel import formatting
+from sopel.tools import masks, web
 from sopel.tools.identifiers import Identifier, IdentifierFactory
 
 
@@ -30,8 +32,25 @@ if TYPE_CHECKING:
 __all__ = [
     'PreTrigger',
     'Trigger',
+    'parse_server_time',
+    'unescape_tag_value',
 ]
 
+SERVER_TIME_CACHE_SIZE = 256
+"""Number of ``server-time`` timestamps remembered by
+:func:`parse_server_time`.
+
+Messages replayed in a batch, e.g. by a bouncer, often share timestamps.
+"""
+
+_TAG_ESCAPES = {
+    ':': ';',
+    's': ' ',
+    '\\': '\\',
+    'r': '\r',
+    'n': '\n',
+}
+
 COMMANDS_WITH_CONTEXT = frozenset({
     'INVITE',
     'JOIN',
@@ -53,12 +72,97 @@ For IRC message types other than those listed here, the ``trigger``\'s
 """
 
 
+def unescape_tag_value(value: str) -> str:
+    """Unescape the value of an IRCv3 message tag.
+
+    :param value: the escaped value, as sent by the server
+    :return: the unescaped value
+
+    ``\\:``, ``\\s``, ``\\\\``, ``\\r``, and ``\\n`` become a semicolon, a
+    space, a backslash, a CR, and a LF. As per the IRCv3 specification, a
+    backslash before any other character is dropped, as is a trailing
+    backslash::
+
+        >>> unescape_tag_value(r'hello\\sworld\\:\\x')
+        'hello world;x'
+
+    .. versionadded:: 8.1
+    .. seealso::
+
+        https://ircv3.net/specs/extensions/message-tags#escaping-values
+
+    """
+    if '\\' not in value:
+        return value
+
+    parts = value.split('\\')
+    result = [parts[0]]
+    parts_iter = iter(parts[1:])
+    for part in parts_iter:
+        if not part:
+            # escaped backslash (the next part), or trailing backslash
+            following = next(parts_iter, None)
+            if following is None:
+                break
+            result.append('\\' + following)
+            continue
+        result.append(_TAG_ESCAPES.get(part[0], part[0]) + part[1:])
+
+    return ''.join(result)
+
+
+@functools.lru_cache(maxsize=SERVER_TIME_CACHE_SIZE)
+def parse_server_time(value: str) -> datetime | None:
+    """Parse the timestamp of an IRCv3 ``server-time`` message tag.
+
+    :param value: a timestamp such as ``2011-10-19T16:40:51.620Z``
+    :return: the timezone-aware timestamp, or ``None`` if ``value`` is not in
+             the expected format
+
+    The format is fixed, so this is much faster than
+    :meth:`datetime.strptime`. The most recent timestamps are cached (see
+    :data:`SERVER_TIME_CACHE_SIZE`).
+
+    .. versionadded:: 8.1
+    """
+    # YYYY-MM-DDThh:mm:ss.sssZ; from 1 to 6 digits for the fraction
+    if (
+        not 21 <= len(value) <= 27
+        or value[4] != '-' or value[7] != '-' or value[10] != 'T'
+        or value[13] != ':' or value[16] != ':' or value[19] != '.'
+        or value[-1] != 'Z'
+    ):
+        return None
+
+    fraction = value[20:-1]
+    fields = (
+        value[0:4], value[5:7], value[8:10],
+        value[11:13], value[14:16], value[17:19],
+        fraction,
+    )
+    if not all(field.isascii() and field.isdigit() for field in fields):
+        return None
+
+    try:
+        return datetime(
+            int(fields[0]), int(fields[1]), int(fields[2]),
+            int(fields[3]), int(fields[4]), int(fields[5]),
+            int(fraction.ljust(6, '0')),
+            tzinfo=timezone.utc,
+        )
+    except ValueError:
+        return None
+
+
 class PreTrigger:
     """A parsed raw message from the server.
 
     :param str own_nick: the bot's own IRC nickname
     :param str line: the full line from the server
     :param tuple url_schemes: allowed schemes for URL detection
+    :param url_extractor: extractor for URL detection (optional; takes
+                          precedence over ``url_schemes``)
+    :type url_extractor: :class:`~sopel.tools.web.URLExtractor`
 
     At the :class:`PreTrigger` stage, the line has not been matched against any
     rules yet. This is what Sopel uses to perform matching.
@@ -69,6 +173,16 @@ class PreTrigger:
     ``line`` can also be a simulated echo-message, useful if the connected
     server does not support the capability.
 
+    The :attr:`tags`, :attr:`time`, :attr:`urls`, and :attr:`plain`
+    attributes are computed the first time they are used, then cached, so a
+    line no rule looks at doesn't pay for them.
+
+    .. versionchanged:: 8.1
+
+        The :attr:`tags`, :attr:`time`, :attr:`urls`, and :attr:`plain`
+        attributes are computed on demand, and the ``url_extractor``
+        parameter was added.
+
     .. py:attribute:: args
 
         The IRC command's arguments.
@@ -164,37 +278,20 @@ class PreTrigger:
         url_schemes: Sequence | None = None,
         identifier_factory: IdentifierFactory = Identifier,
         statusmsg_prefixes: tuple[str, ...] = tuple(),
+        url_extractor: web.URLExtractor | None = None,
     ):
         self.make_identifier: IdentifierFactory = identifier_factory
         line = line.strip('\r\n')
         self.line: str = line
-        self.urls: tuple[str, ...] = tuple()
-        self.plain: str = ''
         self.ctcp: str | None = None
+        self._url_schemes = url_schemes
+        self._url_extractor = url_extractor
+        self._received_at = time.time()
 
-        # Break off IRCv3 message tags, if present
-        self.tags: dict[str, str | None] = {}
+        # Break off IRCv3 message tags, if present; parsed on demand
+        self._raw_tags: str = ''
         if line.startswith('@'):
-            tagstring, line = line.split(' ', 1)
-            for raw_tag in tagstring[1:].split(';'):
-                tag = raw_tag.split('=', 1)
-                if len(tag) > 1:
-                    self.tags[tag[0]] = tag[1]
-                else:
-                    self.tags[tag[0]] = None
-
-        # Client time or server time
-        self.time = datetime.now(timezone.utc)
-        if 'time' in self.tags:
-            # ensure "time" is a string (typecheck)
-            tag_time = self.tags['time'] or ''
-            try:
-                self.time = datetime.strptime(
-                    tag_time,
-                    "%Y-%m-%dT%H:%M:%S.%fZ",
-                ).replace(tzinfo=timezone.utc)
-            except ValueError:
-                pass  # Server isn't conforming to spec, ignore the server-time
+            self._raw_tags, line = line.split(' ', 1)
 
         # Grabs hostmask from line.
         # Example: line = ':Sopel!foo@bar PRIVMSG #sopel :foobar!'
@@ -260,18 +357,59 @@ class PreTrigger:
                 self.ctcp = ctcp
                 self.args[-1] = message or ''
 
-            # Search URLs after CTCP parsing
-            self.urls = tuple(
-                web.search_urls(self.args[-1], schemes=url_schemes))
+    # The following attributes are computed the first time they are used,
+    # then cached: most lines are never looked at by any rule.
+
+    @functools.cached_property
+    def tags(self) -> dict[str, str | None]:
+        tags: dict[str, str | None] = {}
+        if self._raw_tags:
+            for raw_tag in self._raw_tags[1:].split(';'):
+                tag = raw_tag.split('=', 1)
+                if len(tag) > 1:
+                    tags[tag[0]] = unescape_tag_value(tag[1])
+                else:
+                    tags[tag[0]] = None
 
         # Populate account from extended-join messages
         if self.event == 'JOIN' and len(self.args) == 3:
             # Account is the second arg `...JOIN #Sopel account :realname`
-            self.tags['account'] = self.args[1]
+            tags['account'] = self.args[1]
+
+        return tags
 
+    @functools.cached_property
+    def time(self) -> datetime:
+        # Client time or server time
+        server_time = None
+        if 'time' in self.tags:
+            # ensure "time" is a string (typecheck)
+            server_time = parse_server_time(self.tags['time'] or '')
+
+        if server_time is None:
+            # Server isn't conforming to spec, ignore the server-time
+            return datetime.fromtimestamp(self._received_at, timezone.utc)
+
+        return server_time
+
+    @functools.cached_property
+    def urls(self) -> tuple[str, ...]:
+        if self.event != 'PRIVMSG' and self.event != 'NOTICE':
+            return tuple()
+
+        extractor = self._url_extractor
+        if extractor is None:
+            extractor = web.get_url_extractor(self._url_schemes)
+
+        # args are searched after CTCP parsing
+        return tuple(extractor.search(self.args[-1]))
+
+    @functools.cached_property
+    def plain(self) -> str:
         # get plain text message
         if self.args:
-            self.plain = formatting.plain(self.args[-1])
+            return formatting.plain(self.args[-1])
+        return ''
 
 
 class Trigger(str):
@@ -286,6 +424,9 @@ class Trigger(str):
     :param str account: services account name of the ``message``'s sender
                         (optional; only applies on networks with the
                         ``account-tag`` capability enabled)
+    :param access: precompiled owner and admins settings (optional; built from
+                   ``config`` if omitted)
+    :type access: :class:`~sopel.tools.masks.AccessMatcher`
 
     A :class:`Trigger` object itself can be used as a string; when used in
     this way, it represents the matching line's full text.
@@ -304,6 +445,10 @@ class Trigger(str):
         never made it past the IRCv3 draft stage, Sopel dropped support for
         them in Sopel 8.
 
+    .. versionchanged:: 8.1
+
+        Added the ``access`` parameter.
+
     """
     sender = property(lambda self: self._pretrigger.sender)
     """Where the message arrived from.
@@ -530,6 +675,7 @@ class Trigger(str):
         message: PreTrigger,
         match: Match,
         account: str | None = None,
+        access: masks.AccessMatcher | None = None,
     ) -> 'Trigger':
         return str.__new__(cls, message.args[-1] if message.args else '')
 
@@ -539,25 +685,14 @@ class Trigger(str):
         message: PreTrigger,
         match: Match,
         account: str | None = None,
+        access: masks.AccessMatcher | None = None,
     ) -> None:
         self._account = account
         self._pretrigger = message
         self._match = match
         self._is_privmsg = message.sender and message.sender.is_nick()
 
-        def match_host_or_nick(pattern):
-            pattern = tools.get_hostmask_regex(pattern)
-            return bool(
-                pattern.match(self.nick) or
-                pattern.match('@'.join((self.nick, self.host)))
-            )
-
-        if settings.core.owner_account:
-            self._owner = settings.core.owner_account == self.account
-        else:
-            self._owner = match_host_or_nick(settings.core.owner)
-        self._admin = (
-            self._owner or
-            self.account in settings.core.admin_accounts or
-            any(match_host_or_nick(item) for item in settings.core.admins)
-        )
+        if access is None:
+            access = masks.AccessMatcher.from_settings(settings, cache_size=0)
+        self._owner, self._admin = access.check(
+            self.nick, self.host, self.account)
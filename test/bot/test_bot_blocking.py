@@ -98,3 +98,23 @@ def test_is_pretrigger_blocked_single(
     pretrigger = trigger.PreTrigger(bot.nick, line)
 
     assert bot._is_pretrigger_blocked(pretrigger) == result
+
+
+def test_is_pretrigger_blocked_reset(
+    configfactory: ConfigFactory,
+    botfactory: BotFactory,
+):
+    """Test that the blocklist is built again after a reset."""
+    bot = mockbot(botfactory, configfactory, NICK_CONFIG)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :hello'
+    pretrigger = trigger.PreTrigger(bot.nick, line)
+
+    assert bot._is_pretrigger_blocked(pretrigger) == (False, False, False)
+
+    bot.settings.core.nick_blocks = ['spamuser', 'foo']
+    assert bot._is_pretrigger_blocked(pretrigger) == (False, False, False), (
+        'The blocklist must be kept until it is reset')
+
+    bot.reset_blocklist()
+    assert bot._is_pretrigger_blocked(pretrigger) == (True, False, False)
@@ -1,9 +1,20 @@
 """Tests for core ``sopel.irc.backends``"""
 from __future__ import annotations
 
+import asyncio
+import random
+
 import pytest
 
+from sopel.irc.abstract_backends import SendPriority
+from sopel.irc.backends import (
+    AsyncioBackend,
+    READ_LIMIT,
+    SendLane,
+    UninitializedBackend,
+)
 from sopel.irc.isupport import ISupport
+from sopel.irc.utils import safe
 from sopel.tests.mocks import MockIRCBackend
 
 
@@ -48,6 +59,38 @@ def test_prepare_command_text_too_long():
     assert result == expected
 
 
+def _legacy_prepare_command(*args, text=None):
+    # implementation of prepare_command before Sopel 8.1
+    max_length = unicode_max_length = 510
+    raw_command = ' '.join(safe(arg) for arg in args)
+    if text is not None:
+        raw_command = '{args} :{text}'.format(args=raw_command,
+                                              text=safe(text))
+
+    while len(raw_command.encode('utf-8')) > max_length:
+        raw_command = raw_command[:unicode_max_length]
+        unicode_max_length = unicode_max_length - 1
+
+    return raw_command + '\r\n'
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_prepare_command_same_as_legacy(seed):
+    backend = MockIRCBackend(BotCollector())
+    rand = random.Random(seed)
+    alphabet = ' ab\n' + 'αé' + 'अ€' + '𡃤🍳'
+
+    for _ in range(50):
+        text = ''.join(
+            rand.choice(alphabet)
+            for _ in range(rand.randint(100, 600))
+        )
+
+        assert backend.prepare_command('PRIVMSG', '#sopel', text=text) == (
+            _legacy_prepare_command('PRIVMSG', '#sopel', text=text)
+        )
+
+
 def test_prepare_command_command_safe():
     backend = MockIRCBackend(BotCollector())
 
@@ -364,3 +407,239 @@ def test_decode_line_cp1252():
 
     test = "PRIVMSG #sopel :Hello, Martín!"
     assert backend.decode_line(test.encode("cp1252")) == test
+
+
+def test_run_coroutine_unsupported():
+    bot = BotCollector()
+    backend = UninitializedBackend(bot)
+    result = []
+
+    async def coro():
+        result.append('run')
+
+    with pytest.raises(RuntimeError):
+        backend.run_coroutine(coro())
+
+    assert result == []
+
+
+@pytest.mark.parametrize('line, priority', (
+    (b'PONG irc.example.com\r\n', SendPriority.PROTOCOL),
+    (b'PING irc.example.com\r\n', SendPriority.PROTOCOL),
+    (b'CAP REQ :sasl\r\n', SendPriority.PROTOCOL),
+    (b'AUTHENTICATE +\r\n', SendPriority.PROTOCOL),
+    (b'NICK Sopel\r\n', SendPriority.PROTOCOL),
+    (b'WHO #sopel\r\n', SendPriority.PROTOCOL),
+    (b'cap END\r\n', SendPriority.PROTOCOL),
+    (b'@label=1 PONG irc.example.com\r\n', SendPriority.PROTOCOL),
+    (b':Sopel PONG irc.example.com\r\n', SendPriority.PROTOCOL),
+    (b'PRIVMSG #sopel :PONG\r\n', SendPriority.NORMAL),
+    (b'@label=1 PRIVMSG #sopel :Hi!\r\n', SendPriority.NORMAL),
+    (b'QUIT :Bye!\r\n', SendPriority.NORMAL),
+    (b'\r\n', SendPriority.NORMAL),
+))
+def test_get_send_priority(line, priority):
+    backend = MockIRCBackend(BotCollector())
+    assert backend.get_send_priority(line) is priority
+
+
+def test_send_lane_metrics():
+    lane = SendLane(SendPriority.NORMAL)
+    assert len(lane) == 0
+    assert lane.average_wait == 0.0
+
+    lane.put(b'PRIVMSG #sopel :one\r\n')
+    lane.put(b'PRIVMSG #sopel :two\r\n')
+    assert len(lane) == 2
+    assert lane.pop() == b'PRIVMSG #sopel :one\r\n'
+    lane.put(b'PRIVMSG #sopel :three\r\n')
+
+    assert len(lane) == 2
+    assert lane.max_queued == 2
+    assert lane.sent_count == 1
+    assert lane.sent_bytes == len(b'PRIVMSG #sopel :one\r\n')
+    assert lane.average_wait >= 0.0
+
+    lane.pop()
+    lane.pop()
+    with pytest.raises(IndexError):
+        lane.pop()
+
+
+class FakeWriter:
+    def __init__(self):
+        self.written = []
+        self.drain_count = 0
+
+    def write(self, data):
+        self.written.append(data)
+
+    async def drain(self):
+        self.drain_count += 1
+        await asyncio.sleep(0)
+
+
+def test_asyncio_backend_write_priority():
+    backend = AsyncioBackend(BotCollector(), 'irc.example.com', 6667, None)
+    writer = FakeWriter()
+
+    async def run():
+        backend._loop = asyncio.get_running_loop()
+        backend._write_ready = asyncio.Event()
+        backend._writer = writer
+
+        backend.irc_send(b'PRIVMSG #sopel :one\r\n')
+        backend.irc_send(b'PRIVMSG #sopel :two\r\n')
+        backend.irc_send(b'PONG irc.example.com\r\n')
+        backend.irc_send(b'PRIVMSG #sopel :three\r\n')
+        backend.irc_send(b'CAP END\r\n')
+
+        task = asyncio.create_task(backend.write_forever())
+        while any(backend.lanes.values()):
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    assert writer.written == [
+        b'PONG irc.example.com\r\n'
+        b'CAP END\r\n'
+        b'PRIVMSG #sopel :one\r\n'
+        b'PRIVMSG #sopel :two\r\n'
+        b'PRIVMSG #sopel :three\r\n'
+    ]
+    assert writer.drain_count == 1
+    assert backend.write_count == 1
+    assert backend.lanes[SendPriority.PROTOCOL].sent_count == 2
+    assert backend.lanes[SendPriority.NORMAL].sent_count == 3
+
+
+def test_asyncio_backend_write_batches():
+    backend = AsyncioBackend(BotCollector(), 'irc.example.com', 6667, None)
+    writer = FakeWriter()
+
+    async def run():
+        backend._loop = asyncio.get_running_loop()
+        backend._write_ready = asyncio.Event()
+        backend._writer = writer
+
+        task = asyncio.create_task(backend.write_forever())
+        backend.irc_send(b'PRIVMSG #sopel :one\r\n')
+        await asyncio.sleep(0)
+        # the first batch is draining: these lines are written together
+        backend.irc_send(b'PRIVMSG #sopel :two\r\n')
+        backend.irc_send(b'PONG irc.example.com\r\n')
+        while any(backend.lanes.values()) or writer.drain_count < 2:
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    assert writer.written == [
+        b'PRIVMSG #sopel :one\r\n',
+        b'PONG irc.example.com\r\n'
+        b'PRIVMSG #sopel :two\r\n',
+    ]
+    assert writer.drain_count == 2
+    assert backend.write_count == 2
+
+
+class ReaderBot(BotCollector):
+    def __init__(self):
+        super().__init__()
+        self.isupport = ISupport()
+        self.message_received = []
+
+    def on_message(self, message):
+        if message.startswith('BOOM'):
+            raise Exception('Boom!')
+        self.message_received.append(message)
+
+
+def _read_chunks(backend, chunks):
+    async def run():
+        backend._reader = asyncio.StreamReader()
+        for chunk in chunks:
+            backend._reader.feed_data(chunk)
+        backend._reader.feed_eof()
+        await backend.read_forever()
+
+    asyncio.run(run())
+
+
+def test_asyncio_backend_read_forever():
+    bot = ReaderBot()
+    backend = AsyncioBackend(bot, 'irc.example.com', 6667, None)
+
+    _read_chunks(backend, [
+        b'PING :irc.example.com\r\nPRIVMSG #sopel :Hello',
+        b', Mart\xc3\xadn!\r',
+        b'\nPRIVMSG #sopel :Hello, Mart\xedn!\r\n\r\n',
+        b'PRIVMSG #sopel :partial',
+    ])
+
+    assert bot.message_received == [
+        'PING :irc.example.com\r\n',
+        'PRIVMSG #sopel :Hello, Martín!\r\n',
+        'PRIVMSG #sopel :Hello, Martín!\r\n',
+        '\r\n',
+        'PRIVMSG #sopel :partial',
+    ]
+    assert backend._watchdog_task is None
+
+
+def test_asyncio_backend_read_forever_stop_on_error():
+    bot = ReaderBot()
+    backend = AsyncioBackend(bot, 'irc.example.com', 6667, None)
+
+    _read_chunks(backend, [b'PING :one\r\nBOOM\r\nPING :two\r\n'])
+
+    assert bot.message_received == ['PING :one\r\n']
+
+
+def test_asyncio_backend_read_forever_line_too_long():
+    bot = ReaderBot()
+    backend = AsyncioBackend(bot, 'irc.example.com', 6667, None)
+
+    _read_chunks(backend, [
+        b'PING :one\r\n',
+        b'-' * (READ_LIMIT * 2),
+        b'\r\nPING :two\r\n',
+    ])
+
+    assert bot.message_received == ['PING :one\r\n']
+
+
+def test_asyncio_backend_watchdog():
+    bot = BotCollector()
+    backend = AsyncioBackend(
+        bot, 'irc.example.com', 6667, None,
+        server_timeout=0.3, ping_interval=0.05)
+
+    async def run():
+        backend._loop = asyncio.get_running_loop()
+        backend._read_task = asyncio.create_task(asyncio.sleep(10))
+        backend._reset_timeout_tasks()
+        watchdog = backend._watchdog_task
+
+        await asyncio.sleep(0.1)
+        # one PING after the ping interval
+        assert bot.message_sent == ['PING irc.example.com\r\n']
+
+        # activity: another PING can be sent later
+        backend._reset_timeout_tasks()
+        assert backend._watchdog_task is watchdog
+        await asyncio.sleep(0.1)
+        assert bot.message_sent == ['PING irc.example.com\r\n'] * 2
+
+        with pytest.raises(asyncio.CancelledError):
+            await backend._read_task
+        assert backend._read_task is None
+        assert backend._watchdog_task is None
+        assert watchdog.done()
+
+    asyncio.run(run())
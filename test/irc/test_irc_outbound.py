@@ -0,0 +1,278 @@
+"""Tests for the ``sopel.irc.outbound`` module."""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from sopel.irc import abstract_backends, outbound
+from sopel.tests import rawlist
+from sopel.tests.mocks import MockIRCBackend
+
+
+TMP_CONFIG = """
+[core]
+owner = Exirel
+nick = Sopel
+user = sopel
+name = Sopel (https://sopel.chat)
+flood_burst_lines = 2
+flood_refill_rate = 1
+flood_empty_wait = 0.2
+flood_max_wait = 0.5
+flood_penalty_ratio = 0
+"""
+
+
+class LoopBackend(MockIRCBackend):
+    """Mock backend running coroutines on an event loop in another thread."""
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def irc_send(self, data):
+        self.message_sent.append(data)
+
+    def run_coroutine(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class NoLoopBackend(MockIRCBackend):
+    """Mock backend that can't run coroutines."""
+    def run_coroutine(self, coro):
+        return abstract_backends.AbstractIRCBackend.run_coroutine(self, coro)
+
+
+@pytest.fixture
+def tmpconfig(configfactory):
+    return configfactory('conf.ini', TMP_CONFIG)
+
+
+@pytest.fixture
+def bot(tmpconfig, botfactory):
+    return botfactory(tmpconfig)
+
+
+@pytest.fixture
+def loop_bot(bot):
+    bot.backend = LoopBackend(bot)
+    yield bot
+    bot.backend.stop()
+
+
+def test_flood_bucket(tmpconfig):
+    bucket = outbound.FloodBucket(tmpconfig.core)
+
+    assert bucket.flood_left == 2
+    assert bucket.elapsed == 300
+    assert bucket.get_wait_time('text') == 0
+    bucket.consume('text')
+    assert bucket.get_wait_time('text') == 0
+    bucket.consume('text')
+
+    assert bucket.flood_left == 0
+    wait = bucket.get_wait_time('text')
+    assert 0.1 < wait <= 0.2, 'Empty bucket must wait flood_empty_wait'
+
+
+def test_flood_bucket_refill(tmpconfig):
+    bucket = outbound.FloodBucket(tmpconfig.core)
+    bucket.flood_left = 0
+    bucket.messages.append((time.monotonic() - 1.5, 'text'))
+
+    assert bucket.get_wait_time('text') == 0
+    assert bucket.flood_left == 1, 'One line per elapsed second'
+
+
+def test_flood_bucket_penalty(tmpconfig):
+    tmpconfig.core.flood_penalty_ratio = 1
+    tmpconfig.core.flood_text_length = 10
+    bucket = outbound.FloodBucket(tmpconfig.core)
+    bucket.flood_left = 0
+    bucket.messages.append((time.monotonic(), 'text'))
+
+    assert bucket.get_wait_time('short') <= 0.2
+    assert bucket.get_wait_time('x' * 13) > 0.2, 'Long text adds a penalty'
+    assert bucket.get_wait_time('x' * 100) <= 0.5, 'Up to flood_max_wait'
+
+
+def test_flood_bucket_is_looping(tmpconfig):
+    tmpconfig.core.antiloop_threshold = 2
+    bucket = outbound.FloodBucket(tmpconfig.core)
+
+    bucket.consume('spam')
+    assert not bucket.is_looping('spam')
+    bucket.consume('spam')
+    assert bucket.is_looping('spam')
+    assert not bucket.is_looping('eggs')
+
+
+def test_scheduler_send(bot):
+    future = bot.outbound.send('#channel', ['Hello', 'world'])
+
+    assert future.done()
+    assert bot.backend.message_sent == rawlist(
+        'PRIVMSG #channel :Hello',
+        'PRIVMSG #channel :world',
+    )
+    assert bot.outbound.queued_count == 0
+
+
+def test_scheduler_send_empty(bot):
+    future = bot.outbound.send('#channel', [])
+
+    assert future.done()
+    assert bot.backend.message_sent == []
+
+
+def test_scheduler_independent_recipients(loop_bot):
+    bot = loop_bot
+
+    first = bot.outbound.send('#slow', ['one', 'two', 'three'])
+    assert not first.done()
+    assert bot.outbound.queued_count == 1
+
+    # the other channel doesn't wait for #slow
+    other = bot.outbound.send('#other', ['hello'])
+    assert other.done()
+    assert bot.backend.message_sent == rawlist(
+        'PRIVMSG #slow :one',
+        'PRIVMSG #slow :two',
+        'PRIVMSG #other :hello',
+    )
+
+    first.result(timeout=5)
+    assert bot.backend.message_sent[-1] == b'PRIVMSG #slow :three\r\n'
+    assert bot.outbound.queued_count == 0
+
+
+def test_scheduler_order(loop_bot):
+    bot = loop_bot
+
+    bot.outbound.send('#slow', ['one', 'two', 'three'])
+    # queued behind the first call's waiting message
+    last = bot.outbound.send('#SLOW', ['four'])
+    last.result(timeout=5)
+
+    assert bot.backend.message_sent == rawlist(
+        'PRIVMSG #slow :one',
+        'PRIVMSG #slow :two',
+        'PRIVMSG #slow :three',
+        'PRIVMSG #SLOW :four',
+    )
+
+
+def test_scheduler_no_loop(bot):
+    bot.backend = NoLoopBackend(bot)
+
+    start = time.monotonic()
+    future = bot.outbound.send('#slow', ['one', 'two', 'three'])
+
+    assert not future.done(), 'The caller must not wait without event loop'
+    assert len(bot.backend.message_sent) == 2
+
+    future.result(timeout=5)
+    assert time.monotonic() - start >= 0.15
+    assert len(bot.backend.message_sent) == 3
+    assert bot.outbound.queued_count == 0
+
+
+def test_scheduler_drain_cancelled(loop_bot):
+    bot = loop_bot
+    loop = bot.backend.loop
+
+    first = bot.outbound.send('#slow', ['one', 'two', 'three'])
+
+    async def cancel_all():
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+
+    asyncio.run_coroutine_threadsafe(cancel_all(), loop).result(timeout=5)
+
+    with pytest.raises(concurrent.futures.CancelledError):
+        first.result(timeout=5)
+    assert bot.outbound.queued_count == 0
+
+    # the recipient's queue is not stuck
+    bot.outbound.send('#slow', ['four']).result(timeout=5)
+    assert bot.backend.message_sent[-1] == b'PRIVMSG #slow :four\r\n'
+
+
+def test_scheduler_clear(loop_bot):
+    bot = loop_bot
+
+    first = bot.outbound.send('#slow', ['one', 'two', 'three'])
+    bot.outbound.clear()
+
+    assert first.cancelled()
+    assert bot.outbound.queued_count == 0
+    assert bot.outbound.send('#other', ['hello']).done()
+
+
+def test_scheduler_antiloop(bot):
+    bot.settings.core.flood_burst_lines = 1000
+    bot.settings.core.antiloop_threshold = 2
+    bot.settings.core.antiloop_silent_after = 1
+
+    bot.outbound.send('#channel', ['spam', 'spam', 'spam', 'spam'])
+
+    assert bot.backend.message_sent == rawlist(
+        'PRIVMSG #channel :spam',
+        'PRIVMSG #channel :spam',
+        'PRIVMSG #channel :' + bot.settings.core.antiloop_repeat_text,
+    )
+
+
+def test_scheduler_error(bot):
+    bot.backend = NoLoopBackend(bot)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError('Not connected')
+
+    bot.backend.irc_send = broken
+
+    with pytest.raises(RuntimeError):
+        bot.outbound.send('#channel', ['one', 'two'])
+
+    assert bot.outbound.queued_count == 0
+
+
+def test_say_wait(loop_bot):
+    bot = loop_bot
+
+    bot.say('one', '#slow')
+    bot.say('two', '#slow')
+    bot.say('three', '#slow')
+    assert len(bot.backend.message_sent) == 2
+
+    bot.say('four', '#slow', wait=True)
+    assert bot.backend.message_sent == rawlist(
+        'PRIVMSG #slow :one',
+        'PRIVMSG #slow :two',
+        'PRIVMSG #slow :three',
+        'PRIVMSG #slow :four',
+    )
+
+
+def test_deprecated_stack_and_sending(bot):
+    bot.outbound.send('#channel', ['Hello'])
+
+    stack = bot.stack
+    assert list(stack) == [bot.make_identifier('#channel')]
+    assert stack['#channel']['flood_left'] == 1
+    assert [text for _, text in stack['#channel']['messages']] == ['Hello']
+
+    with bot.sending:
+        bot.say('world', '#other')
+    assert bot.backend.message_sent[-1] == b'PRIVMSG #other :world\r\n'
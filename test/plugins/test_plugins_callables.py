@@ -102,6 +102,18 @@ def test_callable_properties():
     assert plugin_callable.is_url_callback is False
 
 
+def test_callable_is_async():
+    def handler(bot: SopelWrapper, trigger: Trigger):
+        return 'test value: %s' % str(trigger)
+
+    async def async_handler(bot: SopelWrapper, trigger: Trigger):
+        return 'test value: %s' % str(trigger)
+
+    assert PluginCallable(handler).is_async is False
+    assert PluginCallable(async_handler).is_async is True
+    assert PluginJob(async_handler).is_async is True
+
+
 def test_callable_properties_event_rules():
     def handler(bot: SopelWrapper, trigger: Trigger):
         return 'test value: %s' % str(trigger)
@@ -0,0 +1,443 @@
+"""Tests for the ``sopel.plugins.executor`` module."""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+
+import pytest
+
+from sopel.plugins import executor
+
+
+def test_rule_task():
+    results = []
+    task = executor.RuleTask(results.append, ('hello',), name='test-task')
+
+    assert task.name == 'test-task'
+    assert task.is_alive()
+
+    task.run()
+
+    assert not task.is_alive()
+    assert results == ['hello']
+    task.join()  # does not block
+
+
+def test_rule_task_error():
+    def broken():
+        raise ValueError('boom')
+
+    task = executor.RuleTask(broken)
+    assert task.name == 'broken'
+
+    task.run()  # does not raise
+
+    assert not task.is_alive()
+
+
+def test_rule_executor_invalid():
+    with pytest.raises(ValueError):
+        executor.RuleExecutor(0)
+
+    with pytest.raises(ValueError):
+        executor.RuleExecutor(1, overflow='unknown')
+
+
+def test_rule_executor_submit():
+    rule_executor = executor.RuleExecutor(2)
+    results = []
+    tasks = [
+        rule_executor.submit(results.append, i, name='task-%d' % i)
+        for i in range(10)
+    ]
+
+    for task in tasks:
+        task.join()
+
+    assert sorted(results) == list(range(10))
+    assert rule_executor.running_tasks == []
+    assert rule_executor.queue_depth == 0
+    assert rule_executor.active_workers == 0
+    assert rule_executor.worker_count <= 2
+    assert rule_executor.dropped_count == 0
+
+
+def test_rule_executor_thread_name():
+    rule_executor = executor.RuleExecutor(1, name='test-pool')
+    names = []
+
+    def get_name():
+        names.append(threading.current_thread().name)
+
+    rule_executor.submit(get_name, name='plugin-label').join()
+
+    assert names == ['test-pool-1-plugin-label']
+
+
+def test_rule_executor_max_workers():
+    rule_executor = executor.RuleExecutor(2)
+    release = threading.Event()
+    tasks = [rule_executor.submit(release.wait) for _ in range(5)]
+
+    try:
+        assert rule_executor.worker_count == 2
+        assert len(rule_executor.running_tasks) == 5
+    finally:
+        release.set()
+
+    for task in tasks:
+        task.join()
+
+    assert rule_executor.running_tasks == []
+
+
+def test_rule_executor_overflow_drop():
+    rule_executor = executor.RuleExecutor(1, max_queue_size=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait()
+
+    running = rule_executor.submit(blocking)
+    started.wait()
+
+    try:
+        queued = rule_executor.submit(release.wait)
+        assert queued is not None
+        assert rule_executor.queue_depth == 1
+        assert rule_executor.active_workers == 1
+
+        dropped = rule_executor.submit(release.wait)
+        assert dropped is None
+        assert rule_executor.dropped_count == 1
+    finally:
+        release.set()
+
+    running.join()
+    queued.join()
+
+
+def test_rule_executor_overflow_inline():
+    rule_executor = executor.RuleExecutor(
+        1, max_queue_size=1, overflow=executor.OVERFLOW_INLINE)
+    started = threading.Event()
+    release = threading.Event()
+    threads = []
+
+    def blocking():
+        started.set()
+        release.wait()
+
+    running = rule_executor.submit(blocking)
+    started.wait()
+
+    try:
+        queued = rule_executor.submit(release.wait)
+        inline = rule_executor.submit(
+            lambda: threads.append(threading.current_thread()))
+
+        assert inline is not None
+        assert not inline.is_alive()
+        assert threads == [threading.current_thread()]
+        assert rule_executor.dropped_count == 0
+    finally:
+        release.set()
+
+    running.join()
+    queued.join()
+
+
+def test_rule_executor_overflow_block():
+    rule_executor = executor.RuleExecutor(
+        1, max_queue_size=1, overflow=executor.OVERFLOW_BLOCK)
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+    submitted = []
+
+    def blocking():
+        started.set()
+        release.wait()
+
+    running = rule_executor.submit(blocking)
+    started.wait()
+    queued = rule_executor.submit(results.append, 'queued')
+
+    def submit_blocked():
+        submitted.append(rule_executor.submit(results.append, 'blocked'))
+
+    submitter = threading.Thread(target=submit_blocked)
+    submitter.start()
+    submitter.join(0.1)
+    assert submitter.is_alive(), 'Submit must wait for room in the queue'
+
+    release.set()
+    submitter.join()
+    running.join()
+    queued.join()
+    submitted[0].join()
+
+    assert results == ['queued', 'blocked']
+    assert rule_executor.dropped_count == 0
+
+
+def test_rule_executor_shutdown():
+    rule_executor = executor.RuleExecutor(1)
+    rule_executor.submit(lambda: None).join()
+    assert rule_executor.worker_count == 1
+
+    rule_executor.shutdown(timeout=5)
+
+    assert rule_executor.worker_count == 0
+    assert rule_executor.submit(lambda: None) is None
+
+
+def test_rule_executor_shutdown_full_queue():
+    rule_executor = executor.RuleExecutor(1, max_queue_size=1)
+    release = threading.Event()
+    results = []
+
+    running = rule_executor.submit(release.wait)
+    queued = rule_executor.submit(results.append, 'queued')
+    assert rule_executor.queue_depth == 1
+
+    # must not wait for room in the queue
+    rule_executor.shutdown(timeout=0)
+    release.set()
+    rule_executor.shutdown(timeout=5)
+
+    assert not running.is_alive()
+    assert not queued.is_alive()
+    assert results == ['queued']
+    assert rule_executor.worker_count == 0
+
+
+def test_concurrency_limit_invalid():
+    with pytest.raises(ValueError):
+        executor.ConcurrencyLimit('test', 0)
+
+    with pytest.raises(ValueError):
+        executor.ConcurrencyLimit('test', 1, policy='unknown')
+
+
+def test_rule_executor_concurrency_queue():
+    rule_executor = executor.RuleExecutor(4)
+    limit = executor.ConcurrencyLimit('test', 1)
+    release = threading.Event()
+    results = []
+
+    def blocking(value):
+        release.wait()
+        results.append(value)
+
+    tasks = [
+        rule_executor.submit(blocking, i, limits=[limit])
+        for i in range(3)
+    ]
+
+    try:
+        assert all(task is not None for task in tasks)
+        assert limit.running == 1
+        assert rule_executor.held_count == 2
+        assert len(rule_executor.running_tasks) == 3
+    finally:
+        release.set()
+
+    for task in tasks:
+        task.join()
+
+    assert results == [0, 1, 2], 'Held tasks must run in order'
+    assert limit.running == 0
+    assert limit.dropped_count == 0
+    assert rule_executor.held_count == 0
+    assert rule_executor.running_tasks == []
+
+
+def test_rule_executor_concurrency_drop():
+    rule_executor = executor.RuleExecutor(4)
+    limit = executor.ConcurrencyLimit(
+        'test', 2, policy=executor.CONCURRENCY_DROP)
+    release = threading.Event()
+    tasks = [
+        rule_executor.submit(release.wait, limits=[limit])
+        for _ in range(4)
+    ]
+
+    try:
+        assert tasks[2] is None
+        assert tasks[3] is None
+        assert limit.running == 2
+        assert limit.dropped_count == 2
+        assert rule_executor.held_count == 0
+        assert rule_executor.dropped_count == 0
+    finally:
+        release.set()
+
+    for task in tasks[:2]:
+        task.join()
+
+    assert limit.running == 0
+    assert rule_executor.submit(lambda: None, limits=[limit]) is not None
+
+
+def test_rule_executor_concurrency_other_tasks():
+    rule_executor = executor.RuleExecutor(2)
+    limit = executor.ConcurrencyLimit('slow', 1)
+    release = threading.Event()
+
+    slow_tasks = [
+        rule_executor.submit(release.wait, limits=[limit])
+        for _ in range(5)
+    ]
+
+    try:
+        # the slow tasks take only one worker, leaving one for other tasks
+        results = []
+        rule_executor.submit(results.append, 'fast').join(5)
+        assert results == ['fast']
+    finally:
+        release.set()
+
+    for task in slow_tasks:
+        task.join()
+
+
+def test_rule_executor_concurrency_many_limits():
+    rule_executor = executor.RuleExecutor(4)
+    rule_limit = executor.ConcurrencyLimit('plugin.rule', 2)
+    plugin_limit = executor.ConcurrencyLimit('plugin', 1)
+    release = threading.Event()
+
+    first = rule_executor.submit(
+        release.wait, limits=[rule_limit, plugin_limit])
+    second = rule_executor.submit(
+        release.wait, limits=[rule_limit, plugin_limit])
+
+    try:
+        assert rule_limit.running == 1
+        assert plugin_limit.running == 1
+        assert rule_executor.held_count == 1
+    finally:
+        release.set()
+
+    first.join()
+    second.join()
+
+    assert rule_limit.running == 0
+    assert plugin_limit.running == 0
+
+
+def test_rule_executor_concurrency_held_full():
+    rule_executor = executor.RuleExecutor(1, max_queue_size=1)
+    limit = executor.ConcurrencyLimit('test', 1)
+    release = threading.Event()
+
+    running = rule_executor.submit(release.wait, limits=[limit])
+    held = rule_executor.submit(release.wait, limits=[limit])
+
+    try:
+        assert held is not None
+        assert rule_executor.held_count == 1
+        assert rule_executor.submit(release.wait, limits=[limit]) is None
+        assert rule_executor.dropped_count == 1
+    finally:
+        release.set()
+
+    running.join()
+    held.join()
+
+
+def test_rule_executor_concurrency_held_inline():
+    # more held tasks than the recursion limit, all run inline on release
+    size = sys.getrecursionlimit()
+    rule_executor = executor.RuleExecutor(
+        1, max_queue_size=size, overflow=executor.OVERFLOW_INLINE)
+    limit = executor.ConcurrencyLimit('test', 1)
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def wait():
+        started.set()
+        release.wait()
+
+    running = rule_executor.submit(wait, limits=[limit])
+    started.wait()
+    held = [
+        rule_executor.submit(results.append, index, limits=[limit])
+        for index in range(size)
+    ]
+    queued = [rule_executor.submit(lambda: None) for _ in range(size)]
+    assert rule_executor.held_count == size
+    assert rule_executor.queue_depth == size
+
+    release.set()
+    for task in [running, *held, *queued]:
+        task.join()
+
+    assert results == list(range(size))
+    assert limit.running == 0
+    assert rule_executor.held_count == 0
+
+
+def test_rule_executor_shutdown_held():
+    rule_executor = executor.RuleExecutor(1)
+    limit = executor.ConcurrencyLimit('test', 1)
+    release = threading.Event()
+    results = []
+
+    running = rule_executor.submit(release.wait, limits=[limit])
+    held = rule_executor.submit(results.append, 'held', limits=[limit])
+
+    rule_executor.shutdown()
+    assert not held.is_alive()
+    assert rule_executor.held_count == 0
+
+    release.set()
+    running.join()
+
+    assert results == []
+
+
+def test_load_shedder_disabled():
+    shedder = executor.LoadShedder()
+
+    assert not shedder.is_enabled
+    assert shedder.get_shed_priorities(3600, 10000) == frozenset()
+
+
+@pytest.mark.parametrize('lag, backlog, expected', (
+    (0, 0, frozenset()),
+    (10, 50, frozenset()),
+    (10.5, 0, frozenset({'low'})),
+    (0, 51, frozenset({'low'})),
+    (30.5, 0, frozenset({'low', 'medium'})),
+    (0, 201, frozenset({'low', 'medium'})),
+))
+def test_load_shedder_get_shed_priorities(lag, backlog, expected):
+    shedder = executor.LoadShedder(
+        low_lag=10, medium_lag=30, low_backlog=50, medium_backlog=200)
+
+    assert shedder.is_enabled
+    assert shedder.get_shed_priorities(lag, backlog) == expected
+
+
+def test_load_shedder_shed(caplog):
+    caplog.set_level(logging.INFO, logger=executor.__name__)
+    shedder = executor.LoadShedder(low_lag=10)
+
+    assert shedder.get_shed_priorities(15, 0) == frozenset({'low'})
+    assert 'Shedding low priority rules' in caplog.text
+
+    shedder.shed('low', 'rule')
+    shedder.shed('low', 'rule')
+
+    assert shedder.shed_counts == {'low': 2, 'medium': 0}
+
+    caplog.clear()
+    assert shedder.get_shed_priorities(5, 0) == frozenset()
+    assert "Stopped shedding rules" in caplog.text
+    assert "{'low': 2, 'medium': 0}" in caplog.text
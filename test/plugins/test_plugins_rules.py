@@ -1,6 +1,7 @@
 """Tests for the ``sopel.plugins.rules`` module."""
 from __future__ import annotations
 
+import asyncio
 import datetime
 import re
 
@@ -398,6 +399,67 @@ def test_manager_rule_trigger_on_event(mockbot):
     assert rule_events in items[0]
 
 
+def test_manager_get_event_rules():
+    regex = re.compile('.*')
+    rule_default = rules.Rule([regex], plugin='testplugin', label='default')
+    rule_notice = rules.Rule(
+        [regex], plugin='testplugin', label='notice', events=['NOTICE'])
+    rule_version = rules.Rule(
+        [regex],
+        plugin='testplugin',
+        label='version',
+        ctcp=[re.compile('VERSION')])
+    action = rules.ActionCommand('hello', plugin='testplugin')
+    manager = rules.Manager()
+    manager.register(rule_default)
+    manager.register(rule_notice)
+    manager.register(rule_version)
+    manager.register_action_command(action)
+
+    assert manager.get_event_rules('PRIVMSG') == (rule_default,)
+    assert manager.get_event_rules('PRIVMSG', 'VERSION') == (
+        rule_default, rule_version)
+    assert manager.get_event_rules('PRIVMSG', 'ACTION') == (
+        rule_default, action)
+    assert manager.get_event_rules('NOTICE') == (rule_notice,)
+    assert manager.get_event_rules('PING') == tuple()
+
+    # the index is reset on register
+    rule_ping = rules.Rule(
+        [regex], plugin='otherplugin', label='ping', events=['PING'])
+    manager.register(rule_ping)
+    assert manager.get_event_rules('PING') == (rule_ping,)
+
+    # and on unregister
+    manager.unregister_plugin('otherplugin')
+    assert manager.get_event_rules('PING') == tuple()
+
+
+def test_manager_get_triggered_rules_skip_events(mockbot):
+    class CountingRule(rules.Rule):
+        calls = 0
+
+        def match(self, bot, pretrigger):
+            self.calls = self.calls + 1
+            return super().match(bot, pretrigger)
+
+    regex = re.compile('.*')
+    privmsg_rule = CountingRule([regex], plugin='testplugin', label='msg')
+    ping_rule = CountingRule(
+        [regex], plugin='testplugin', label='ping', events=['PING'])
+    manager = rules.Manager()
+    manager.register(privmsg_rule)
+    manager.register(ping_rule)
+
+    pretrigger = trigger.PreTrigger(mockbot.nick, 'PING :irc.example.com')
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+
+    assert len(items) == 1
+    assert ping_rule in items[0]
+    assert ping_rule.calls == 1
+    assert privmsg_rule.calls == 0, 'PRIVMSG rule must not be tried on PING'
+
+
 def test_manager_has_command():
     command = rules.Command('hello', prefix=r'\.', plugin='testplugin')
     manager = rules.Manager()
@@ -489,6 +551,371 @@ def test_rulemetrics():
     assert not metrics.is_limited(now - time_window)
     assert not metrics.is_limited(now + time_window)
 
+
+# -----------------------------------------------------------------------------
+# tests for :class:`CommandLookup`
+
+def test_command_lookup():
+    hello = rules.Command('hello', prefix=r'\.', aliases=['hi'])
+    hello_world = rules.Command('hello world', prefix=r'\.')
+    bye = rules.Command('bye', prefix=r'\.')
+    nick_hello = rules.NickCommand('TestBot', 'hello')
+    action_hello = rules.ActionCommand('hello')
+    lookup = rules.CommandLookup(
+        [hello, hello_world, bye], [nick_hello], [action_hello])
+
+    assert lookup.get_candidates('.hello') == (hello, hello_world)
+    assert lookup.get_candidates('.HELLO world') == (hello, hello_world)
+    assert lookup.get_candidates('.hi') == (hello,)
+    assert lookup.get_candidates('.bye') == (bye,)
+    assert lookup.get_candidates('TestBot: hello') == (nick_hello,)
+    assert lookup.get_candidates('hello there') == (action_hello,)
+    assert lookup.get_candidates('.unknown') == tuple()
+    assert lookup.get_candidates('') == tuple()
+
+
+def test_command_lookup_prefix_alternatives():
+    command = rules.Command('hello', prefix=r'\.|!!|\?')
+    lookup = rules.CommandLookup([command])
+
+    assert lookup.get_candidates('.hello') == (command,)
+    assert lookup.get_candidates('!!hello') == (command,)
+    assert lookup.get_candidates('?hello') == (command,)
+    assert lookup.get_candidates('!hello') == tuple()
+
+
+def test_command_lookup_fallback():
+    variable_prefix = rules.Command('hello', prefix=r'\.+')
+    non_ascii = rules.Command('héllo', prefix=r'\.')
+    lookup = rules.CommandLookup([variable_prefix, non_ascii])
+
+    # these commands can't be looked up by name, so they are always tried
+    assert lookup.get_candidates('.hello') == (variable_prefix, non_ascii)
+    assert lookup.get_candidates('anything') == (variable_prefix, non_ascii)
+
+
+def test_command_lookup_fallback_nick_with_whitespace():
+    command = rules.NickCommand('TestBot', 'hello', nick_aliases=['Test Bot'])
+    lookup = rules.CommandLookup(nick_commands=[command])
+
+    assert any(command.parse('Test Bot: hello'))
+    assert lookup.get_candidates('Test Bot: hello') == (command,)
+    assert lookup.get_candidates('TestBot: hello') == (command,)
+
+
+def test_command_lookup_fallback_subclass():
+    class MyCommand(rules.Command):
+        pass
+
+    command = MyCommand('hello', prefix=r'\.')
+    lookup = rules.CommandLookup([command])
+
+    # a subclass may match lines differently, so it is always tried
+    assert lookup.get_candidates('.bye') == (command,)
+
+
+@pytest.mark.parametrize('text', [
+    '.hello',
+    '.Hello world',
+    '..hello',
+    '!!hello there',
+    ' hello',
+    '.hello\tthere',
+    '.\u212aick',
+    '.\u0130dle',
+    '.\u017ftart',
+    '.kick-ban someone',
+    'hey bot, hello',
+])
+def test_command_lookup_same_matches(text):
+    # any command that matches must be a candidate
+    commands = [
+        rules.Command(name, prefix=prefix, aliases=aliases)
+        for prefix in (r'\.', r'[.!]', r'\.|\.\.', r'!!|\.', 'hey bot, ', '.')
+        for name, aliases in (
+            ('hello', ['hi']),
+            ('Kick', ['kick-ban']),
+            ('idle', []),
+            ('start', []),
+        )
+    ]
+    lookup = rules.CommandLookup(commands)
+
+    candidates = lookup.get_candidates(text)
+    matching = [
+        command
+        for command in commands
+        if any(command.parse(text))
+    ]
+
+    assert matching
+    assert all(command in candidates for command in matching)
+
+
+def test_manager_command_lookup(mockbot):
+    commands = [
+        rules.Command('command%d' % i, prefix=r'\.', plugin='testplugin')
+        for i in range(200)
+    ]
+    manager = rules.Manager()
+    for command in commands:
+        manager.register_command(command)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :.command150 argument'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert len(items) == 1
+    assert items[0][0] is commands[150]
+    assert items[0][1].group(2) == 'argument'
+
+
+# -----------------------------------------------------------------------------
+# tests for :class:`LiteralPrefilter`
+
+@pytest.mark.parametrize('pattern, expected', [
+    (re.compile(r'hello (\w+)'), ('hello ', False)),
+    (re.compile(r'(?:https?)://\S+'), ('http', False)),
+    (re.compile(r'\w+://\S+'), ('://', False)),
+    (re.compile(r'^s/(.*)/(.*)/?$'), ('s/', False)),
+    (re.compile(r'(ab)+c?'), ('ab', False)),
+    (re.compile(r'(?:ab)?cd'), ('cd', False)),
+    (re.compile(r'Hello', re.IGNORECASE), ('hello', True)),
+    (re.compile(r'(?i:foo)bar'), ('bar', False)),
+    (re.compile(r'.*'), None),
+    (re.compile(r'a|b'), None),
+    (re.compile(r'(?:hello)?'), None),
+    (re.compile(r'héllo', re.IGNORECASE), None),
+])
+def test_rule_get_required_literals(pattern, expected):
+    rule = rules.Rule([pattern])
+    assert rule.get_required_literals() == (expected,)
+
+
+def test_literal_prefilter():
+    url_rule = rules.SearchRule([re.compile(r'https?://\S+')])
+    sed_rule = rules.Rule([re.compile(r'^s/(.*)/(.*)/?$')])
+    hello_rule = rules.FindRule([re.compile(r'hello', re.IGNORECASE)])
+    any_rule = rules.Rule([re.compile(r'hello'), re.compile(r'.*')])
+    prefilter = rules.LiteralPrefilter(
+        [url_rule, sed_rule, hello_rule, any_rule])
+
+    found = prefilter.search('see https://example.com')
+    assert prefilter.is_candidate(url_rule, found)
+    assert not prefilter.is_candidate(sed_rule, found)
+    assert not prefilter.is_candidate(hello_rule, found)
+    assert prefilter.is_candidate(any_rule, found)
+
+    found = prefilter.search('s/HELLO/bye/')
+    assert not prefilter.is_candidate(url_rule, found)
+    assert prefilter.is_candidate(sed_rule, found)
+    assert prefilter.is_candidate(hello_rule, found)
+    assert prefilter.is_candidate(any_rule, found)
+
+
+def test_literal_prefilter_ignore_case_special_chars():
+    # re.IGNORECASE matches these non-ASCII chars with ASCII letters
+    rule = rules.Rule([re.compile(r'kiss', re.IGNORECASE)])
+    text = '\u212a\u0130\u017fS'
+    assert any(rule.parse(text))
+
+    prefilter = rules.LiteralPrefilter([rule])
+    assert prefilter.is_candidate(rule, prefilter.search(text))
+
+
+def test_manager_prefilter_metrics(mockbot):
+    hello_rule = rules.Rule(
+        [re.compile(r'hello'), re.compile(r'hi')],
+        plugin='testplugin',
+        label='hello')
+    any_rule = rules.Rule([re.compile('.*')], plugin='testplugin', label='any')
+    manager = rules.Manager()
+    manager.register(hello_rule)
+    manager.register(any_rule)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :Goodbye, world'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert len(items) == 1
+    assert any_rule in items[0]
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :hello, world'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert len(items) == 2
+    assert hello_rule in items[0]
+    assert any_rule in items[1]
+
+    metrics = hello_rule.get_prefilter_metrics()
+    assert metrics.skipped == 2
+    assert metrics.evaluated == 2
+
+    metrics = any_rule.get_prefilter_metrics()
+    assert metrics.skipped == 0
+    assert metrics.evaluated == 2
+
+
+def test_channel_policy():
+    hello_rule = rules.Rule([re.compile(r'.*')], plugin='hello', label='hi')
+    other_rule = rules.Rule([re.compile(r'.*')], plugin='hello', label='bye')
+    core_rule = rules.Rule([re.compile(r'.*')], plugin='coretasks', label='x')
+
+    policy = rules.ChannelPolicy()
+    assert not policy
+    assert not policy.is_disabled(hello_rule)
+
+    policy = rules.ChannelPolicy(disabled_commands={'hello': ['hi']})
+    assert policy
+    assert policy.is_disabled(hello_rule)
+    assert not policy.is_disabled(other_rule)
+
+    policy = rules.ChannelPolicy(
+        disabled_plugins=['*'], disabled_commands={'coretasks': 'x'})
+    assert policy.all_disabled
+    assert policy.is_disabled(hello_rule)
+    assert policy.is_disabled(other_rule)
+    assert not policy.is_disabled(core_rule)
+
+
+def test_channel_policy_from_section(configfactory):
+    tmpconfig = configfactory('test.cfg', """
+[core]
+owner = testnick
+
+[#valid]
+disable_plugins = hello, other
+disable_commands = {'admin': ['join', 'part']}
+
+[#invalid]
+disable_commands = not a dict
+""")
+
+    policy = rules.ChannelPolicy.from_section(tmpconfig['#valid'])
+    assert policy.disabled_plugins == frozenset({'hello', 'other'})
+    assert policy.disabled_commands == {'admin': frozenset({'join', 'part'})}
+
+    policy = rules.ChannelPolicy.from_section(tmpconfig['#invalid'])
+    assert not policy
+
+
+def test_manager_channel_policy(mockbot):
+    hello_rule = rules.Rule(
+        [re.compile(r'hello')], plugin='testplugin', label='hello')
+    any_rule = rules.Rule([re.compile('.*')], plugin='other', label='any')
+    manager = rules.Manager()
+    manager.register(hello_rule)
+    manager.register(any_rule)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :hello, world'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    policy = rules.ChannelPolicy(disabled_plugins=['other'])
+    items = manager.get_triggered_rules(mockbot, pretrigger, policy=policy)
+    assert len(items) == 1
+    assert hello_rule in items[0]
+
+
+@pytest.mark.parametrize('line, expected', (
+    (':Foo!foo@example.com PRIVMSG #sopel :hi',
+     ('PRIVMSG', None, False, False)),
+    (':Foo!foo@example.com PRIVMSG TestBot :\x01ACTION waves\x01',
+     ('PRIVMSG', 'ACTION', False, False)),
+    ('@bot :Foo!foo@example.com NOTICE #sopel :beep',
+     ('NOTICE', None, True, False)),
+    (':TestBot!bot@example.com PRIVMSG #sopel :hi',
+     ('PRIVMSG', None, False, True)),
+    ('@bot :Foo!foo@example.com QUIT :bye',
+     ('QUIT', None, False, False)),
+))
+def test_dispatch_context(mockbot, line, expected):
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    context = rules.DispatchContext.from_pretrigger(mockbot, pretrigger)
+
+    assert (
+        context.event,
+        context.ctcp,
+        context.is_bot_message,
+        context.is_echo_message,
+    ) == expected
+
+
+def test_dispatch_context_lazy_tags(mockbot):
+    line = '@bot :Foo!foo@example.com PRIVMSG #sopel :hello'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    context = rules.DispatchContext.from_pretrigger(mockbot, pretrigger)
+
+    assert 'tags' not in vars(pretrigger), 'Tags must be parsed on demand'
+    assert context.is_bot_message is True
+    assert 'tags' in vars(pretrigger)
+
+
+def test_manager_dispatch_context(mockbot):
+    seen = []
+
+    class ContextRule(rules.Rule):
+        def match_preconditions(self, bot, pretrigger, context=None):
+            seen.append(context)
+            return super().match_preconditions(bot, pretrigger, context)
+
+    class LegacyRule(rules.Rule):
+        def match(self, bot, pretrigger):
+            return super().match(bot, pretrigger)
+
+    class LegacyPreconditionsRule(rules.Rule):
+        def match_preconditions(self, bot, pretrigger):
+            return super().match_preconditions(bot, pretrigger)
+
+    regex = re.compile('.*')
+    manager = rules.Manager()
+    manager.register(ContextRule([regex], plugin='testplugin', label='a'))
+    manager.register(ContextRule([regex], plugin='testplugin', label='b'))
+    manager.register(LegacyRule([regex], plugin='testplugin', label='c'))
+    manager.register(
+        LegacyPreconditionsRule([regex], plugin='testplugin', label='d'))
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :hello'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+
+    assert len(items) == 4, 'Rules overriding match must still be matched'
+    assert len(seen) == 2
+    assert isinstance(seen[0], rules.DispatchContext)
+    assert seen[0] is seen[1], 'The context must be shared by all rules'
+
+
+def test_manager_dispatch_context_once_per_line(mockbot, monkeypatch):
+    manager = rules.Manager()
+    for index in range(10):
+        manager.register(rules.Rule(
+            [re.compile(r'.*')],
+            plugin='plugin%d' % index,
+            label='rule%d' % index))
+    manager.register_command(rules.Command('hello', prefix=r'\.'))
+    manager.register_url_callback(rules.URLCallback(
+        [re.compile(r'https://example\.com/.*')], label='url'))
+
+    built = []
+    from_pretrigger = rules.DispatchContext.from_pretrigger.__func__
+
+    def counted(cls, bot, pretrigger):
+        built.append(pretrigger)
+        return from_pretrigger(cls, bot, pretrigger)
+
+    monkeypatch.setattr(
+        rules.DispatchContext, 'from_pretrigger', classmethod(counted))
+
+    pretriggers = [
+        trigger.PreTrigger(mockbot.nick, line)
+        for line in (
+            ':Foo!foo@example.com PRIVMSG #sopel :.hello',
+            ':Foo!foo@example.com PRIVMSG #sopel :https://example.com/',
+            ':Foo!foo@example.com PRIVMSG #sopel :chatting',
+        )
+    ]
+    for pretrigger in pretriggers:
+        assert manager.get_triggered_rules(mockbot, pretrigger)
+
+    assert built == pretriggers, 'The context must be built once per line'
+
 # -----------------------------------------------------------------------------
 # tests for :class:`Rule`
 
@@ -628,6 +1055,26 @@ def test_rule_get_output_prefix():
     assert rule.get_output_prefix() == '[plugin] '
 
 
+def test_rule_get_concurrency_limit():
+    regex = re.compile('.*')
+
+    rule = rules.Rule([regex])
+    assert rule.get_concurrency_limit() is None
+
+    rule = rules.Rule(
+        [regex],
+        plugin='testplugin',
+        label='testrule',
+        max_concurrency=2,
+        concurrency_policy='drop',
+    )
+    limit = rule.get_concurrency_limit()
+    assert limit.name == 'testplugin.testrule'
+    assert limit.limit == 2
+    assert limit.policy == 'drop'
+    assert limit.running == 0
+
+
 def test_rule_match(mockbot):
     line = ':Foo!foo@example.com PRIVMSG #sopel :Hello, world'
     pretrigger = trigger.PreTrigger(mockbot.nick, line)
@@ -899,6 +1346,32 @@ def test_rule_execute(mockbot):
     assert result == 'The return value'
 
 
+def test_rule_execute_async(mockbot):
+    regex = re.compile(r'.*')
+    rule = rules.Rule([regex])
+    assert not rule.is_async()
+
+    async def handler(wrapped, trigger):
+        await wrapped.say('Hi!')
+        return 'The return value'
+
+    rule = rules.Rule([regex], handler=handler, asynchronous=True)
+    assert rule.is_async()
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :Hello, world'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    matches = list(rule.match(mockbot, pretrigger))
+    match = matches[0]
+    match_trigger = trigger.Trigger(
+        mockbot.settings, pretrigger, match, account=None)
+    wrapped = bot.AsyncSopelWrapper(mockbot, match_trigger)
+    result = asyncio.run(rule.execute_async(wrapped, match_trigger))
+
+    assert mockbot.backend.message_sent == rawlist('PRIVMSG #sopel :Hi!')
+    assert result == 'The return value'
+    assert rule.get_global_metrics().last_return_value == 'The return value'
+
+
 def test_rule_from_callable(mockbot):
     # prepare callable
     @plugin.rule(r'hello', r'hi', r'hey', r'hello|hi')
@@ -1118,6 +1591,9 @@ def test_kwargs_from_callable(mockbot):
     assert 'ctcp' in kwargs
     assert 'allow_echo' in kwargs
     assert 'threaded' in kwargs
+    assert 'asynchronous' in kwargs
+    assert 'max_concurrency' in kwargs
+    assert 'concurrency_policy' in kwargs
     assert 'output_prefix' in kwargs
     assert 'unblockable' in kwargs
     assert 'rate_limit_admins' in kwargs
@@ -1139,6 +1615,9 @@ def test_kwargs_from_callable(mockbot):
     assert kwargs['ctcp'] == []
     assert kwargs['allow_echo'] is False
     assert kwargs['threaded'] is True
+    assert kwargs['asynchronous'] is False
+    assert kwargs['max_concurrency'] == 0
+    assert kwargs['concurrency_policy'] == 'queue'
     assert kwargs['output_prefix'] == ''
     assert kwargs['unblockable'] is False
     assert kwargs['rate_limit_admins'] is False
@@ -1,8 +1,11 @@
 """Tests for core ``sopel.bot`` module"""
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 import re
+import threading
+import time
 import typing
 
 import pytest
@@ -1866,6 +1869,342 @@ def test_manual_url_callback_not_found(tmpconfig):
 # -----------------------------------------------------------------------------
 # Test various message handling
 
+def test_dispatch_threaded_rule(mockbot):
+    """Test threaded rules are executed by the rules executor."""
+    @plugin.rule("$nickname!")
+    def ping(bot, trigger):
+        bot.say(trigger.nick + "!")
+
+    ping.setup(mockbot.settings)
+    ping.plugin_name = "testplugin"
+    mockbot.register_callables([ping])
+
+    mockbot.on_message(":user!user@user PRIVMSG #test :TestBot!")
+
+    tasks = mockbot.running_triggers
+    for task in tasks:
+        task.join()
+
+    assert mockbot.backend.message_sent == rawlist("PRIVMSG #test :user!")
+    assert mockbot.rules_executor.worker_count == 1
+    assert mockbot.rules_executor.queue_depth == 0
+    assert mockbot.rules_executor.active_workers == 0
+    assert mockbot.running_triggers == []
+
+
+def test_dispatch_load_shedding(tmpconfig, botfactory):
+    """Test low & medium priority rules are shed when the bot is behind."""
+    tmpconfig.core.shed_low_priority_lag = 10
+    tmpconfig.core.shed_medium_priority_lag = 60
+    # replies must not wait for flood protection
+    tmpconfig.core.flood_burst_lines = 20
+    mockbot = botfactory(tmpconfig)
+
+    def make_rule(priority, unblockable=False):
+        @plugin.rule("$nickname!")
+        @plugin.priority(priority)
+        @plugin.thread(False)
+        def handler(bot, trigger):
+            bot.say(priority)
+
+        handler.unblockable = unblockable
+        handler.setup(mockbot.settings)
+        handler.plugin_name = "testplugin"
+        handler.label = priority + ('_unblockable' if unblockable else '')
+        return handler
+
+    mockbot.register_callables([
+        make_rule('high'),
+        make_rule('medium'),
+        make_rule('low'),
+        make_rule('low', unblockable=True),
+    ])
+
+    def lagging_line(seconds):
+        server_time = (
+            datetime.now(timezone.utc) - timedelta(seconds=seconds)
+        ).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        return "@time=%s :user!user@user PRIVMSG #test :TestBot!" % (
+            server_time[:-4] + 'Z')
+
+    # no lag
+    mockbot.on_message(lagging_line(0))
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #test :high",
+        "PRIVMSG #test :medium",
+        "PRIVMSG #test :low",
+        "PRIVMSG #test :low",
+    )
+    mockbot.backend.clear_message_sent()
+
+    # shed low priority rules
+    mockbot.on_message(lagging_line(30))
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #test :high",
+        "PRIVMSG #test :medium",
+        "PRIVMSG #test :low",
+    )
+    assert mockbot.load_shedder.shed_counts == {'low': 1, 'medium': 0}
+    mockbot.backend.clear_message_sent()
+
+    # shed low & medium priority rules
+    mockbot.on_message(lagging_line(120))
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #test :high",
+        "PRIVMSG #test :low",
+    )
+    assert mockbot.load_shedder.shed_counts == {'low': 2, 'medium': 1}
+
+
+def test_dispatch_load_shedding_server_time(tmpconfig, botfactory):
+    """Test clock skew and playback don't count as lag."""
+    tmpconfig.core.shed_low_priority_lag = 10
+    mockbot = botfactory(tmpconfig)
+
+    @plugin.rule("$nickname!")
+    @plugin.priority('low')
+    @plugin.thread(False)
+    def handler(bot, trigger):
+        bot.say('low')
+
+    handler.setup(mockbot.settings)
+    handler.plugin_name = "testplugin"
+    mockbot.register_callables([handler])
+
+    def lagging_line(seconds, tags=''):
+        server_time = (
+            datetime.now(timezone.utc) - timedelta(seconds=seconds)
+        ).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        return "@time=%s%s :user!user@user PRIVMSG #test :TestBot!" % (
+            server_time[:-4] + 'Z', tags)
+
+    # the server's clock is 2 minutes behind
+    mockbot.on_message(lagging_line(120))
+    mockbot.on_message(lagging_line(120))
+
+    # playback of an old line
+    mockbot.on_message(lagging_line(3600, ';batch=playback'))
+
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #test :low",
+        "PRIVMSG #test :low",
+        "PRIVMSG #test :low",
+    )
+    assert mockbot.load_shedder.shed_counts == {'low': 0, 'medium': 0}
+
+    # the line is really late
+    mockbot.on_message(lagging_line(150))
+    assert mockbot.load_shedder.shed_counts == {'low': 1, 'medium': 0}
+
+
+TMP_CONFIG_CHANNEL_POLICY = TMP_CONFIG + """
+[#Disabled]
+disable_plugins = *
+
+[#test]
+disable_plugins = otherplugin
+disable_commands = {'testplugin': ['medium'], 'coretasks': ['high']}
+"""
+
+
+def test_dispatch_channel_policy(configfactory, botfactory, monkeypatch):
+    """Test rules disabled in a channel are not even matched."""
+    tmpconfig = configfactory('test.cfg', TMP_CONFIG_CHANNEL_POLICY)
+    mockbot = botfactory(tmpconfig)
+    matched = []
+
+    def make_rule(plugin_name, label):
+        @plugin.rule("$nickname!")
+        @plugin.thread(False)
+        def handler(bot, trigger):
+            bot.say(label)
+
+        handler.setup(mockbot.settings)
+        handler.plugin_name = plugin_name
+        handler.label = label
+        return handler
+
+    mockbot.register_callables([
+        make_rule('testplugin', 'high'),
+        make_rule('testplugin', 'medium'),
+        make_rule('otherplugin', 'low'),
+        make_rule('coretasks', 'core'),
+    ])
+
+    original_match = rules.Rule.match
+
+    def spy_match(self, bot, pretrigger):
+        matched.append(self.get_rule_label())
+        return original_match(self, bot, pretrigger)
+
+    monkeypatch.setattr(rules.Rule, 'match', spy_match)
+
+    mockbot.on_message(":user!user@user PRIVMSG #TEST :TestBot!")
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #TEST :high",
+        "PRIVMSG #TEST :core",
+    )
+    assert sorted(matched) == ['core', 'high']
+    mockbot.backend.clear_message_sent()
+
+    mockbot.on_message(":user!user@user PRIVMSG #disabled :TestBot!")
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #disabled :core",
+    )
+    mockbot.backend.clear_message_sent()
+
+    mockbot.on_message(":user!user@user PRIVMSG TestBot :TestBot!")
+    assert len(mockbot.backend.message_sent) == 4
+
+
+def test_channel_policy_reset(configfactory, botfactory):
+    """Test channel policies are parsed once, until they are reset."""
+    tmpconfig = configfactory('test.cfg', TMP_CONFIG_CHANNEL_POLICY)
+    mockbot = botfactory(tmpconfig)
+
+    policy = mockbot.get_channel_policy('#test')
+    assert policy.disabled_plugins == frozenset({'otherplugin'})
+    assert mockbot.get_channel_policy(Identifier('#TEST')) is policy
+    assert mockbot.get_channel_policy('#disabled').all_disabled
+    assert mockbot.get_channel_policy('#other') is None
+    assert mockbot.get_channel_policy('core') is None
+
+    mockbot.settings['#test'].disable_plugins = 'testplugin'
+    assert mockbot.get_channel_policy('#test') is policy, 'Must be cached'
+
+    mockbot.reset_channel_policies()
+    policy = mockbot.get_channel_policy('#test')
+    assert policy.disabled_plugins == frozenset({'testplugin'})
+
+
+def test_dispatch_async_rule(mockbot):
+    """Test rules with a coroutine function are run on the event loop."""
+    wrappers = []
+
+    @plugin.rule("$nickname!")
+    async def ping(wrapped, trigger):
+        wrappers.append(wrapped)
+        await asyncio.sleep(0)
+        wrapped.say(trigger.nick + "!")
+        await wrapped.reply("pong")
+
+    ping.setup(mockbot.settings)
+    ping.plugin_name = "testplugin"
+    mockbot.register_callables([ping])
+
+    mockbot.on_message(":user!user@user PRIVMSG #test :TestBot!")
+
+    assert isinstance(wrappers[0], bot.AsyncSopelWrapper)
+    assert mockbot.running_triggers == [], 'Must not use a thread'
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #test :user!",
+        "PRIVMSG #test :user: pong",
+    )
+
+
+def test_dispatch_async_rule_error(mockbot):
+    """Test errors from a coroutine function are handled by the bot."""
+    @plugin.rule("$nickname!")
+    async def ping(wrapped, trigger):
+        wrapped.say("before error")
+        raise ValueError("boom")
+
+    ping.setup(mockbot.settings)
+    ping.plugin_name = "testplugin"
+    mockbot.register_callables([ping])
+
+    loop_thread = threading.current_thread()
+    error_threads = []
+    original_error = mockbot.error
+
+    def error(*args, **kwargs):
+        error_threads.append(threading.current_thread())
+        original_error(*args, **kwargs)
+
+    mockbot.error = error
+    mockbot.on_message(":user!user@user PRIVMSG #test :TestBot!")
+
+    assert error_threads and error_threads[0] is not loop_thread, (
+        'Errors must be reported without blocking the event loop')
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #test :before error",
+        "PRIVMSG #test :Unexpected ValueError (boom) from user. "
+        "Message was: TestBot!",
+    )
+
+
+def test_dispatch_plugin_max_concurrency(tmpconfig, botfactory):
+    """Test a plugin's threaded rules are limited by its concurrency limit."""
+    tmpconfig.core.plugin_max_concurrency = 1
+    tmpconfig.core.plugin_concurrency_policy = 'drop'
+    mockbot = botfactory(tmpconfig)
+    release = threading.Event()
+
+    @plugin.rule("$nickname!")
+    def ping(bot, trigger):
+        release.wait()
+        bot.say(trigger.nick + "!")
+
+    ping.setup(mockbot.settings)
+    ping.plugin_name = "testplugin"
+    mockbot.register_callables([ping])
+
+    try:
+        mockbot.on_message(":user1!user@user PRIVMSG #test :TestBot!")
+        mockbot.on_message(":user2!user@user PRIVMSG #test :TestBot!")
+
+        rule = dict(mockbot.rules.get_all_generic_rules())['testplugin'][0]
+        limits = mockbot.get_concurrency_limits(rule)
+    finally:
+        release.set()
+
+    while tasks := mockbot.running_triggers:
+        for task in tasks:
+            task.join()
+
+    assert len(limits) == 1
+    assert limits[0].name == 'testplugin'
+    assert limits[0].dropped_count == 1
+    assert mockbot.backend.message_sent == rawlist("PRIVMSG #test :user1!")
+
+
+def test_dispatch_threaded_rule_dropped(tmpconfig, botfactory):
+    """Test threaded rules are dropped when the rule queue is full."""
+    tmpconfig.core.rule_threads = 1
+    tmpconfig.core.rule_queue_size = 1
+    mockbot = botfactory(tmpconfig)
+    release = threading.Event()
+
+    @plugin.rule("$nickname!")
+    def ping(bot, trigger):
+        release.wait()
+        bot.say(trigger.nick + "!")
+
+    ping.setup(mockbot.settings)
+    ping.plugin_name = "testplugin"
+    mockbot.register_callables([ping])
+
+    try:
+        for nick in ('user1', 'user2', 'user3'):
+            mockbot.on_message(
+                ":%s!user@user PRIVMSG #test :TestBot!" % nick)
+            while nick == 'user1' and not mockbot.rules_executor.active_workers:
+                time.sleep(0.01)  # wait for the first rule to start
+
+        assert mockbot.rules_executor.dropped_count == 1
+    finally:
+        release.set()
+
+    while tasks := mockbot.running_triggers:
+        for task in tasks:
+            task.join()
+
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #test :user1!",
+        "PRIVMSG #test :user2!",
+    )
+
+
 def test_ignore_replay_servertime(mockbot):
     """Test ignoring messages sent before bot joined a channel."""
     @plugin.rule("$nickname!")
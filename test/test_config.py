@@ -457,3 +457,12 @@ def test_get_defined_sections(multi_fakeconfig):
     assert 'spam' in items
     assert 'somesection' not in items, (
         'somesection was not defined and should not appear as such')
+
+
+def test_core_rule_threads_invalid(tmphomedir):
+    conf_file = tmphomedir.join('conf.cfg')
+    conf_file.write(
+        FAKE_CONFIG.format(homedir=tmphomedir.strpath) + 'rule_threads = 0\n')
+
+    with pytest.raises(ValueError, match='core.rule_threads'):
+        config.Config(conf_file.strpath)
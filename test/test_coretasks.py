@@ -558,6 +558,18 @@ def test_recv_chghost(mockbot, ircfactory):
     assert mockbot.users[Identifier('Alex')].host == 'identd.confirmed'
 
 
+def test_recv_chghost_forget_access(mockbot, ircfactory):
+    """Ensure that CHGHOST messages reset the owner/admin verdicts."""
+    irc = ircfactory(mockbot)
+    irc.channel_joined("#test", ["Alex", "Bob", "Cheryl"])
+    mockbot.access_matcher.check('Alex', 'test.local', None)
+    assert 'alex' in mockbot.access_matcher._cache
+
+    mockbot.on_message(":Alex!~alex@test.local CHGHOST alex identd.confirmed")
+
+    assert 'alex' not in mockbot.access_matcher._cache
+
+
 def test_recv_chghost_invalid(mockbot, ircfactory, caplog):
     """Ensure that malformed CHGHOST messages are ignored and logged."""
     irc = ircfactory(mockbot)
@@ -612,6 +624,102 @@ def test_join_time(mockbot):
     )
 
 
+def test_track_quit(mockbot, ircfactory):
+    """Make sure a QUIT removes the user from their channels only"""
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', ['Alex', 'Bob'])
+    irc.channel_joined('#other', ['Alex', 'Cheryl'])
+    irc.channel_joined('#empty', [])
+
+    mockbot.on_message(':Alex!alex@example.com QUIT :Bye!')
+
+    alex = Identifier('Alex')
+    assert alex not in mockbot.users
+    for channel in mockbot.channels.values():
+        assert alex not in channel.users
+        assert alex not in channel.privileges
+    assert Identifier('Bob') in mockbot.channels['#test'].users
+    assert Identifier('Cheryl') in mockbot.channels['#other'].users
+
+
+def test_track_nicks(mockbot, ircfactory):
+    """Make sure a NICK renames the user in all their channels"""
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', ['@Alex', 'Bob'])
+    irc.channel_joined('#other', ['Alex'])
+
+    mockbot.on_message(':Alex!alex@example.com NICK Alexandra')
+
+    alex = Identifier('Alex')
+    alexandra = Identifier('Alexandra')
+    assert alex not in mockbot.users
+    assert mockbot.users[alexandra].nick == alexandra
+    assert set(mockbot.users[alexandra].channels) == {
+        Identifier('#test'), Identifier('#other')}
+    assert mockbot.channels['#test'].privileges[alexandra] == OP
+    assert mockbot.channels['#other'].privileges[alexandra] == 0
+    for channel in mockbot.channels.values():
+        assert alex not in channel.users
+        assert channel.users[alexandra] is mockbot.users[alexandra]
+
+
+def test_track_part_self(mockbot, ircfactory):
+    """Make sure the bot forgets users it no longer shares a channel with"""
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', ['Alex', 'Bob'])
+    irc.channel_joined('#other', ['Alex'])
+
+    mockbot.on_message(':TestBot!bot@example.com PART #test')
+
+    assert Identifier('#test') not in mockbot.channels
+    assert Identifier('Bob') not in mockbot.users
+    assert set(mockbot.users[Identifier('Alex')].channels) == {
+        Identifier('#other')}
+
+
+def test_track_quit_netsplit(mockbot, ircfactory):
+    """Make sure a netsplit's QUITs remove users from their channels only"""
+    irc = ircfactory(mockbot)
+    channel_count, user_count = 50, 100
+    groups = channel_count // 5
+    for index in range(channel_count):
+        # each user is in 5 channels
+        irc.channel_joined('#channel%d' % index, [
+            'User%d' % user_index
+            for user_index in range(user_count)
+            if user_index % groups == index % groups
+        ])
+
+    # the users of the first group split
+    for index in range(0, user_count, groups):
+        irc.message(
+            ':User%d!user@split.example.com QUIT '
+            ':hub.example.com leaf.example.com' % index)
+
+    bot_nick = Identifier('TestBot')
+    remaining = {
+        Identifier('User%d' % index)
+        for index in range(user_count)
+        if index % groups
+    }
+    assert set(mockbot.users) == remaining | {bot_nick}
+    for name, channel in mockbot.channels.items():
+        index = int(name[len('#channel'):])
+        expected = {
+            Identifier('User%d' % user_index)
+            for user_index in range(user_count)
+            if user_index % groups == index % groups
+        } & remaining
+        assert set(channel.users) == expected | {bot_nick}
+        assert set(channel.privileges) == expected | {bot_nick}
+        if index % groups:
+            assert len(expected) == user_count // groups
+        else:
+            assert not expected
+    for nick in remaining:
+        assert len(mockbot.users[nick].channels) == 5
+
+
 def test_handle_rpl_namreply_with_malformed_uhnames(mockbot, caplog):
     """Make sure Sopel can cope with expected but missing hostmask in 353"""
     caplog.set_level(logging.DEBUG, logger='sopel.coretasks')
@@ -627,6 +735,180 @@ def test_handle_rpl_namreply_with_malformed_uhnames(mockbot, caplog):
     assert 'RPL_NAMREPLY item without a hostmask' in caplog.messages[0]
 
 
+def test_handle_names_at_end_of_names(mockbot):
+    """Make sure NAMES members are added at RPL_ENDOFNAMES, all at once"""
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #test :TestBot @Alex +Bob')
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #test :Cheryl')
+
+    assert Identifier('#test') not in mockbot.channels
+    assert Identifier('Alex') not in mockbot.users
+
+    mockbot.on_message(
+        ':irc.example.com 366 TestBot #test :End of /NAMES list.')
+
+    channel = mockbot.channels[Identifier('#test')]
+    assert sorted(channel.users) == [
+        Identifier('Alex'),
+        Identifier('Bob'),
+        Identifier('Cheryl'),
+        Identifier('TestBot'),
+    ]
+    assert channel.privileges[Identifier('Alex')] == OP
+    assert channel.privileges[Identifier('Bob')] == VOICE
+    assert channel.privileges[Identifier('Cheryl')] == 0
+    assert channel.users[Identifier('Alex')] is mockbot.users['Alex']
+    assert mockbot.memory['names_pending'] == {}
+
+
+def test_handle_names_isupport(mockbot):
+    """Make sure NAMES replies use the server's PREFIX and CHANTYPES"""
+    mockbot.on_message(
+        ':irc.example.com 005 TestBot '
+        'PREFIX=(qov)*@+ CHANTYPES=#& '
+        ':are supported by this server')
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot @ &local '
+        ':TestBot *@Alex +Bob @Cheryl')
+    mockbot.on_message(
+        ':irc.example.com 366 TestBot &local :End of /NAMES list.')
+
+    channel = mockbot.channels[Identifier('&local')]
+    assert channel.privileges[Identifier('Alex')] == OWNER | OP
+    assert channel.privileges[Identifier('Bob')] == VOICE
+    assert channel.privileges[Identifier('Cheryl')] == OP
+
+
+def test_handle_names_pending_part(mockbot, ircfactory):
+    """Make sure unfinished NAMES replies are dropped when leaving"""
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test')
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #test :TestBot @Alex')
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #other :TestBot Bob')
+
+    mockbot.on_message(':TestBot!bot@example.com PART #test')
+    mockbot.on_message(
+        ':Alex!alex@example.com KICK #other TestBot :bye')
+
+    assert mockbot.memory['names_pending'] == {}
+
+
+def test_handle_names_pending_rejoin(mockbot):
+    """Make sure an unfinished NAMES reply is dropped when joining again"""
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #test :TestBot @Alex')
+    mockbot.on_message(':TestBot!bot@example.com JOIN #test')
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #test :TestBot Bob')
+    mockbot.on_message(
+        ':irc.example.com 366 TestBot #test :End of /NAMES list.')
+
+    channel = mockbot.channels[Identifier('#test')]
+    assert sorted(channel.users) == [Identifier('Bob'), Identifier('TestBot')]
+    assert mockbot.memory['names_pending'] == {}
+
+
+def test_who_scheduler_budget(mockbot, ircfactory):
+    """Make sure WHO requests wait for the budget, without duplicates"""
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', ['Alex'])
+    scheduler = coretasks.WhoScheduler(burst=1, refill_rate=0)
+    mockbot.memory['who_scheduler'] = scheduler
+
+    coretasks._send_who(mockbot, '#test')
+    coretasks._send_who(mockbot, 'Bob')
+    coretasks._send_who(mockbot, 'bob')
+    coretasks._send_who(mockbot, 'Cheryl')
+
+    assert mockbot.backend.message_sent == rawlist('WHO #test')
+    assert mockbot.channels['#test'].last_who is not None
+    assert scheduler.pending_count == 2
+
+    # budget refilled
+    scheduler.burst = scheduler._tokens = 2
+    scheduler.flush(mockbot)
+
+    assert mockbot.backend.message_sent == rawlist(
+        'WHO #test', 'WHO Bob', 'WHO Cheryl')
+    assert scheduler.pending_count == 0
+    assert scheduler.requested_count == 4
+    assert scheduler.deduplicated_count == 1
+    assert scheduler.sent_count == 3
+    assert scheduler.sent_targets_count == 3
+    assert scheduler.max_pending == 2
+
+
+def test_who_scheduler_covered(mockbot, ircfactory):
+    """Make sure a waiting channel WHO covers the WHO for its users"""
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', ['Alex', 'Bob'])
+    scheduler = coretasks.WhoScheduler(burst=0, refill_rate=0)
+    mockbot.memory['who_scheduler'] = scheduler
+
+    coretasks._send_who(mockbot, 'Alex')
+    coretasks._send_who(mockbot, 'Cheryl')
+    coretasks._send_who(mockbot, '#test')
+    coretasks._send_who(mockbot, 'Bob')
+
+    assert mockbot.backend.message_sent == []
+    assert scheduler.pending_count == 2
+    assert scheduler.covered_count == 2
+
+    # budget refilled
+    scheduler.burst = scheduler._tokens = 5
+    scheduler.flush(mockbot)
+
+    assert mockbot.backend.message_sent == rawlist('WHO Cheryl', 'WHO #test')
+
+
+def test_who_scheduler_whox_targmax(mockbot, ircfactory):
+    """Make sure waiting targets are merged when WHO allows many targets"""
+    mockbot.on_message(
+        ':irc.example.com 005 TestBot WHOX TARGMAX=WHO:3 '
+        ':are supported by this server')
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', [])
+    scheduler = coretasks.WhoScheduler(burst=0, refill_rate=0)
+    mockbot.memory['who_scheduler'] = scheduler
+
+    for mask in ('#test', 'Alex', 'Bob', 'Cheryl'):
+        coretasks._send_who(mockbot, mask)
+
+    # budget refilled
+    scheduler.burst = scheduler._tokens = 5
+    scheduler.flush(mockbot)
+
+    assert mockbot.backend.message_sent == rawlist(
+        'WHO #test,Alex,Bob %nuachrtf,999',
+        'WHO Cheryl %nuachrtf,999',
+    )
+    assert scheduler.sent_count == 2
+    assert scheduler.sent_targets_count == 4
+
+
+def test_who_scheduler_whox_single_target(mockbot):
+    """Make sure targets are not merged without TARGMAX for WHO"""
+    mockbot.on_message(
+        ':irc.example.com 005 TestBot WHOX '
+        ':are supported by this server')
+    scheduler = coretasks.WhoScheduler(burst=0, refill_rate=0)
+    mockbot.memory['who_scheduler'] = scheduler
+
+    coretasks._send_who(mockbot, 'Alex')
+    coretasks._send_who(mockbot, 'Bob')
+    # budget refilled
+    scheduler.burst = scheduler._tokens = 5
+    scheduler.flush(mockbot)
+
+    assert mockbot.backend.message_sent == rawlist(
+        'WHO Alex %nuachrtf,999',
+        'WHO Bob %nuachrtf,999',
+    )
+
+
 def test_handle_who_reply(mockbot):
     """Make sure Sopel correctly updates user info from WHO replies"""
     # verify we start with no users/channels
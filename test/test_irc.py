@@ -36,6 +36,32 @@ def test_make_identifier(bot):
     assert 'test{a}' == nick
 
 
+def test_make_identifier_interned(bot):
+    nick = bot.make_identifier('Test[a]')
+    assert bot.make_identifier('Test[a]') is nick
+    assert bot.make_identifier(nick) is nick
+    assert bot.make_identifier('test{a}') is not nick
+    assert str(bot.make_identifier('test{a}')) == 'test{a}'
+
+
+def test_make_identifier_casemapping_changed(bot):
+    nick = bot.make_identifier('Test[a]')
+
+    # same casemapping: identifiers are still the same
+    bot._isupport = bot.isupport.apply(network='Example')
+    assert bot.make_identifier('Test[a]') is nick
+
+    bot._isupport = bot.isupport.apply(casemapping='ascii')
+    ascii_nick = bot.make_identifier('Test[a]')
+    assert ascii_nick is not nick
+    assert ascii_nick.lower() == 'test[a]'
+    assert ascii_nick != 'test{a}'
+
+    bot._isupport = bot.isupport.apply(chantypes=('#', '!'))
+    channel = bot.make_identifier('!Sopel')
+    assert not channel.is_nick()
+
+
 def test_make_identifier_memory(bot):
     memory = bot.make_identifier_memory()
     memory['Test[a]'] = True
@@ -150,6 +150,20 @@ def test_label():
     assert mock.rule_label == 'hello'
 
 
+def test_max_concurrency():
+    @plugin.max_concurrency(2)
+    def mock(bot, trigger):
+        return True
+    assert mock.max_concurrency == 2
+    assert mock.concurrency_policy == 'queue'
+
+    @plugin.max_concurrency(1, 'drop')
+    def mock(bot, trigger):
+        return True
+    assert mock.max_concurrency == 1
+    assert mock.concurrency_policy == 'drop'
+
+
 def test_search():
     @plugin.search('.*')
     def mock(bot, trigger, match):
@@ -1,8 +1,11 @@
 """Tests sopel.tools"""
 from __future__ import annotations
 
+import random
 import re
 
+import pytest
+
 from sopel import tools
 
 
@@ -187,6 +190,50 @@ def test_get_sendable_message_bigger_multibyte_whitespace():
     assert second == expected_second
 
 
+def _legacy_get_sendable_message(text, max_length=400):
+    # implementation of get_sendable_message before Sopel 8.1
+    unicode_max_length = max_length
+    excess = ''
+
+    while len(text.encode('utf-8')) > max_length:
+        last_space = text.rfind(' ', 0, unicode_max_length)
+        if last_space == -1:
+            excess = text[unicode_max_length:] + excess
+            text = text[:unicode_max_length]
+            unicode_max_length = unicode_max_length - 1
+        else:
+            excess = text[last_space:] + excess
+            text = text[:last_space]
+
+    return text, excess.lstrip()
+
+
+SENDABLE_ALPHABET = ' ' * 4 + 'ab\t' + 'αé' + 'अ€' + '𡃤🍳'
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_get_sendable_message_same_as_legacy(seed):
+    rand = random.Random(seed)
+
+    for _ in range(100):
+        text = ''.join(
+            rand.choice(SENDABLE_ALPHABET)
+            for _ in range(rand.randint(0, 40))
+        )
+        max_length = rand.randint(0, 50)
+
+        assert tools.get_sendable_message(text, max_length) == (
+            _legacy_get_sendable_message(text, max_length)
+        ), 'Different result for %r (max_length=%d)' % (text, max_length)
+
+
+def test_get_sendable_message_space_at_limit():
+    # a space right after max_length ASCII characters is not used
+    assert tools.get_sendable_message('aa bb cc', 5) == ('aa', 'bb cc')
+    # but it is when the text before it has multibyte characters
+    assert tools.get_sendable_message('aα bb cc', 5) == ('aα', 'bb cc')
+
+
 def test_chain_loaders(configfactory):
     re_numeric = re.compile(r'\d+')
     re_text = re.compile(r'\w+')
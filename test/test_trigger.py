@@ -3,11 +3,17 @@ from __future__ import annotations
 
 import datetime
 import re
+import time
 
 import pytest
 
-from sopel.tools import Identifier
-from sopel.trigger import PreTrigger, Trigger
+from sopel.tools import Identifier, masks, web
+from sopel.trigger import (
+    parse_server_time,
+    PreTrigger,
+    Trigger,
+    unescape_tag_value,
+)
 
 
 TMP_CONFIG = """
@@ -202,6 +208,103 @@ def test_tags_pretrigger(nick):
     assert pretrigger.status_prefix is None
 
 
+def test_tags_pretrigger_escaped_values(nick):
+    line = (
+        r'@label=a\sb\:c;path=C:\\sopel;trailing=end\ '
+        ':Foo!foo@example.com PRIVMSG #Sopel :Hello, world')
+    pretrigger = PreTrigger(nick, line)
+    assert pretrigger.tags == {
+        'label': 'a b;c',
+        'path': 'C:\\sopel',
+        'trailing': 'end',
+    }
+
+
+@pytest.mark.parametrize('value, expected', (
+    ('plain', 'plain'),
+    (r'\:', ';'),
+    (r'\s', ' '),
+    (r'\\', '\\'),
+    (r'\r\n', '\r\n'),
+    (r'\x', 'x'),
+    ('end\\', 'end'),
+    (r'\\s', '\\s'),
+    (r'\\\s', '\\ '),
+))
+def test_unescape_tag_value(value, expected):
+    assert unescape_tag_value(value) == expected
+
+
+@pytest.mark.parametrize('value, expected', (
+    ('2016-01-09T03:15:42.000Z',
+     datetime.datetime(2016, 1, 9, 3, 15, 42, tzinfo=datetime.timezone.utc)),
+    ('2016-01-09T03:15:42.5Z',
+     datetime.datetime(
+         2016, 1, 9, 3, 15, 42, 500000, tzinfo=datetime.timezone.utc)),
+    ('2016-01-09T03:15:42.123456Z',
+     datetime.datetime(
+         2016, 1, 9, 3, 15, 42, 123456, tzinfo=datetime.timezone.utc)),
+    ('2016-01-09T03:15:42Z', None),
+    ('2016-01-09T03:15:42.000', None),
+    ('2016-01-09 03:15:42.000Z', None),
+    ('2016-13-09T03:15:42.000Z', None),
+    ('2016-01-09T03:15:42.1234567Z', None),
+    ('2016-01-09T03:15:4x.000Z', None),
+    ('', None),
+))
+def test_parse_server_time(value, expected):
+    assert parse_server_time(value) == expected
+
+
+def test_parse_server_time_matches_strptime():
+    value = '2023-07-15T23:59:59.999Z'
+    expected = datetime.datetime.strptime(
+        value, '%Y-%m-%dT%H:%M:%S.%fZ',
+    ).replace(tzinfo=datetime.timezone.utc)
+
+    assert parse_server_time(value) == expected
+
+
+def test_lazy_pretrigger(nick):
+    line = (
+        '@time=2016-01-09T03:15:42.000Z '
+        ':Foo!foo@example.com PRIVMSG #Sopel :\x02see\x02 https://example.com')
+    pretrigger = PreTrigger(nick, line)
+
+    lazy_attrs = {'tags', 'time', 'urls', 'plain'}
+    assert lazy_attrs.isdisjoint(vars(pretrigger)), (
+        'Must not be computed until used')
+
+    assert pretrigger.urls == ('https://example.com',)
+    assert pretrigger.plain == 'see https://example.com'
+    assert pretrigger.time == datetime.datetime(
+        2016, 1, 9, 3, 15, 42, 0, tzinfo=datetime.timezone.utc)
+    assert lazy_attrs.issubset(vars(pretrigger)), 'Must be cached once used'
+
+
+def test_pretrigger_url_extractor(nick):
+    line = ':Foo!foo@example.com PRIVMSG #Sopel :http://a.com/ irc://b.net/'
+
+    pretrigger = PreTrigger(nick, line, url_schemes=['irc'])
+    assert pretrigger.urls == ('irc://b.net/',)
+
+    extractor = web.URLExtractor(schemes=['http'])
+    pretrigger = PreTrigger(
+        nick, line, url_schemes=['irc'], url_extractor=extractor)
+    assert pretrigger.urls == ('http://a.com/',), (
+        'The extractor must take precedence over the schemes')
+
+
+def test_lazy_pretrigger_received_time(nick):
+    before = datetime.datetime.now(datetime.timezone.utc)
+    pretrigger = PreTrigger(nick, ':Foo!foo@example.com PRIVMSG #Sopel :Hi')
+    after = datetime.datetime.now(datetime.timezone.utc)
+    time.sleep(0.01)
+
+    assert before <= pretrigger.time <= after, (
+        'Must be the time when the line was received, not when it was used')
+
+
 def test_intents_pretrigger(nick):
     line = '@intent=ACTION :Foo!foo@example.com PRIVMSG #Sopel :Hello, world'
     pretrigger = PreTrigger(nick, line)
@@ -457,3 +560,16 @@ def test_privmsg_admin_match_host(nick, senderhostmask, isadmin, configfactory):
     trigger = Trigger(config, pretrigger, fakematch)
     assert trigger.sender == '#Sopel'
     assert trigger.admin is isadmin, "Admin privilege does not match expectation"
+
+
+def test_trigger_access_matcher(nick, configfactory):
+    line = ':Foo!foo@example.com PRIVMSG #Sopel :Hello world!'
+    pretrigger = PreTrigger(nick, line)
+    config = configfactory('default.cfg', TMP_CONFIG)
+    fakematch = re.match('.*', line)
+    access = masks.AccessMatcher(owner='Bar', admins=['*@example.com'])
+
+    trigger = Trigger(config, pretrigger, fakematch, access=access)
+
+    assert trigger.owner is False, 'Must not use the owner setting'
+    assert trigger.admin is True
@@ -1,6 +1,8 @@
 """Tests for ``sopel.tests.mocks`` module"""
 from __future__ import annotations
 
+import asyncio
+
 from sopel.tests.mocks import MockIRCBackend
 
 
@@ -31,3 +33,28 @@ def test_backend_clear_message_sent():
     assert result == items
     assert result is not items, 'The result should be a copy.'
     assert not backend.message_sent, '`message_sent` must be empty'
+
+
+def test_backend_run_coroutine():
+    backend = MockIRCBackend(bot=None)
+
+    async def coro():
+        return 'done'
+
+    future = backend.run_coroutine(coro())
+    assert future.done()
+    assert future.result() == 'done'
+
+
+def test_backend_run_coroutine_from_running_loop():
+    backend = MockIRCBackend(bot=None)
+
+    async def coro():
+        return 'done'
+
+    async def main():
+        return backend.run_coroutine(coro())
+
+    future = asyncio.run(main())
+    assert future.done()
+    assert future.result() == 'done'
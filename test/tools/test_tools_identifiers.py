@@ -194,3 +194,54 @@ def test_identifier_is_nick_channel(name, chantypes):
 def test_identifier_is_nick_empty():
     assert not identifiers.Identifier('').is_nick()
     assert not identifiers.Identifier('', chantypes=('',)).is_nick()
+
+
+def test_interned_identifier_factory():
+    factory = identifiers.InternedIdentifierFactory()
+    nick = factory('Test[a]')
+
+    assert isinstance(nick, identifiers.Identifier)
+    assert nick.casemapping is identifiers.rfc1459_lower
+    assert nick.chantypes == identifiers.DEFAULT_CHANTYPES
+    assert nick.lower() == 'test{a}'
+    assert factory('Test[a]') is nick
+    assert factory(identifiers.Identifier('Test[a]')) is nick
+    # names are not casemapped to find the identifier
+    assert factory('test{a}') is not nick
+    assert factory('test{a}') == nick
+
+    factory.cache_clear()
+    assert factory('Test[a]') is not nick
+    assert factory('Test[a]') == nick
+
+
+def test_interned_identifier_factory_casemapping():
+    factory = identifiers.InternedIdentifierFactory(
+        casemapping=identifiers.ascii_lower,
+        chantypes=('#', '!'),
+    )
+    channel = factory('!Test[a]')
+
+    assert channel.casemapping is identifiers.ascii_lower
+    assert channel.lower() == '!test[a]'
+    assert not channel.is_nick()
+
+
+def test_interned_identifier_factory_maxsize():
+    factory = identifiers.InternedIdentifierFactory(maxsize=2)
+    first = factory('first')
+    factory('second')
+    factory('third')
+
+    assert factory('first') is not first
+    assert factory('first') == first
+
+
+def test_identifier_eq_other_casemapping():
+    rfc1459 = identifiers.Identifier('Test[a]')
+    ascii = identifiers.Identifier(
+        'test{a}', casemapping=identifiers.ascii_lower)
+
+    # each identifier lowers the other with its own casemapping
+    assert rfc1459 == ascii
+    assert ascii != rfc1459
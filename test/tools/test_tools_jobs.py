@@ -1,11 +1,14 @@
 """Tests for Job Scheduler"""
 from __future__ import annotations
 
+import asyncio
 import time
 
 import pytest
 
 from sopel import plugin
+from sopel.bot import AsyncSopelWrapper
+from sopel.plugins import jobs as plugin_jobs
 from sopel.tools import jobs
 
 
@@ -35,6 +38,29 @@ def test_jobscheduler_stop(mockconfig, botfactory):
     assert scheduler.stopping.is_set(), 'Stopping must have been set'
 
 
+def test_plugin_jobscheduler_run_async_job(mockconfig, botfactory):
+    mockbot = botfactory(mockconfig)
+    scheduler = plugin_jobs.Scheduler(mockbot)
+    results = []
+
+    @plugin.interval(5)
+    async def handler(manager):
+        results.append(manager)
+
+    handler.setup(mockconfig)
+    handler.plugin_name = 'testplugin'
+    job = jobs.Job.from_callable(mockconfig, handler)
+    last_time = job.next_times[5] = time.time() - 1
+
+    # the mock backend runs the coroutine right away
+    scheduler._run_job(job)
+
+    assert isinstance(results[0], AsyncSopelWrapper)
+    assert results[0]._bot is mockbot
+    assert not job.is_running.is_set()
+    assert job.next_times[5] == last_time + 5
+
+
 def test_job_is_ready_to_run():
     now = time.time()
     job = jobs.Job([5])
@@ -221,6 +247,20 @@ def test_job_from_callable(mockconfig):
     assert str(job) == '<Job testplugin.testjob [5s]>'
 
 
+def test_job_from_callable_async(mockconfig):
+    @plugin.interval(5)
+    async def handler(manager):
+        return 'tested'
+
+    handler.setup(mockconfig)
+    handler.plugin_name = 'testplugin'
+
+    job = jobs.Job.from_callable(mockconfig, handler)
+
+    assert job.is_async()
+    assert asyncio.run(job.execute(None)) == 'tested'
+
+
 def test_job_with():
     job = jobs.Job([5])
     # play with time: move 1s back in the future
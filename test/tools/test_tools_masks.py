@@ -0,0 +1,154 @@
+"""Tests for the ``sopel.tools.masks`` module."""
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from sopel.tools import identifiers, masks
+
+
+def test_pattern_set_empty():
+    patterns = masks.PatternSet(['', '  '])
+
+    assert not patterns
+    assert len(patterns) == 0
+    assert not patterns.matches('anything')
+
+
+@pytest.mark.parametrize('value, expected', (
+    ('spamuser', True),
+    ('SpamUser', True),
+    ('spamuser2', False),
+    ('spambot', True),
+    ('SPAMB0T', True),
+    ('spambot!', False),
+    ('evil.example.com', True),
+    ('evilXexample.com', True),
+    ('not.evil.example.com', False),
+    ('abc', True),
+    ('abcd', True),
+    ('xbc', False),
+))
+def test_pattern_set_matches(value, expected):
+    patterns = masks.PatternSet([
+        'spamuser',
+        r'sp(a|4)mb(o|0)t',
+        'evil.example.com',
+        # alternation must apply to the entry alone
+        'abc|xyz',
+    ])
+
+    assert patterns.matches(value) is expected
+
+
+def test_pattern_set_combined():
+    patterns = masks.PatternSet(['literal', r'a\d+', r'b\w+', r'(c)\1'])
+
+    assert patterns.literals == frozenset({'literal'})
+    assert len(patterns.regexes) == 2, 'Regexes without groups are combined'
+    assert patterns.matches('A42')
+    assert patterns.matches('bword')
+    assert patterns.matches('cc')
+    assert not patterns.matches('cd')
+
+
+def test_pattern_set_invalid(caplog):
+    caplog.set_level(logging.WARNING, logger=masks.__name__)
+    patterns = masks.PatternSet(['user[', 'valid.*'], name='nick_blocks')
+
+    assert 'Invalid regex in nick_blocks' in caplog.text
+    assert patterns.matches('user[')
+    assert patterns.matches('validuser')
+    assert not patterns.matches('user')
+
+
+def test_blocklist():
+    factory = identifiers.Identifier
+    blocklist = masks.Blocklist(
+        nicks=[r'escaped\[user\]', 'spam{user}'],
+        hosts=[r'spamhost\.com'],
+        hostmasks=[r'.*!.*@.*\.evil\.example'],
+        identifier_factory=factory,
+    )
+
+    assert blocklist
+    assert blocklist.check(factory('ESCAPED[USER]'), None, None).nick
+    assert blocklist.check(factory('spam[user]'), None, None).nick, (
+        'Nicknames must be compared as identifiers')
+    assert not blocklist.check(factory('escaped{user}'), None, None)
+
+    verdict = blocklist.check(
+        factory('nick'), 'spamhost.com', 'nick!user@spamhost.com')
+    assert verdict == (False, True, False)
+
+    verdict = blocklist.check(
+        factory('nick'), 'host.evil.example', 'nick!user@host.evil.example')
+    assert verdict == (False, False, True)
+
+
+def test_blocklist_empty():
+    blocklist = masks.Blocklist()
+
+    assert not blocklist
+    assert not blocklist.check('nick', 'host', 'nick!user@host')
+    assert not blocklist.check(None, None, None)
+
+
+def test_blocklist_cache():
+    blocklist = masks.Blocklist(nicks=['spam.*'], cache_size=2)
+
+    assert blocklist.check('spambot', 'host', 'spambot!user@host').nick
+    assert blocklist.check('spambot', 'host', 'spambot!user@host').nick
+    assert not blocklist.check('user', 'host', 'user!user@host').nick
+
+    info = blocklist._cached_check.cache_info()
+    assert info.hits == 1
+    assert info.currsize == 2
+
+
+@pytest.mark.parametrize('nick, host, account, expected', (
+    ('Owner', 'example.com', None, (True, True)),
+    ('owner', 'other.example', None, (True, True)),
+    ('Admin', 'example.com', None, (False, True)),
+    ('Someone', 'admin.example', None, (False, True)),
+    ('Someone', 'sub.admin.example', None, (False, True)),
+    ('Someone', 'example.com', 'admin_account', (False, True)),
+    ('Someone', 'example.com', None, (False, False)),
+    ('Someone', 'admin.example.com', None, (False, False)),
+))
+def test_access_matcher(nick, host, account, expected):
+    matcher = masks.AccessMatcher(
+        owner='Owner',
+        admins=['Admin', '*@*admin.example'],
+        admin_accounts=['admin_account'],
+    )
+
+    assert matcher.check(nick, host, account) == expected
+
+
+def test_access_matcher_owner_account():
+    matcher = masks.AccessMatcher(owner='Owner', owner_account='owner')
+
+    assert matcher.check('Owner', 'example.com', None) == (False, False)
+    assert matcher.check('Someone', 'example.com', 'owner') == (True, True)
+
+
+def test_access_matcher_cache():
+    matcher = masks.AccessMatcher(admins=['*@admin.example'], cache_size=2)
+
+    assert matcher.check('Foo', 'admin.example', None).admin
+    assert not matcher.check('Foo', 'example.com', None).admin, (
+        'A verdict must not be used for another host')
+
+    matcher._cache['foo'] = ('Foo', 'example.com', None, (True, True))
+    assert matcher.check('Foo', 'example.com', None) == (True, True)
+    matcher.forget('FOO')
+    assert matcher.check('Foo', 'example.com', None) == (False, False)
+
+    matcher.check('Bar', 'example.com', None)
+    matcher.check('Baz', 'example.com', None)
+    assert list(matcher._cache) == ['bar', 'baz']
+
+    matcher.clear()
+    assert not matcher._cache
@@ -4,7 +4,7 @@ from __future__ import annotations
 import pytest
 
 from sopel import plugin
-from sopel.tools import Identifier, target
+from sopel.tools import Identifier, identifiers, target
 
 
 def test_user():
@@ -333,3 +333,59 @@ def test_channel_rename_unknown_user():
     assert new_name not in channel.users
     assert not channel.is_op(old_name)
     assert not channel.is_op(new_name)
+
+
+def test_channel_add_users():
+    channel = target.Channel(Identifier('#chan'))
+    river = target.User(Identifier('River'), None, None)
+    simon = target.User(Identifier('Simon'), None, None)
+
+    channel.add_users([(river, plugin.OP), (simon, 0)])
+
+    assert channel.users == {river.nick: river, simon.nick: simon}
+    assert channel.privileges == {river.nick: plugin.OP, simon.nick: 0}
+    assert river.channels == {channel.name: channel}
+    assert simon.channels == {channel.name: channel}
+    assert channel.is_op('River')
+
+
+def test_get_memory_report():
+    factory = identifiers.InternedIdentifierFactory()
+    channel = target.Channel(factory('#chan'), identifier_factory=factory)
+    other = target.Channel(factory('#other'), identifier_factory=factory)
+    river = target.User(factory('River'), None, None)
+    simon = target.User(factory('Simon'), None, None)
+    channel.add_users([(river, 0), (simon, 0)])
+    other.add_user(river)
+
+    report = target.get_memory_report(
+        {river.nick: river, simon.nick: simon},
+        {channel.name: channel, other.name: other},
+    )
+
+    assert report['users'] == 2
+    assert report['channels'] == 2
+    # 3 user.channels entries, 3 channel.users and 3 channel.privileges
+    assert report['memberships'] == 9
+    # interned identifiers: the same objects are used everywhere
+    assert report['identifiers'] == 4
+    assert report['total_size'] == sum(
+        report[key]
+        for key in (
+            'users_size',
+            'channels_size',
+            'memberships_size',
+            'identifiers_size',
+        )
+    )
+    assert all(report[key] > 0 for key in report)
+
+
+def test_get_memory_report_empty():
+    report = target.get_memory_report({}, {})
+
+    assert report['users'] == 0
+    assert report['channels'] == 0
+    assert report['memberships'] == 0
+    assert report['identifiers'] == 0
+    assert report['identifiers_size'] == 0
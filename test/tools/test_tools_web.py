@@ -3,7 +3,15 @@ from __future__ import annotations
 
 import pytest
 
-from sopel.tools.web import iri_to_uri, quote, search_urls, trim_url, unquote
+from sopel.tools.web import (
+    get_url_extractor,
+    iri_to_uri,
+    quote,
+    search_urls,
+    trim_url,
+    unquote,
+    URLExtractor,
+)
 
 
 IDN_PAIRS = [
@@ -241,3 +249,42 @@ def test_trim_url_trailing_char_and_enclosing(trailing_char, left, right):
 @pytest.mark.parametrize('text, result', UNQUOTE_PAIRS)
 def test_unquote(text, result):
     assert unquote(text) == result
+
+
+def test_url_extractor():
+    extractor = URLExtractor(schemes=['https', 'irc'], exclusion_char='!')
+
+    assert extractor.schemes == ('https', 'irc')
+    assert list(extractor.search(
+        'https://a.com/ http://b.com/ !https://c.com/ irc://d.net/#chan',
+    )) == ['https://a.com/', 'irc://d.net/#chan']
+    assert list(extractor.search('no URL here: https:/a.com')) == []
+
+
+def test_url_extractor_clean():
+    extractor = URLExtractor()
+
+    assert list(extractor.search('(see http://a.com/).', clean=True)) == [
+        'http://a.com/',
+    ]
+
+
+def test_url_extractor_skip_ascii_iri():
+    text = 'HTTP://a.com/? https://exämple.com/'
+
+    urls = list(URLExtractor(schemes=['http', 'https']).search(text))
+    assert urls == ['http://a.com/', 'https://xn--exmple-cua.com/']
+
+    extractor = URLExtractor(schemes=['http', 'https'], skip_ascii_iri=True)
+    urls = list(extractor.search(text))
+    assert urls == ['HTTP://a.com/?', 'https://xn--exmple-cua.com/'], (
+        'Only non-ASCII URLs must be converted')
+
+
+def test_get_url_extractor():
+    extractor = get_url_extractor(['http', 'https'])
+
+    assert get_url_extractor(('http', 'https')) is extractor
+    assert get_url_extractor(['http']) is not extractor
+    assert get_url_extractor(['http', 'https'], '!') is not extractor
+    assert get_url_extractor().schemes == ('http', 'https', 'ftp')